@@ -11,6 +11,8 @@ if "props_palette" in locals():
     importlib.reload(props_palette)
     importlib.reload(op_palette_manage)
     importlib.reload(op_palette_create)
+    importlib.reload(op_palette_track)
+    importlib.reload(op_image_eyedropper)
     importlib.reload(op_paste_color)
     importlib.reload(op_palette_color_edit)
     importlib.reload(op_create_nodes_from_palette)
@@ -24,6 +26,8 @@ else:
 
     from .ops import op_palette_manage
     from .ops import op_palette_create
+    from .ops import op_palette_track
+    from .ops import op_image_eyedropper
     from .ops import op_paste_color
     from .ops import op_palette_color_edit
     from .ops import op_create_nodes_from_palette
@@ -39,6 +43,8 @@ modules = (
     props_palette,
     op_palette_manage,
     op_palette_create,
+    op_palette_track,
+    op_image_eyedropper,
     op_paste_color,
     op_palette_color_edit,
     op_create_nodes_from_palette,
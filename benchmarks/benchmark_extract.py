@@ -0,0 +1,241 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Extraction benchmark and quality suite for utils/process_image.
+
+Generates the synthetic images of synthetic.py as Blender images, runs every extraction backend on them
+and writes the timings, the peak traced memory and the palette quality to JSON.
+Run it inside Blender from the repository root:
+
+    blender -b --factory-startup --python benchmarks/benchmark_extract.py -- --out results.json
+    blender -b --factory-startup --python benchmarks/benchmark_extract.py -- --compare old.json --out new.json
+
+Quality is scored against the ground truth of every image, in OKLab distances scaled by 100 (about one JND):
+delta_e is the mean distance of every ground truth color to its nearest palette color, weighted by the
+coverage of the ground truth color, coverage_error is half the sum of the absolute differences between the
+ground truth coverage and the coverage reported for the matched palette colors (0 is perfect, 1 is all wrong).
+
+peak_bytes is the peak of the memory traced by tracemalloc (Python and NumPy allocations of this process)
+during one extraction, the pixels held by Blender and the worker processes of PARALLEL are not included.
+A 16384 x 16384 image needs about 12 GB of memory.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import bpy
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+import synthetic  # noqa: E402
+
+BACKENDS = ['NUMPY', 'TILED', 'OCTREE', 'HISTOGRAM', 'PARALLEL', 'MEDIAN_CUT', 'KMEANS', 'PYTHON']
+
+
+def import_addon_module(name):
+    sys.path.insert(0, os.path.dirname(REPO))
+    return importlib.import_module(f'{os.path.basename(REPO)}.{name}')
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    parser = argparse.ArgumentParser(prog='benchmark_extract.py')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[256, 1024, 4096],
+                        help='square image sizes, up to 16384')
+    parser.add_argument('--images', nargs='+', default=list(synthetic.GENERATORS), choices=list(synthetic.GENERATORS))
+    parser.add_argument('--backends', nargs='+', default=BACKENDS, choices=BACKENDS)
+    parser.add_argument('--palette-sizes', type=int, nargs='*', default=[8, 64, 256],
+                        help='swatch counts of the palette images for extract_from_palette')
+    parser.add_argument('--colors', type=int, default=5, help='max colors to return')
+    parser.add_argument('--workers', type=int, default=0, help='worker processes of PARALLEL, 0 for one per core')
+    parser.add_argument('--python-max-size', type=int, default=1024,
+                        help='largest size the PixelIterator backend is run on')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per case, the fastest one is kept')
+    parser.add_argument('--out', default='benchmark_extract.json')
+    parser.add_argument('--compare', help='earlier result file to compare against')
+    return parser.parse_args(argv)
+
+
+def blender_image(name, pixels):
+    height, width = pixels.shape[:2]
+    image = bpy.data.images.new(name, width, height, alpha=True)
+    image.pixels.foreach_set(pixels.reshape(-1))
+    return image
+
+
+def extractor(process_image, backend, args):
+    """Function extracting (colors, weights) from an image with one backend"""
+    if backend in {'MEDIAN_CUT', 'KMEANS'}:
+        options = {'quantizer': backend}
+    elif backend == 'PARALLEL':
+        options = {'backend': backend, 'workers': args.workers}
+    else:
+        options = {'backend': backend}
+
+    def extract(image):
+        return process_image.extract_from_image(image, args.colors, return_weights=True, **options)
+
+    return extract
+
+
+def measure(function, image, repeat):
+    """
+    Run function repeat times untraced and once under tracemalloc.
+    Return the result, the fastest time and the peak traced bytes
+    """
+    seconds = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = function(image)
+        seconds.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function(image)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return result, min(seconds), peak
+
+
+def score(colors, weights, truth, color_correct):
+    """
+    Return delta_e and coverage_error of a palette against the ground truth (sRGB colors, coverage),
+    coverage_error is None when no weights are given
+    """
+    truth_colors, truth_coverage = truth
+    if len(colors) == 0:
+        return None, None
+
+    truth_lab = color_correct.linear_2_oklab_array(color_correct.srgb_2_linear_array(truth_colors[:, :3]))
+    lab = color_correct.linear_2_oklab_array(np.array(colors)[:, :3])
+    distances = 100 * np.linalg.norm(truth_lab[:, None, :] - lab[None, :, :], axis=2)
+    nearest = np.argmin(distances, axis=1)
+
+    delta_e = float(np.sum(truth_coverage * distances[np.arange(len(truth_lab)), nearest]) / truth_coverage.sum())
+    if weights is None:
+        return delta_e, None
+
+    matched = np.bincount(nearest, weights=truth_coverage, minlength=len(colors))
+    return delta_e, float(np.abs(matched - np.asarray(weights)).sum() / 2)
+
+
+def record(results, image_name, width, height, backend, colors, weights, seconds, peak, truth, color_correct):
+    delta_e, coverage_error = score(colors, weights, truth, color_correct)
+    results.append({
+        'image': image_name,
+        'width': width,
+        'height': height,
+        'backend': backend,
+        'seconds': round(seconds, 5),
+        'peak_bytes': peak,
+        'delta_e': None if delta_e is None else round(delta_e, 3),
+        'coverage_error': None if coverage_error is None else round(coverage_error, 4),
+        'colors': [[round(c, 4) for c in color] for color in colors],
+    })
+    print(f'{image_name:>9} {width:>6}x{height:<6} {backend:<10} {seconds:9.4f}s {peak / 1024 ** 2:9.1f} MB '
+          f'dE {results[-1]["delta_e"]}  coverage {results[-1]["coverage_error"]}')
+
+
+def run_images(args, process_image, color_correct, results):
+    for size in args.sizes:
+        for image_name in args.images:
+            pixels, truth = synthetic.GENERATORS[image_name](size, size)
+            image = blender_image(f'bench_{image_name}_{size}', pixels)
+            pixels = None
+
+            try:
+                for backend in args.backends:
+                    if backend == 'PYTHON' and size > args.python_max_size:
+                        continue
+
+                    (colors, weights), seconds, peak = measure(extractor(process_image, backend, args), image,
+                                                               args.repeat)
+                    record(results, image_name, size, size, backend, colors, weights, seconds, peak, truth,
+                           color_correct)
+            finally:
+                bpy.data.images.remove(image)
+
+
+def run_palettes(args, process_image, color_correct, results):
+    from_palette = process_image.extract_from_palette
+    for color_count in args.palette_sizes:
+        pixels, truth = synthetic.palette_strip(color_count)
+        height, width = pixels.shape[:2]
+        image = blender_image(f'bench_palette_{color_count}', pixels)
+
+        try:
+            colors, seconds, peak = measure(from_palette, image, args.repeat)
+            record(results, 'palette', width, height, 'PALETTE', colors, None, seconds, peak, truth, color_correct)
+        finally:
+            bpy.data.images.remove(image)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, old_path):
+    """Print the speed up and the delta_e change of every case found in an earlier result file"""
+    with open(old_path) as f:
+        old = {(r['image'], r['width'], r['height'], r['backend']): r for r in json.load(f)['results']}
+
+    print(f'\ncompared with {old_path}')
+    for result in results:
+        before = old.get((result['image'], result['width'], result['height'], result['backend']))
+        if before is None:
+            continue
+
+        speed_up = before['seconds'] / result['seconds'] if result['seconds'] else float('inf')
+        quality = ''
+        if result['delta_e'] is not None and before['delta_e'] is not None:
+            quality = f"  dE {result['delta_e'] - before['delta_e']:+.3f}"
+        print(f"{result['image']:>9} {result['width']:>6}x{result['height']:<6} {result['backend']:<10} "
+              f"x{speed_up:6.2f}{quality}")
+
+
+def main():
+    args = parse_args()
+    process_image = import_addon_module('utils.process_image')
+    color_correct = import_addon_module('utils.color_correct')
+
+    results = []
+    run_images(args, process_image, color_correct, results)
+    run_palettes(args, process_image, color_correct, results)
+
+    with open(args.out, 'w') as f:
+        json.dump({
+            'commit': git_commit(),
+            'blender': bpy.app.version_string,
+            'numpy': np.__version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'options': vars(args),
+            'results': results,
+        }, f, indent=1)
+    print(f'\nresults written to {args.out}')
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
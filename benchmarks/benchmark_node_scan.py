@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Benchmark of the material node color scan of utils/node_colors.
+
+Builds a synthetic file of materials that all use one shared node group, then times
+group_materials + scan_material_palettes for a palette per material and for one palette of the file.
+Every material has a Principled BSDF, RGB nodes and a ColorRamp of its own, the shared group holds
+more RGB nodes and ColorRamps. Run it inside Blender from the repository root:
+
+    blender -b --factory-startup --python benchmarks/benchmark_node_scan.py -- --materials 5000 --out results.json
+
+or with the bpy module from PyPI: python benchmarks/benchmark_node_scan.py --materials 5000
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+import bpy
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(HERE)
+
+GROUP_BY = ['MATERIAL', 'FILE']
+
+
+def import_addon_module(name):
+    sys.path.insert(0, os.path.dirname(REPO))
+    return importlib.import_module(f'{os.path.basename(REPO)}.{name}')
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(prog='benchmark_node_scan.py')
+    parser.add_argument('--materials', type=int, default=5000, help='materials in the synthetic file')
+    parser.add_argument('--rgb-nodes', type=int, default=4, help='RGB nodes per material')
+    parser.add_argument('--group-nodes', type=int, default=16, help='RGB nodes and ColorRamps of the shared group')
+    parser.add_argument('--colors', type=int, default=5, help='max colors to return')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per case, the fastest one is kept')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='benchmark_node_scan.json')
+    return parser.parse_args(argv)
+
+
+def build_file(args):
+    """Synthetic materials sharing one node group, return the materials"""
+    rng = np.random.default_rng(args.seed)
+
+    group = bpy.data.node_groups.new('Shared Colors', 'ShaderNodeTree')
+    for _ in range(args.group_nodes):
+        group.nodes.new('ShaderNodeRGB').outputs[0].default_value = (*rng.random(3), 1)
+        ramp = group.nodes.new('ShaderNodeValToRGB').color_ramp
+        for element in ramp.elements:
+            element.color = (*rng.random(3), 1)
+
+    materials = []
+    for i in range(args.materials):
+        material = bpy.data.materials.new(f'Material {i:05d}')
+        material.use_nodes = True
+        nodes = material.node_tree.nodes
+        nodes['Principled BSDF'].inputs['Base Color'].default_value = (*rng.random(3), 1)
+        for _ in range(args.rgb_nodes):
+            nodes.new('ShaderNodeRGB').outputs[0].default_value = (*rng.random(3), 1)
+        ramp = nodes.new('ShaderNodeValToRGB').color_ramp
+        ramp.elements.new(0.5).color = (*rng.random(3), 1)
+        nodes.new('ShaderNodeGroup').node_tree = group
+        materials.append(material)
+
+    return materials
+
+
+def measure(function, repeat):
+    """Return the result and the fastest time of repeat runs"""
+    seconds = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = function()
+        seconds.append(time.perf_counter() - start)
+
+    return result, min(seconds)
+
+
+def main():
+    args = parse_args()
+    node_colors = import_addon_module('utils.node_colors')
+
+    start = time.perf_counter()
+    build_file(args)
+    print(f'built {args.materials} materials in {time.perf_counter() - start:.2f}s')
+
+    results = []
+    for group_by in GROUP_BY:
+        def scan():
+            groups = node_colors.group_materials(bpy.context, group_by, scope='FILE')
+            return node_colors.scan_material_palettes(groups, args.colors)
+
+        palettes, seconds = measure(scan, args.repeat)
+        results.append({'group_by': group_by, 'palettes': len(palettes), 'seconds': seconds})
+        print(f'{group_by:<9} {len(palettes):>6} palettes {seconds:8.3f}s')
+
+    with open(args.out, 'w') as f:
+        json.dump({
+            'blender': bpy.app.version_string,
+            'numpy': np.__version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'options': vars(args),
+            'results': results,
+        }, f, indent=1)
+    print(f'results written to {args.out}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Synthetic test images with a known palette.
+
+Every generator returns float32 (height, width, 4) sRGB pixels, bottom row first like Blender,
+quantized to 8 bits, and the ground truth: the sRGB colors the image is made of and the fraction
+of the pixels each one covers.
+"""
+
+import numpy as np
+
+# well separated 8-bit sRGB colors and the share of the image they cover
+BASE_COLORS = np.array([
+    (230, 57, 70),
+    (241, 250, 238),
+    (168, 218, 220),
+    (69, 123, 157),
+    (29, 53, 87),
+], dtype=np.float32) / 255
+BASE_COVERAGE = np.array([0.4, 0.25, 0.15, 0.12, 0.08])
+
+CHUNK_ROWS = 512
+
+
+def stripe_columns(width, coverage=BASE_COVERAGE):
+    """Index of the stripe every column belongs to, stripe widths following coverage"""
+    edges = np.cumsum(coverage)[:-1] * width
+    return np.searchsorted(edges, np.arange(width) + 0.5).astype(np.uint8)
+
+
+def render_labels(labels, colors, shade=None, noise=0.0, seed=0):
+    """
+    Paint an (height, width) label map with colors, row chunk by row chunk so the temporaries stay small.
+    shade: optional function (row start, row count) -> (rows, width) brightness factors
+    noise: standard deviation of the gaussian noise added to every channel
+    """
+    rng = np.random.default_rng(seed)
+    height, width = labels.shape
+    pixels = np.empty((height, width, 4), dtype=np.float32)
+    pixels[..., 3] = 1
+
+    for start in range(0, height, CHUNK_ROWS):
+        rgb = colors[labels[start:start + CHUNK_ROWS]]
+        if shade is not None:
+            rgb *= shade(start, len(rgb))[..., None]
+        if noise:
+            rgb += rng.normal(0, noise, rgb.shape).astype(np.float32)
+        pixels[start:start + len(rgb), :, :3] = np.round(np.clip(rgb, 0, 1) * 255) / 255
+
+    return pixels
+
+
+def truth_of(labels):
+    coverage = np.bincount(labels.ravel(), minlength=len(BASE_COLORS)) / labels.size
+    return BASE_COLORS, coverage
+
+
+def flat(width, height, seed=0):
+    """Vertical stripes of flat color"""
+    labels = np.broadcast_to(stripe_columns(width), (height, width))
+    return render_labels(labels, BASE_COLORS), (BASE_COLORS, BASE_COVERAGE)
+
+
+def gradient(width, height, seed=0, blend=0.1):
+    """Stripes with linear transitions over blend of the width at every edge"""
+    columns = np.arange(width) + 0.5
+    edges = np.cumsum(BASE_COVERAGE)[:-1] * width
+    half = blend * width / 2
+
+    row = np.repeat(BASE_COLORS[:1], width, axis=0)
+    for i, edge in enumerate(edges):
+        t = np.clip((columns - edge + half) / (2 * half), 0, 1)[:, None]
+        row = row * (1 - t) + BASE_COLORS[i + 1] * t
+
+    pixels = np.empty((height, width, 4), dtype=np.float32)
+    pixels[..., :3] = np.round(row * 255) / 255
+    pixels[..., 3] = 1
+    return pixels, (BASE_COLORS, BASE_COVERAGE)
+
+
+def noise(width, height, seed=0, sigma=4 / 255, block=16):
+    """Random blocks of the base colors with gaussian noise on every pixel"""
+    rng = np.random.default_rng(seed)
+    small = rng.choice(len(BASE_COLORS), p=BASE_COVERAGE,
+                       size=(-(-height // block), -(-width // block))).astype(np.uint8)
+    labels = np.repeat(np.repeat(small, block, axis=0), block, axis=1)[:height, :width]
+
+    return render_labels(labels, BASE_COLORS, noise=sigma, seed=seed), truth_of(labels)
+
+
+def photo(width, height, seed=0, grid=24):
+    """
+    Photo like mixture: smooth blobs of the base colors, soft shading and a little noise.
+    The blobs are the upscaled argmax of random fields biased towards BASE_COVERAGE.
+    """
+    rng = np.random.default_rng(seed)
+    fields = rng.random((len(BASE_COLORS), grid, grid)) + np.log(BASE_COVERAGE)[:, None, None] * 0.5
+    small = np.argmax(fields, axis=0).astype(np.uint8)
+    rows = np.arange(height) * grid // height
+    columns = np.arange(width) * grid // width
+    labels = small[rows[:, None], columns[None, :]]
+
+    shade_x = 1 + 0.1 * np.sin(np.linspace(0, 3 * np.pi, width, dtype=np.float32))
+    shade_y = 1 + 0.1 * np.cos(np.linspace(0, 2 * np.pi, height, dtype=np.float32))
+
+    def shade(start, count):
+        return shade_y[start:start + count, None] * shade_x[None, :]
+
+    return render_labels(labels, BASE_COLORS, shade=shade, noise=2 / 255, seed=seed), truth_of(labels)
+
+
+def palette_strip(color_count, color_width=50, color_height=50, seed=0):
+    """
+    Palette image as exported by make_png_from_palette: one row of color_width x color_height swatches
+    """
+    rng = np.random.default_rng(seed)
+    colors = np.round(rng.random((color_count, 3), dtype=np.float32) * 255) / 255
+    row = np.repeat(colors, color_width, axis=0)
+
+    pixels = np.empty((color_height, color_count * color_width, 4), dtype=np.float32)
+    pixels[..., :3] = row
+    pixels[..., 3] = 1
+    return pixels, (colors, np.full(color_count, 1 / color_count))
+
+
+GENERATORS = {
+    'flat': flat,
+    'gradient': gradient,
+    'noise': noise,
+    'photo': photo,
+}
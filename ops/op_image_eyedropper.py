@@ -0,0 +1,210 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import bpy
+import gpu
+from bpy.app.handlers import persistent
+from bpy.props import IntProperty
+from gpu_extras.batch import batch_for_shader
+
+from .op_palette_manage import redraw_area
+
+
+def find_image_editor(screen, x, y):
+    """Image Editor showing an image and its main region under the window coordinates x, y"""
+    for area in screen.areas:
+        if area.type != 'IMAGE_EDITOR' or area.spaces.active.image is None:
+            continue
+
+        for region in area.regions:
+            if region.type == 'WINDOW' and 0 <= x - region.x < region.width and 0 <= y - region.y < region.height:
+                return area, region
+
+    return None, None
+
+
+def draw_sample(op):
+    """Outline of the sampled pixels and a swatch of their average color, drawn in the sampled Image Editor"""
+    if op.box is None or bpy.context.area != op.area:
+        return
+
+    from ..utils.color_correct import linear_2_srgb
+
+    x0, y0, x1, y1 = op.box
+    shader = gpu.shader.from_builtin('UNIFORM_COLOR')
+    outline = batch_for_shader(shader, 'LINE_LOOP', {'pos': [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]})
+    shader.uniform_float('color', (1, 1, 1, 1))
+    outline.draw(shader)
+
+    if op.color is not None:
+        sx, sy = x1 + 8, y1 + 8
+        swatch = batch_for_shader(shader, 'TRI_FAN',
+                                  {'pos': [(sx, sy), (sx + 24, sy), (sx + 24, sy + 24), (sx, sy + 24)]})
+        shader.uniform_float('color', (*(linear_2_srgb(c) for c in op.color[:3]), 1))
+        swatch.draw(shader)
+
+
+class CH_OT_image_eyedropper(bpy.types.Operator):
+    """Sample the average color of a square of pixels in the Image Editor, click to add it to a palette"""
+    bl_idname = 'ch.image_eyedropper'
+    bl_label = 'Region Eyedropper'
+    bl_options = {'UNDO_GROUPED'}
+
+    palette_index: IntProperty(default=-1, options={'HIDDEN'})  # -1 to add to a new palette
+    size: IntProperty(name='Size', description='Width of the averaged square in pixels',
+                      default=5, min=1, soft_max=101)
+
+    @classmethod
+    def poll(cls, context):
+        return context.window is not None and any(
+            area.type == 'IMAGE_EDITOR' and area.spaces.active.image is not None
+            for area in context.window.screen.areas)
+
+    def invoke(self, context, event):
+        from ..utils.process_image import PIXEL_CACHE
+
+        # painting a dirty image keeps its state, read those again once per run
+        for image_name in list(PIXEL_CACHE.entries):
+            image = bpy.data.images.get(image_name)
+            if image is None or image.is_dirty:
+                PIXEL_CACHE.invalidate(image_name)
+
+        self.area = None
+        self.image_name = None
+        self.color = None
+        self.box = None
+        self.added = 0
+
+        self.handle = bpy.types.SpaceImageEditor.draw_handler_add(draw_sample, (self,), 'WINDOW', 'POST_PIXEL')
+        context.window.cursor_modal_set('EYEDROPPER')
+        context.workspace.status_text_set('LMB: Add Color    Ctrl Wheel: Size    RMB / Esc: Finish')
+        context.window_manager.modal_handler_add(self)
+        self.sample(context, event.mouse_x, event.mouse_y)
+
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type in {'RIGHTMOUSE', 'ESC'} and event.value == 'PRESS':
+            return self.finish(context)
+
+        if event.type == 'LEFTMOUSE' and event.value == 'PRESS':
+            if self.color is not None:
+                self.add_color(context)
+            return {'RUNNING_MODAL'}
+
+        if event.ctrl and event.type in {'WHEELUPMOUSE', 'WHEELDOWNMOUSE'}:
+            self.size = max(1, self.size + (2 if event.type == 'WHEELUPMOUSE' else -2))
+            self.sample(context, event.mouse_x, event.mouse_y)
+            return {'RUNNING_MODAL'}
+
+        if event.type == 'MOUSEMOVE':
+            self.sample(context, event.mouse_x, event.mouse_y)
+
+        # keep panning and zooming the Image Editor
+        return {'PASS_THROUGH'}
+
+    def sample(self, context, x, y):
+        from ..utils.process_image import PIXEL_CACHE, region_average, region_bounds
+
+        area, region = find_image_editor(context.window.screen, x, y)
+        if self.area is not None and area != self.area:
+            self.area.header_text_set(None)
+            self.area.tag_redraw()
+
+        self.area, self.color, self.box = area, None, None
+        if area is None:
+            return
+
+        image = area.spaces.active.image
+        width, height = image.size
+        if image.channels not in [3, 4] or not width or not height:
+            area.header_text_set(f'{image.name}: {image.channels} channels can not be sampled')
+            return
+
+        u, v = region.view2d.region_to_view(x - region.x, y - region.y)
+        pixel_x, pixel_y = int(u * width), int(v * height)
+        if not (0 <= pixel_x < width and 0 <= pixel_y < height):
+            area.header_text_set(None)
+            area.tag_redraw()
+            return
+
+        self.image_name = image.name
+        self.color = region_average(PIXEL_CACHE.get(image), pixel_x, pixel_y, self.size)
+
+        x0, y0, x1, y1 = region_bounds(width, height, pixel_x, pixel_y, self.size)
+        self.box = (*region.view2d.view_to_region(x0 / width, y0 / height, clip=False),
+                    *region.view2d.view_to_region(x1 / width, y1 / height, clip=False))
+
+        area.header_text_set(f'{image.name}  ({pixel_x}, {pixel_y})  {self.size}x{self.size}  '
+                             f'RGBA {", ".join(f"{c:.3f}" for c in self.color)}')
+        area.tag_redraw()
+
+    def get_palette(self, context):
+        if len(context.scene.ch_palette_collection) == 0:
+            collection = context.scene.ch_palette_collection.add()
+            collection.name = 'Collection'
+            context.scene.ch_palette_collection_index = 0
+
+        collection = context.scene.ch_palette_collection[context.scene.ch_palette_collection_index]
+        if not 0 <= self.palette_index < len(collection.palettes):
+            palette = collection.palettes.add()
+            palette.name = self.image_name + '_picked'
+            self.palette_index = len(collection.palettes) - 1
+
+        return collection.palettes[self.palette_index]
+
+    def add_color(self, context):
+        palette = self.get_palette(context)
+        item = palette.colors.add()
+        item.color = self.color
+        self.added += 1
+        redraw_area()
+
+    def finish(self, context):
+        bpy.types.SpaceImageEditor.draw_handler_remove(self.handle, 'WINDOW')
+        context.window.cursor_modal_restore()
+        context.workspace.status_text_set(None)
+        if self.area is not None:
+            self.area.header_text_set(None)
+        redraw_area()
+
+        if self.added == 0:
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f'{self.added} colors added')
+        return {'FINISHED'}
+
+
+@persistent
+def invalidate_updated_images(scene, depsgraph):
+    from ..utils.process_image import PIXEL_CACHE
+
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Image):
+            PIXEL_CACHE.invalidate(update.id.name_full)
+
+
+@persistent
+def clear_pixel_cache(*args):
+    from ..utils.process_image import PIXEL_CACHE
+
+    PIXEL_CACHE.clear()
+
+
+def image_menu_func(self, context):
+    self.layout.operator('ch.image_eyedropper', icon='EYEDROPPER')
+
+
+def register():
+    bpy.utils.register_class(CH_OT_image_eyedropper)
+    bpy.types.IMAGE_MT_image.append(image_menu_func)
+    bpy.app.handlers.depsgraph_update_post.append(invalidate_updated_images)
+    bpy.app.handlers.load_post.append(clear_pixel_cache)
+
+
+def unregister():
+    clear_pixel_cache()
+    bpy.app.handlers.load_post.remove(clear_pixel_cache)
+    bpy.app.handlers.depsgraph_update_post.remove(invalidate_updated_images)
+    bpy.types.IMAGE_MT_image.remove(image_menu_func)
+    bpy.utils.unregister_class(CH_OT_image_eyedropper)
@@ -51,39 +51,40 @@ history_colors = []
 def update_hsv(self, context):
     global history_colors
 
-    import colorsys
+    import numpy as np
+    from ..utils.color_kernels import rgb_2_hsv, hsv_2_rgb
 
     if len(history_colors) == 0:
         src_colors_rgb = [color_item.color[:3] for color_item in self.temp_colors]
         history_colors = src_colors_rgb
 
-    src_colors_hsv = [colorsys.rgb_to_hsv(*rgb) for rgb in history_colors]
-    new_colors_rgba = list()
+    src_colors_hsv = rgb_2_hsv(np.array(history_colors, dtype=np.float64).reshape(-1, 3))
+    hsv = np.empty_like(src_colors_hsv)
+    hsv[:, 0] = (src_colors_hsv[:, 0] + self.offset_h) % 1
+    hsv[:, 1] = np.where(src_colors_hsv[:, 1] != 0, np.clip(src_colors_hsv[:, 1] + self.offset_s, 0, 1), 0)
+    hsv[:, 2] = np.clip(src_colors_hsv[:, 2] + self.offset_v, 0, 1)
 
-    for hsv in src_colors_hsv:
-        h = (hsv[0] + self.offset_h) % 1
-        s = min(max(hsv[1] + self.offset_s, 0), 1)
-        v = min(max(hsv[2] + self.offset_v, 0), 1)
-        r, g, b = colorsys.hsv_to_rgb(h, s if hsv[1] != 0 else 0, v)
-        new_colors_rgba.append((r, g, b, 1))
+    new_colors_rgba = np.ones((len(hsv), 4))
+    new_colors_rgba[:, :3] = hsv_2_rgb(hsv)
 
-    for i, color_item in enumerate(self.temp_colors):
-        color_item.color = new_colors_rgba[i]
+    for color_item, color in zip(self.temp_colors, new_colors_rgba.tolist()):
+        color_item.color = color
 
     context.area.tag_redraw()
 
 
 def update_sort(self, context):
-    import colorsys
+    import numpy as np
+    from ..utils.color_kernels import rgb_2_hsv
 
-    original_colors = sorted([
-        (
-            [(r, g, b)[int(self.mode)] for (r, g, b) in [colorsys.rgb_to_hsv(*color.color[:3])]],  # sort key
-            tuple(color.color)  # source color
-        ) for color in self.temp_colors], reverse=self.reverse
-    )
+    colors = np.array([tuple(color.color) for color in self.temp_colors], dtype=np.float64).reshape(-1, 4)
+    sort_key = rgb_2_hsv(colors[:, :3])[:, int(self.mode)]
+    # sort by the key, then by the color itself, last key first
+    order = np.lexsort((colors[:, 3], colors[:, 2], colors[:, 1], colors[:, 0], sort_key))
+    if self.reverse:
+        order = order[::-1]
 
-    for new_index, (hsv, color) in enumerate(original_colors):
+    for new_index, color in enumerate(colors[order].tolist()):
         self.temp_colors[new_index].color = color
 
 
@@ -93,9 +94,10 @@ def hsv_2_rgba(c):
 
 
 def get_base_color(self):
+    from ..utils.color_kernels import rgb_2_hsv
+
     c = Color()
-    import colorsys
-    c.hsv = colorsys.rgb_to_hsv(*self.base_color[:3])
+    c.hsv = rgb_2_hsv(self.base_color[:3]).tolist()
     return c
 
 
@@ -3,9 +3,10 @@
 
 import bpy
 import os
-from bpy.props import EnumProperty, StringProperty, CollectionProperty
+import time
+from bpy.props import EnumProperty, StringProperty, BoolProperty, IntProperty, FloatProperty, CollectionProperty
 from bpy_extras.io_utils import ExportHelper, ImportHelper
-from ..preferences import get_pref
+from ..preferences import get_pref, get_extract_cache
 
 
 class CreatePaletteBase:
@@ -27,21 +28,86 @@ class CreatePaletteBase:
 
         return {'FINISHED'}
 
-    def create_palette(self, palette):
-        if len(bpy.context.scene.ch_palette_collection) == 0:
-            collection = bpy.context.scene.ch_palette_collection.add()
-            collection.name = 'Collection'
-            bpy.context.scene.ch_palette_collection_index = 0
+    def create_palette(self, palette, weights=None, collection=None):
+        """
+        palette: list of rgba colors
+        weights: optional coverage of every color, stored on the palette colors
+        collection: PaletteCollectionProps to add to, the active one by default
+        """
+        if collection is None:
+            if len(bpy.context.scene.ch_palette_collection) == 0:
+                collection = bpy.context.scene.ch_palette_collection.add()
+                collection.name = 'Collection'
+                bpy.context.scene.ch_palette_collection_index = 0
 
-        collection = bpy.context.scene.ch_palette_collection[bpy.context.scene.ch_palette_collection_index]
+            collection = bpy.context.scene.ch_palette_collection[bpy.context.scene.ch_palette_collection_index]
 
         palette_item = collection.palettes.add()
         palette_item.name = 'Palettes' + str(len(collection.palettes))
         for i, color in enumerate(palette):
             clr = palette_item.colors.add()
             clr.color = color
+            if weights is not None:
+                clr.weight = weights[i]
         return palette_item
 
+    def extract_palette(self, image, collection=None):
+        """
+        Extract a palette from an Image (or ImageRegion) with the extraction preferences and add it
+        """
+        stats = {}
+        palette, weights = self.extract_with_prefs(image, stats)
+
+        palette_item = self.create_palette(palette, weights, collection)
+        if 'peak_buffer_bytes' in stats:
+            self.report({'INFO'}, f"Pixel memory: {stats['peak_buffer_bytes'] / 1024 ** 2:.1f} MB, "
+                                  f"{stats['image_bytes'] / 1024 ** 2:.1f} MB of it the full image read")
+        return palette_item
+
+    @staticmethod
+    def extract_with_prefs(image, stats=None):
+        """
+        extract_from_image with the extraction preferences, return the palette and its coverage weights
+        """
+        from ..utils.process_image import extract_from_image, HISTOGRAM_CACHE
+
+        pref = get_pref()
+        return extract_from_image(image, max_colors_to_return=pref.max_colors_return,
+                                  backend=pref.extract_backend,
+                                  tile_rows=pref.tile_rows,
+                                  quantizer=pref.quantizer,
+                                  octree_nodes=pref.octree_nodes,
+                                  histogram_bins=pref.histogram_bins,
+                                  workers=pref.worker_count,
+                                  sampling=pref.sampling,
+                                  sample_count=pref.sample_count,
+                                  return_weights=True,
+                                  histogram_cache=HISTOGRAM_CACHE if pref.reuse_histograms else None,
+                                  stats=stats)
+
+    def create_palettes_from_files(self, filepaths):
+        """
+        Extract palette image files in worker processes, then add them all to the active collection in one go.
+        Per file timings are printed to the console.
+        """
+        from ..utils.parallel import batch_extract_palette_files
+
+        cache = get_extract_cache()
+        stats = {}
+        start = time.perf_counter()
+        results = batch_extract_palette_files(filepaths, get_pref().worker_count, cache, get_pref().cache_content_hash,
+                                              stats)
+        if cache is not None:
+            cache.save()
+
+        for filepath, palette, seconds, source in results:
+            print(f'Color Helper: {seconds * 1000:8.1f} ms {source:<8} {filepath}')
+            palette_item = self.create_palette(palette)
+            palette_item.name = os.path.basename(filepath)
+
+        self.report({'INFO'}, f'Extracted {len(results)} palettes in {time.perf_counter() - start:.2f}s '
+                              f'with {stats["workers"]} process(es), see console for per file timings')
+
 class CH_OT_create_palette_from_palette(CreatePaletteBase, bpy.types.Operator, ImportHelper):
     bl_idname = 'ch.create_palette_from_palette'
     bl_label = 'Platte From Palette Files'
@@ -57,17 +123,41 @@ class CH_OT_create_palette_from_palette(CreatePaletteBase, bpy.types.Operator, I
     )
 
     def execute(self, context):
-        from ..utils.process_image import extract_from_palette
-
         dirname = os.path.dirname(self.filepath)
-        for f in self.files:
-            image = bpy.data.images.load(os.path.join(dirname, f.name), check_existing=False)
-            palette = extract_from_palette(image)
+        self.create_palettes_from_files([os.path.join(dirname, f.name) for f in self.files])
 
-            palette_item = self.create_palette(palette)
-            palette_item.name = f.name
+        return {'FINISHED'}
+
+
+class CH_OT_create_palette_from_folder(CreatePaletteBase, bpy.types.Operator, ImportHelper):
+    """Import every palette image of a folder, extracted in worker processes"""
+    bl_idname = 'ch.create_palette_from_folder'
+    bl_label = 'Palette From Folder'
+    bl_options = {'UNDO_GROUPED'}
+
+    directory: StringProperty(subtype='DIR_PATH')
+    filter_folder: BoolProperty(default=True, options={'HIDDEN'})
+    filter_glob: StringProperty(
+        default="*.png;*.jpg;*.jpeg",
+        options={'HIDDEN'}
+    )
+    use_subfolders: BoolProperty(name='Include Subfolders', default=True)
+
+    def execute(self, context):
+        image_extensions = {'.png', '.jpg', '.jpeg'}
+        filepaths = []
+        for root, dirs, files in os.walk(self.directory):
+            dirs.sort()
+            filepaths.extend(os.path.join(root, f) for f in sorted(files)
+                             if os.path.splitext(f)[1].lower() in image_extensions)
+            if not self.use_subfolders:
+                break
+
+        if not filepaths:
+            return self._return(error_msg='No palette images found in this folder')
+
+        self.create_palettes_from_files(filepaths)
 
-            bpy.data.images.remove(image)
         return {'FINISHED'}
 
 
@@ -77,7 +167,6 @@ class CH_OT_create_palette_from_clipboard(CreatePaletteBase, bpy.types.Operator)
     bl_options = {'UNDO_GROUPED'}
 
     def execute(self, context):
-        from ..utils.process_image import extract_from_image
         from ..utils.clipboard import Clipboard, ClipboardImageError
 
         clipboard = Clipboard()
@@ -95,20 +184,490 @@ class CH_OT_create_palette_from_clipboard(CreatePaletteBase, bpy.types.Operator)
             if channel_count not in [3, 4]:
                 return self._return(
                     error_msg=f"This image has {channel_count} channels, but this method can only handle 3 or 4 channels")
-            palette = extract_from_image(image, max_colors_to_return=get_pref().max_colors_return)
-
-            self.create_palette(palette)
+            self.extract_palette(image)
         finally:
             bpy.data.images.remove(image)
 
         return {'FINISHED'}
 
 
+class CH_OT_create_palette_from_image_region(CreatePaletteBase, bpy.types.Operator):
+    """Extract a palette from a rectangle of an image, optionally masked by another image"""
+    bl_idname = 'ch.create_palette_from_image_region'
+    bl_label = 'Palette From Image Region'
+    bl_options = {'UNDO_GROUPED'}
+
+    image_name: StringProperty(name='Image')
+    min_x: FloatProperty(name='Left', default=0, min=0, max=1, subtype='FACTOR')
+    min_y: FloatProperty(name='Bottom', default=0, min=0, max=1, subtype='FACTOR')
+    max_x: FloatProperty(name='Right', default=1, min=0, max=1, subtype='FACTOR')
+    max_y: FloatProperty(name='Top', default=1, min=0, max=1, subtype='FACTOR')
+
+    mask_name: StringProperty(name='Mask')
+    mask_channel: EnumProperty(
+        name='Mask Channel',
+        items=[
+            ('ALPHA', 'Alpha', 'Use the alpha of the mask image'),
+            ('LUMINANCE', 'Luminance', 'Use the luminance of the mask image'),
+        ],
+        default='ALPHA',
+    )
+    mask_threshold: FloatProperty(name='Threshold', default=0.5, min=0, max=1, subtype='FACTOR')
+    invert_mask: BoolProperty(name='Invert Mask', default=False)
+
+    @classmethod
+    def poll(cls, context):
+        return context.area.ui_type == 'IMAGE_EDITOR' or super().poll(context)
+
+    def invoke(self, context, event):
+        image = getattr(context.space_data, 'image', None)
+        if image is not None and not self.image_name:
+            self.image_name = image.name
+
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.prop_search(self, 'image_name', bpy.data, 'images')
+
+        col = layout.column(align=True)
+        col.prop(self, 'min_x')
+        col.prop(self, 'max_x')
+        col.prop(self, 'min_y')
+        col.prop(self, 'max_y')
+
+        layout.prop_search(self, 'mask_name', bpy.data, 'images')
+        if self.mask_name:
+            col = layout.column(align=True)
+            col.prop(self, 'mask_channel')
+            col.prop(self, 'mask_threshold')
+            col.prop(self, 'invert_mask')
+
+    def execute(self, context):
+        from ..utils.process_image import ImageRegion, mask_from_image
+
+        image = bpy.data.images.get(self.image_name)
+        if image is None:
+            return self._return(error_msg='Choose an image to extract from')
+        if image.channels not in [3, 4]:
+            return self._return(
+                error_msg=f"This image has {image.channels} channels, but this method can only handle 3 or 4 channels")
+
+        width, height = image.size
+        x, y = int(self.min_x * width), int(self.min_y * height)
+        rect = (x, y, int(self.max_x * width) - x, int(self.max_y * height) - y)
+
+        mask = None
+        mask_image = bpy.data.images.get(self.mask_name) if self.mask_name else None
+        if mask_image is not None:
+            mask = mask_from_image(mask_image, image.size, self.mask_channel, self.invert_mask)
+
+        region = ImageRegion(image, rect, mask, self.mask_threshold)
+        if region.pixel_count == 0:
+            return self._return(error_msg='The region is empty')
+
+        palette_item = self.extract_palette(region)
+        palette_item.name = image.name
+
+        return {'FINISHED'}
+
+
+class CH_OT_create_palette_from_sequence(CreatePaletteBase, bpy.types.Operator, ImportHelper):
+    """Extract one palette from every frame of an image sequence, choose any frame of it"""
+    bl_idname = 'ch.create_palette_from_sequence'
+    bl_label = 'Palette From Image Sequence'
+    bl_options = {'UNDO_GROUPED'}
+
+    filter_image: BoolProperty(default=True, options={'HIDDEN'})
+    filter_movie: BoolProperty(default=True, options={'HIDDEN'})
+    frame_stride: IntProperty(name='Frame Stride', description='Only count every n-th frame',
+                              default=1, min=1, soft_max=100)
+
+    @classmethod
+    def poll(cls, context):
+        return context.area.ui_type == 'IMAGE_EDITOR' or super().poll(context)
+
+    def execute(self, context):
+        from ..utils.image_sequence import is_movie_file, sequence_frame_paths, iter_frames
+        from ..utils.process_image import extract_from_frames
+
+        if is_movie_file(self.filepath):
+            return self._return(
+                error_msg='Movie files can not be read frame by frame, render the clip to an image sequence first')
+
+        filepaths = sequence_frame_paths(self.filepath)
+        pref = get_pref()
+        stats = {}
+        start = time.perf_counter()
+        palette, weights = extract_from_frames(iter_frames(filepaths, self.frame_stride),
+                                               max_colors_to_return=pref.max_colors_return,
+                                               histogram_bins=pref.histogram_bins,
+                                               tile_rows=pref.tile_rows,
+                                               return_weights=True,
+                                               stats=stats)
+
+        palette_item = self.create_palette(palette, weights)
+        palette_item.name = os.path.basename(filepaths[0])
+        self.report({'INFO'}, f"Palette from {stats['frames']} frames in {time.perf_counter() - start:.2f}s")
+
+        return {'FINISHED'}
+
+
+class CH_OT_create_palette_from_hdri(CreatePaletteBase, bpy.types.Operator):
+    """Extract a palette from an equirectangular HDRI, weighting every pixel by the solid angle it covers"""
+    bl_idname = 'ch.create_palette_from_hdri'
+    bl_label = 'Palette From HDRI'
+    bl_options = {'UNDO_GROUPED'}
+
+    image_name: StringProperty(name='Image')
+    exposure: FloatProperty(name='Exposure', description='Exposure in stops, applied before tone mapping',
+                            default=0, soft_min=-10, soft_max=10)
+    tone_mapping: EnumProperty(
+        name='Tone Mapping',
+        items=[
+            ('REINHARD', 'Reinhard', 'Compress the luminance of bright colors, keeping their hue'),
+            ('CLIP', 'Clip', 'Clamp every channel to 1'),
+        ],
+        default='REINHARD',
+    )
+    max_size: IntProperty(name='Max Size', description='Long side of the downsampled view the palette is taken from',
+                          default=1024, min=64, soft_max=4096)
+
+    @classmethod
+    def poll(cls, context):
+        return context.area.ui_type == 'IMAGE_EDITOR' or super().poll(context)
+
+    def invoke(self, context, event):
+        if not self.image_name:
+            image = getattr(context.space_data, 'image', None) or self.get_world_image(context)
+            if image is not None:
+                self.image_name = image.name
+
+        return context.window_manager.invoke_props_dialog(self)
+
+    @staticmethod
+    def get_world_image(context):
+        world = context.scene.world
+        if world is None or not world.use_nodes:
+            return None
+
+        for node in world.node_tree.nodes:
+            if node.bl_idname == 'ShaderNodeTexEnvironment' and node.image is not None:
+                return node.image
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.prop_search(self, 'image_name', bpy.data, 'images')
+        layout.prop(self, 'exposure')
+        layout.prop(self, 'tone_mapping')
+        layout.prop(self, 'max_size')
+
+    def execute(self, context):
+        from ..utils.process_image import extract_from_hdri
+
+        image = bpy.data.images.get(self.image_name)
+        if image is None:
+            return self._return(error_msg='Choose an image to extract from')
+        if image.channels not in [3, 4]:
+            return self._return(
+                error_msg=f"This image has {image.channels} channels, but this method can only handle 3 or 4 channels")
+
+        pref = get_pref()
+        start = time.perf_counter()
+        palette, weights = extract_from_hdri(image, max_colors_to_return=pref.max_colors_return,
+                                             exposure=self.exposure,
+                                             tone_mapping=self.tone_mapping,
+                                             max_size=self.max_size,
+                                             histogram_bins=pref.histogram_bins,
+                                             return_weights=True)
+
+        palette_item = self.create_palette(palette, weights)
+        palette_item.name = image.name
+        self.report({'INFO'}, f'Palette extracted in {time.perf_counter() - start:.2f}s')
+
+        return {'FINISHED'}
+
+
+class CH_OT_scan_scene_palettes(CreatePaletteBase, bpy.types.Operator):
+    """Extract a palette from every texture used by the scene materials, each unique image once"""
+    bl_idname = 'ch.scan_scene_palettes'
+    bl_label = 'Scan Scene Textures'
+    bl_options = {'UNDO_GROUPED'}
+
+    scope: EnumProperty(
+        name='Scope',
+        items=[
+            ('SELECTED', 'Selected Objects', 'Materials of the selected objects'),
+            ('FILE', 'Whole File', 'Every material and world of the file'),
+        ],
+        default='SELECTED',
+    )
+    merge: BoolProperty(name='Scene Palette', description='Also merge all palettes into one palette of the scene',
+                        default=True)
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.prop(self, 'scope')
+        layout.prop(self, 'merge')
+
+    def execute(self, context):
+        from ..utils.scene_scan import get_materials, collect_images, dedupe_images
+        from ..utils.process_image import merge_palettes
+
+        start = time.perf_counter()
+        worlds = bpy.data.worlds if self.scope == 'FILE' else [w for w in [context.scene.world] if w]
+        uses = collect_images(get_materials(context, self.scope), worlds)
+        images = [image for image in uses if image.size[0] and image.size[1] and image.channels in [3, 4]]
+        if not images:
+            return self._return(error_msg='No image textures found')
+
+        unique = dedupe_images(images)
+
+        collection = context.scene.ch_palette_collection.add()
+        collection.name = 'Scene Textures'
+        context.scene.ch_palette_enum_collection = str(len(context.scene.ch_palette_collection) - 1)
+
+        palettes = []
+        for image, duplicates in unique:
+            palette, weights = self.extract_with_prefs(image)
+            palette_item = self.create_palette(palette, weights, collection)
+            palette_item.name = image.name
+            # weighted by the materials and worlds using the image or one of its duplicates
+            palettes.append((palette, weights, uses[image] + sum(uses[duplicate] for duplicate in duplicates)))
+
+        if self.merge:
+            palette, weights = merge_palettes(palettes, get_pref().max_colors_return, return_weights=True)
+            palette_item = self.create_palette(palette, weights, collection)
+            palette_item.name = 'Scene Palette'
+            collection.palettes.move(len(collection.palettes) - 1, 0)
+
+        return self._return(info_msg=f'{len(unique)} unique of {len(images)} images extracted '
+                                     f'in {time.perf_counter() - start:.2f}s')
+
+
+class CH_OT_scan_material_colors(CreatePaletteBase, bpy.types.Operator):
+    """Cluster the colors of RGB nodes, Principled base colors and Color Ramps of the materials into palettes"""
+    bl_idname = 'ch.scan_material_colors'
+    bl_label = 'Scan Material Colors'
+    bl_options = {'UNDO_GROUPED'}
+
+    scope: EnumProperty(
+        name='Scope',
+        items=[
+            ('SELECTED', 'Selected Objects', 'Materials of the selected objects'),
+            ('FILE', 'Whole File', 'Every material of the file'),
+        ],
+        default='SELECTED',
+    )
+    group_by: EnumProperty(
+        name='Palette Per',
+        items=[
+            ('MATERIAL', 'Material', 'One palette for every material'),
+            ('COLLECTION', 'Collection', 'One palette for the materials of every collection'),
+            ('FILE', 'File', 'One palette for all materials'),
+        ],
+        default='MATERIAL',
+    )
+    color_diff: FloatProperty(name='Merge Distance', description='Merge colors closer than this in OKLab',
+                              default=0.05, min=0, soft_max=0.3, step=1)
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.prop(self, 'scope')
+        layout.prop(self, 'group_by')
+        layout.prop(self, 'color_diff')
+
+    def execute(self, context):
+        from ..utils.node_colors import group_materials, scan_material_palettes
+
+        start = time.perf_counter()
+        groups = group_materials(context, self.group_by, self.scope)
+        palettes = scan_material_palettes(groups, get_pref().max_colors_return, self.color_diff)
+        if not palettes:
+            return self._return(error_msg='No material colors found')
+
+        collection = context.scene.ch_palette_collection.add()
+        collection.name = 'Material Colors'
+        context.scene.ch_palette_enum_collection = str(len(context.scene.ch_palette_collection) - 1)
+
+        for name, palette, weights in palettes:
+            palette_item = self.create_palette(palette, weights, collection)
+            palette_item.name = name
+
+        return self._return(info_msg=f'{len(palettes)} palettes from {sum(map(len, groups.values()))} materials '
+                                     f'in {time.perf_counter() - start:.2f}s')
+
+
+class CH_OT_create_palette_from_color_attribute(CreatePaletteBase, bpy.types.Operator):
+    """Extract a palette from a color attribute of the selected meshes"""
+    bl_idname = 'ch.create_palette_from_color_attribute'
+    bl_label = 'Palette From Color Attribute'
+    bl_options = {'UNDO_GROUPED'}
+
+    attribute_name: StringProperty(name='Attribute', description='Color attribute to read, the active one if empty')
+    area_weighted: BoolProperty(name='Weight By Area', description='Count every color for the surface it covers',
+                                default=True)
+
+    @classmethod
+    def poll(cls, context):
+        return any(obj.type == 'MESH' for obj in context.selected_objects)
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        obj = context.active_object
+        if obj is not None and obj.type == 'MESH':
+            layout.prop_search(self, 'attribute_name', obj.data, 'color_attributes')
+        else:
+            layout.prop(self, 'attribute_name')
+        layout.prop(self, 'area_weighted')
+
+    def execute(self, context):
+        from ..utils.mesh_colors import extract_from_color_attributes
+
+        meshes = {obj.data for obj in context.selected_objects if obj.type == 'MESH'}
+        if context.mode == 'EDIT_MESH':
+            for obj in context.objects_in_mode:
+                obj.update_from_editmode()
+
+        pref = get_pref()
+        stats = {}
+        start = time.perf_counter()
+        palette, weights = extract_from_color_attributes(meshes, self.attribute_name,
+                                                         area_weighted=self.area_weighted,
+                                                         max_colors_to_return=pref.max_colors_return,
+                                                         histogram_bins=pref.histogram_bins,
+                                                         return_weights=True,
+                                                         stats=stats)
+        if not stats['meshes']:
+            return self._return(error_msg='No color attribute found on the selected meshes')
+
+        palette_item = self.create_palette(palette, weights)
+        palette_item.name = self.attribute_name or getattr(context.active_object, 'name', 'Color Attribute')
+        return self._return(info_msg=f"{stats['elements']} colors of {stats['meshes']} meshes extracted "
+                                     f"in {time.perf_counter() - start:.2f}s")
+
+
+class CH_OT_create_palette_from_render(CreatePaletteBase, bpy.types.Operator):
+    """Render the active camera with Cycles at a small size and extract a palette of the lit scene"""
+    bl_idname = 'ch.create_palette_from_render'
+    bl_label = 'Palette From Camera'
+    bl_options = {'UNDO_GROUPED'}
+
+    resolution: IntProperty(name='Resolution', description='Long side of the render in pixels',
+                            default=128, min=8, soft_max=1024)
+    samples: IntProperty(name='Samples', default=16, min=1, soft_max=256)
+    tone_mapping: EnumProperty(
+        name='Tone Mapping',
+        items=[
+            ('REINHARD', 'Reinhard', 'Compress the luminance of bright colors, keeping their hue'),
+            ('CLIP', 'Clip', 'Clamp every channel to 1'),
+        ],
+        default='REINHARD',
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene.camera is not None
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.prop(self, 'resolution')
+        layout.prop(self, 'samples')
+        layout.prop(self, 'tone_mapping')
+
+    def execute(self, context):
+        from ..utils.render_palette import render_camera
+        from ..utils.process_image import extract_from_render
+
+        scene = context.scene
+        pref = get_pref()
+        with render_camera(scene, self.resolution, self.samples) as (image, render_seconds):
+            if image is None or not image.size[0] or not image.size[1]:
+                return self._return(error_msg='The render could not be written and read back')
+
+            start = time.perf_counter()
+            palette, weights = extract_from_render(image, max_colors_to_return=pref.max_colors_return,
+                                                   exposure=scene.view_settings.exposure,
+                                                   tone_mapping=self.tone_mapping,
+                                                   histogram_bins=pref.histogram_bins,
+                                                   return_weights=True)
+            extract_seconds = time.perf_counter() - start
+
+        palette_item = self.create_palette(palette, weights)
+        palette_item.name = scene.camera.name
+        return self._return(info_msg=f'Rendered in {render_seconds:.2f}s, extracted in {extract_seconds:.3f}s')
+
+
+def image_menu_func(self, context):
+    layout = self.layout
+    layout.separator()
+    layout.operator('ch.create_palette_from_image_region', icon='COLOR')
+    layout.operator('ch.create_palette_from_sequence', icon='SEQUENCE')
+    layout.operator('ch.create_palette_from_hdri', icon='WORLD')
+
+
+def object_menu_func(self, context):
+    layout = self.layout
+    layout.separator()
+    layout.operator('ch.create_palette_from_color_attribute', icon='GROUP_VCOL')
+
+
+def view_menu_func(self, context):
+    layout = self.layout
+    layout.separator()
+    layout.operator('ch.create_palette_from_render', icon='CAMERA_DATA')
+
+
 def register():
     bpy.utils.register_class(CH_OT_create_palette_from_palette)
+    bpy.utils.register_class(CH_OT_create_palette_from_folder)
     bpy.utils.register_class(CH_OT_create_palette_from_clipboard)
+    bpy.utils.register_class(CH_OT_create_palette_from_image_region)
+    bpy.utils.register_class(CH_OT_create_palette_from_sequence)
+    bpy.utils.register_class(CH_OT_create_palette_from_hdri)
+    bpy.utils.register_class(CH_OT_scan_scene_palettes)
+    bpy.utils.register_class(CH_OT_scan_material_colors)
+    bpy.utils.register_class(CH_OT_create_palette_from_color_attribute)
+    bpy.utils.register_class(CH_OT_create_palette_from_render)
+    bpy.types.IMAGE_MT_image.append(image_menu_func)
+    bpy.types.VIEW3D_MT_object.append(object_menu_func)
+    bpy.types.VIEW3D_MT_paint_vertex.append(object_menu_func)
+    bpy.types.VIEW3D_MT_view.append(view_menu_func)
 
 
 def unregister():
+    from ..utils.parallel import shutdown_executor
+
+    shutdown_executor()
+    bpy.types.IMAGE_MT_image.remove(image_menu_func)
+    bpy.types.VIEW3D_MT_object.remove(object_menu_func)
+    bpy.types.VIEW3D_MT_paint_vertex.remove(object_menu_func)
+    bpy.types.VIEW3D_MT_view.remove(view_menu_func)
+    bpy.utils.unregister_class(CH_OT_create_palette_from_image_region)
+    bpy.utils.unregister_class(CH_OT_create_palette_from_sequence)
+    bpy.utils.unregister_class(CH_OT_create_palette_from_hdri)
+    bpy.utils.unregister_class(CH_OT_scan_scene_palettes)
+    bpy.utils.unregister_class(CH_OT_scan_material_colors)
+    bpy.utils.unregister_class(CH_OT_create_palette_from_color_attribute)
+    bpy.utils.unregister_class(CH_OT_create_palette_from_render)
     bpy.utils.unregister_class(CH_OT_create_palette_from_palette)
+    bpy.utils.unregister_class(CH_OT_create_palette_from_folder)
     bpy.utils.unregister_class(CH_OT_create_palette_from_clipboard)
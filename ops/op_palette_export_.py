@@ -10,17 +10,19 @@ COLOR_HEIGHT = 50
 
 
 def make_png_from_palette(palette, save_path=None):
-    from ..utils.process_image import linear_2_srgb
-    colors = [[linear_2_srgb(c) for c in color.color] for color in palette.colors]
+    import numpy as np
+    from ..utils.color_kernels import linear_2_srgb
 
-    pixels = []
-    for color in colors:
-        pixels += list(color) * COLOR_WIDTH
-    pixels *= COLOR_HEIGHT
+    colors = np.empty((len(palette.colors), 4), dtype=np.float32)
+    palette.colors.foreach_get('color', colors.ravel())
+    colors = linear_2_srgb(colors)  # alpha is kept linear
+
+    row = np.repeat(colors, COLOR_WIDTH, axis=0)
+    pixels = np.broadcast_to(row, (COLOR_HEIGHT, *row.shape))
 
     image_width = len(colors) * COLOR_WIDTH
-    image = bpy.data.images.new(palette.name, width=image_width, height=COLOR_HEIGHT)
-    image.pixels = pixels
+    image = bpy.data.images.new(palette.name, width=image_width, height=COLOR_HEIGHT, alpha=True)
+    image.pixels.foreach_set(pixels.ravel())
 
     if save_path:
         image.filepath_raw = save_path
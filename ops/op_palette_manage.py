@@ -99,6 +99,7 @@ class CH_OT_copy_palette(bpy.types.Operator):
         for color_item in src_item.colors:
             clr = item.colors.add()
             clr.color = color_item.color
+            clr.weight = color_item.weight
 
         redraw_area()
 
@@ -180,6 +181,7 @@ class CH_PT_move_palette_to_collection(bpy.types.Operator):
                 for color_item in self.src_palette.colors:
                     clr = palette_item.colors.add()
                     clr.color = color_item.color
+                    clr.weight = color_item.weight
 
                 active_coll.palettes.remove(active_index)
 
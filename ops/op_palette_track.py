@@ -0,0 +1,167 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import bpy
+from bpy.app.handlers import persistent
+from bpy.props import IntProperty
+
+from ..preferences import get_pref
+from .op_palette_create import CreatePaletteBase
+from .op_palette_manage import redraw_area
+
+TRACK_INTERVAL = 0.5
+IDLE_INTERVAL = 2.0
+
+# image name -> (PaintTracker, collection name, palette name)
+trackers = {}
+# names of tracked images edited since their last update
+edited = set()
+_interval = TRACK_INTERVAL
+
+
+def get_paint_image(context):
+    """Image shown in the Image Editor, or the canvas of texture paint mode"""
+    image = getattr(context.space_data, 'image', None)
+    if image is not None:
+        return image
+
+    image_paint = context.scene.tool_settings.image_paint
+    if image_paint.mode == 'IMAGE':
+        return image_paint.canvas
+
+    obj = context.active_object
+    material = obj.active_material if obj is not None else None
+    if material is not None and material.texture_paint_images:
+        return material.texture_paint_images[material.paint_active_slot]
+
+
+def find_palette(collection_name, palette_name):
+    collection = bpy.context.scene.ch_palette_collection.get(collection_name)
+    return collection.palettes.get(palette_name) if collection is not None else None
+
+
+def set_palette_colors(palette, colors, weights):
+    """Update the colors of a palette in place, only touching the ones that changed"""
+    while len(palette.colors) > len(colors):
+        palette.colors.remove(len(palette.colors) - 1)
+    while len(palette.colors) < len(colors):
+        palette.colors.add()
+
+    for clr, color, weight in zip(palette.colors, colors, weights):
+        if tuple(round(c, 4) for c in clr.color) != tuple(color):
+            clr.color = color
+        clr.weight = weight
+
+
+def update_trackers():
+    """bpy.app.timers callback, polls faster while something is being painted"""
+    global _interval
+
+    changed = False
+    for image_name, (tracker, collection_name, palette_name) in list(trackers.items()):
+        image = bpy.data.images.get(image_name)
+        palette = find_palette(collection_name, palette_name)
+        if image is None or palette is None:
+            del trackers[image_name]
+            continue
+
+        if image_name not in edited and not tracker.is_stale(image):
+            continue
+
+        edited.discard(image_name)
+        if tracker.update(image):
+            colors, weights = tracker.result(get_pref().max_colors_return)
+            set_palette_colors(palette, colors, weights)
+            changed = True
+
+    if not trackers:
+        _interval = TRACK_INTERVAL
+        return None
+
+    if changed:
+        redraw_area()
+        _interval = TRACK_INTERVAL
+    else:
+        _interval = min(_interval * 2, IDLE_INTERVAL)
+
+    return _interval
+
+
+@persistent
+def mark_edited_images(scene, depsgraph):
+    """
+    Painting tags the image for a depsgraph update. An image outside the depsgraph (only shown in the Image Editor)
+    is missing from the updates but the tag still runs this handler, so dirty tracked images are marked as well
+    """
+    if not trackers:
+        return
+
+    updated = {update.id.name for update in depsgraph.updates if isinstance(update.id, bpy.types.Image)}
+    for image_name in trackers:
+        image = bpy.data.images.get(image_name)
+        if image_name in updated or (image is not None and image.is_dirty):
+            edited.add(image_name)
+
+
+def stop_trackers():
+    trackers.clear()
+    edited.clear()
+    if bpy.app.timers.is_registered(update_trackers):
+        bpy.app.timers.unregister(update_trackers)
+
+
+class CH_OT_track_paint_palette(CreatePaletteBase, bpy.types.Operator):
+    """Keep a palette of the painted image up to date, only recounting the tiles that changed. Run again to stop"""
+    bl_idname = 'ch.track_paint_palette'
+    bl_label = 'Live Palette'
+    bl_options = {'UNDO_GROUPED'}
+
+    tile_size: IntProperty(name='Tile Size', default=256, min=16, soft_max=1024)
+
+    @classmethod
+    def poll(cls, context):
+        return get_paint_image(context) is not None
+
+    def execute(self, context):
+        from ..utils.paint_tracker import PaintTracker
+
+        image = get_paint_image(context)
+        if image.name in trackers:
+            del trackers[image.name]
+            edited.discard(image.name)
+            self.report({'INFO'}, f'Stopped tracking {image.name}')
+            return {'FINISHED'}
+
+        if image.channels not in [3, 4]:
+            self.report({'ERROR'},
+                        f"This image has {image.channels} channels, but this method can only handle 3 or 4 channels")
+            return {'CANCELLED'}
+
+        palette = self.create_palette([])
+        palette.name = image.name + '_live'
+        collection = context.scene.ch_palette_collection[context.scene.ch_palette_collection_index]
+
+        trackers[image.name] = (PaintTracker(tile_size=self.tile_size, bins=get_pref().histogram_bins),
+                                collection.name, palette.name)
+        if not bpy.app.timers.is_registered(update_trackers):
+            bpy.app.timers.register(update_trackers, first_interval=0)
+
+        self.report({'INFO'}, f'Tracking {image.name}')
+        return {'FINISHED'}
+
+
+def image_menu_func(self, context):
+    self.layout.operator('ch.track_paint_palette', icon='BRUSH_DATA')
+
+
+def register():
+    bpy.utils.register_class(CH_OT_track_paint_palette)
+    bpy.types.IMAGE_MT_image.append(image_menu_func)
+    bpy.app.handlers.depsgraph_update_post.append(mark_edited_images)
+
+
+def unregister():
+    stop_trackers()
+    bpy.app.handlers.depsgraph_update_post.remove(mark_edited_images)
+    bpy.types.IMAGE_MT_image.remove(image_menu_func)
+    bpy.utils.unregister_class(CH_OT_track_paint_palette)
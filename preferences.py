@@ -6,6 +6,8 @@ import os
 from bpy.props import (
     StringProperty,
     IntProperty,
+    EnumProperty,
+    BoolProperty,
 )
 
 from . import __folder_name__
@@ -36,10 +38,26 @@ def update_category(self, context):
         self.report({'ERROR'}, f'Category change failed:\n{e}')
 
 
+def get_extract_cache():
+    """palette cache set up from the preferences, None when caching is disabled"""
+    from .utils.palette_cache import get_palette_cache
+
+    pref = get_pref()
+    if not pref.use_palette_cache:
+        return None
+
+    cache = get_palette_cache()
+    cache.max_bytes = pref.cache_max_size * 1024 ** 2
+    return cache
+
+
 def load_asset():
-    from .utils.process_image import extract_from_palette
+    from .utils.parallel import batch_extract_palette_files
 
-    base_dir = get_pref().asset_lib
+    pref = get_pref()
+    cache = get_extract_cache()
+
+    base_dir = pref.asset_lib
     if not base_dir:
         return None
 
@@ -47,18 +65,14 @@ def load_asset():
     if not os.path.isdir(base_dir):
         return None
 
-    loaded_count = 0
     image_extensions = {'.png', '.jpg', '.jpeg'}
+    new_images = []  # (collection name, palette name, filepath)
 
     for file in os.listdir(base_dir):
         image_dir = os.path.join(base_dir, file)
 
         if not os.path.isdir(image_dir): continue
-        if file in bpy.context.scene.ch_palette_collection:
-            coll_item = bpy.context.scene.ch_palette_collection.get(file)
-        else:
-            coll_item = bpy.context.scene.ch_palette_collection.add()
-            coll_item.name = file
+        coll_item = bpy.context.scene.ch_palette_collection.get(file)
 
         # search sub folder
         for img_name in os.listdir(image_dir):
@@ -67,25 +81,31 @@ def load_asset():
             if f'.{ext.lower()}' not in image_extensions:
                 continue
 
-            if base not in coll_item.palettes:
-                image = None
-                try:
-                    image = bpy.data.images.load(os.path.join(image_dir, img_name), check_existing=False)
-                    # add palette
-                    palette_item = coll_item.palettes.add()
-                    palette_item.name = base
-                    palette_item.expanded = False
-                    # add color
-                    palette = extract_from_palette(image)
-                    for i, color in enumerate(palette):
-                        clr = palette_item.colors.add()
-                        clr.color = color
-                    loaded_count += 1
-                finally:
-                    if image is not None:
-                        bpy.data.images.remove(image)
-
-        if len(coll_item.palettes) == 0: bpy.context.scene.ch_palette_collection.remove(-1)
+            if coll_item is None or base not in coll_item.palettes:
+                new_images.append((file, base, os.path.join(image_dir, img_name)))
+
+    # extract everything in worker processes first, then add the palettes in one go
+    results = batch_extract_palette_files([filepath for _, _, filepath in new_images], pref.worker_count, cache,
+                                          pref.cache_content_hash)
+
+    for (file, base, filepath), (_, palette, _, _) in zip(new_images, results):
+        coll_item = bpy.context.scene.ch_palette_collection.get(file)
+        if coll_item is None:
+            coll_item = bpy.context.scene.ch_palette_collection.add()
+            coll_item.name = file
+        # add palette
+        palette_item = coll_item.palettes.add()
+        palette_item.name = base
+        palette_item.expanded = False
+        # add color
+        for i, color in enumerate(palette):
+            clr = palette_item.colors.add()
+            clr.color = color
+
+    loaded_count = len(results)
+
+    if cache is not None:
+        cache.save()
     # redraw
     for window in bpy.context.window_manager.windows:
         for area in window.screen.areas:
@@ -104,6 +124,50 @@ class CH_Preference(bpy.types.AddonPreferences):
     column_count: IntProperty(name='Column', default=5, min=4)
 
     max_colors_return:IntProperty(name = 'Max Color Return',default=5,min=3)
+    quantizer: EnumProperty(
+        name='Quantizer',
+        items=[
+            ('NONE', 'None', 'Count exact colors and keep the most frequent distinct ones'),
+            ('MEDIAN_CUT', 'Median Cut', 'Split a sample of the image into boxes of similar colors'),
+            ('KMEANS', 'K-Means', 'Cluster a sample of the image with seeded mini-batch k-means'),
+        ],
+        default='NONE',
+    )
+    extract_backend: EnumProperty(
+        name='Extract Backend',
+        items=[
+            ('NUMPY', 'NumPy', 'Read pixels into an array and count colors with array operations'),
+            ('TILED', 'Tiled', 'Count every exact color band by band, after reading the whole image (no memory bound)'),
+            ('OCTREE', 'Octree', 'Stream every pixel into an octree with a fixed node budget, for gradients and HDR images'),
+            ('HISTOGRAM', 'Histogram', 'Count every pixel in a 3D grid of linear RGB bins'),
+            ('PARALLEL', 'Parallel', 'Count the histogram of large images in worker processes, one tile per task'),
+            ('PYTHON', 'Python', 'Loop over the pixels in Python (legacy)'),
+        ],
+        default='NUMPY',
+    )
+    reuse_histograms: BoolProperty(name='Reuse Color Counts',
+                                   description='Keep the counted colors of recent images in memory, so extracting again with other settings skips counting',
+                                   default=True)
+    sampling: EnumProperty(
+        name='Sampling',
+        items=[
+            ('GRID', 'Grid', 'Take the centre pixel of every cell of an even grid'),
+            ('JITTER', 'Jitter', 'Take a random pixel inside every cell of an even grid'),
+            ('ADAPTIVE', 'Adaptive', 'Add jittered batches until the palette stops changing (NumPy backend only)'),
+        ],
+        default='GRID',
+    )
+    sample_count: IntProperty(name='Sample Count', description='Number of pixels sampled per batch',
+                              default=2025, min=16, soft_max=100000)
+    tile_rows: IntProperty(name='Tile Rows', description='Rows of pixels converted per band by the tiled, octree and histogram backends',
+                           default=256, min=1, soft_max=4096)
+    octree_nodes: IntProperty(name='Octree Nodes', description='Maximum number of nodes kept by the octree backend',
+                              default=256, min=16, soft_max=65536)
+    histogram_bins: IntProperty(name='Histogram Bins', description='Bins per channel used by the histogram backend',
+                                default=32, min=4, soft_max=64, max=128)
+    worker_count: IntProperty(name='Workers',
+                              description='Worker processes for the parallel backend and batch palette imports, 0 for one per CPU core',
+                              default=0, min=0, soft_max=64)
     # asset
     asset_lib: StringProperty(
         name='Palette Library Folder',
@@ -111,6 +175,17 @@ class CH_Preference(bpy.types.AddonPreferences):
         subtype='DIR_PATH',
     )
 
+    # cache
+    use_palette_cache: BoolProperty(name='Cache Palettes',
+                                    description='Keep extracted palettes of image files on disk and skip loading unchanged files',
+                                    default=True)
+    cache_max_size: IntProperty(name='Max Cache Size (MB)',
+                                description='Size of the cache file, the least recently used palettes are dropped beyond it',
+                                default=8, min=1, soft_max=256)
+    cache_content_hash: BoolProperty(name='Hash File Contents',
+                                     description='Also compare the file contents, slower but catches edits that keep size and modification time',
+                                     default=False)
+
     def draw(self, context):
         layout = self.layout
         col = layout.column(align=True)
@@ -120,6 +195,51 @@ class CH_Preference(bpy.types.AddonPreferences):
         col.separator()
         # col.prop(self, 'column_count')
         col.prop(self, 'max_colors_return')
+        col.prop(self, 'quantizer')
+        col.prop(self, 'extract_backend')
+        col.prop(self, 'reuse_histograms')
+        if self.extract_backend in {'NUMPY', 'PYTHON'}:
+            col.prop(self, 'sampling')
+            col.prop(self, 'sample_count')
+        if self.extract_backend in {'TILED', 'OCTREE', 'HISTOGRAM'}:
+            col.prop(self, 'tile_rows')
+        if self.extract_backend == 'OCTREE':
+            col.prop(self, 'octree_nodes')
+        elif self.extract_backend in {'HISTOGRAM', 'PARALLEL'}:
+            col.prop(self, 'histogram_bins')
+        col.prop(self, 'worker_count')
+
+        self.draw_cache(layout)
+
+    def draw_cache(self, layout):
+        from .utils.palette_cache import get_palette_cache
+
+        box = layout.box()
+        row = box.row()
+        row.prop(self, 'use_palette_cache')
+        row.operator('ch.clear_palette_cache', icon='TRASH')
+        if not self.use_palette_cache:
+            return
+
+        col = box.column(align=True)
+        col.prop(self, 'cache_max_size')
+        col.prop(self, 'cache_content_hash')
+
+        cache = get_palette_cache()
+        col.label(text=f'{len(cache)} entries ({cache.nbytes / 1024 ** 2:.1f} MB), '
+                       f'{cache.hits} hits, {cache.misses} misses this session')
+
+
+class CH_OT_clear_palette_cache(bpy.types.Operator):
+    bl_idname = 'ch.clear_palette_cache'
+    bl_label = 'Clear Cache'
+
+    def execute(self, context):
+        from .utils.palette_cache import get_palette_cache
+
+        get_palette_cache().clear()
+        self.report({'INFO'}, 'Palette cache cleared')
+        return {'FINISHED'}
 
 
 class CH_OT_load_asset(bpy.types.Operator):
@@ -140,6 +260,7 @@ class CH_OT_load_asset(bpy.types.Operator):
 
 classes = [
     CH_Preference,
+    CH_OT_clear_palette_cache,
     CH_OT_load_asset,
 ]
 
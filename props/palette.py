@@ -17,6 +17,8 @@ def update_color(self, context):
 class PaletteColorProps(PropertyGroup):
     color: FloatVectorProperty(
         subtype='COLOR', name='', min=0.0, max=1.0, size=4, update=update_color)
+    # fraction of the source image pixels this color stands for, 0 when unknown
+    weight: FloatProperty(name='Coverage', subtype='FACTOR', min=0.0, max=1.0, default=0.0)
 
 
 def poll_shader_tree(self, object):
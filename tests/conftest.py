@@ -0,0 +1,24 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# The add-on modules import bpy, run the tests with the bpy module installed (pip install bpy)
+# or with the Python of Blender:
+#
+#     python -m pytest tests
+
+import importlib
+import os
+import sys
+
+import pytest
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_addon_module(name):
+    """Module of the add-on package, e.g. 'utils.process_image', the calling test module is skipped without bpy"""
+    pytest.importorskip('bpy')
+    if os.path.dirname(REPO) not in sys.path:
+        sys.path.insert(0, os.path.dirname(REPO))
+
+    return importlib.import_module(f'{os.path.basename(REPO)}.{name}')
@@ -0,0 +1,18 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import numpy as np
+
+from conftest import import_addon_module
+
+color_correct = import_addon_module('utils.color_correct')
+color_kernels = import_addon_module('utils.color_kernels')
+
+VALUES = np.concatenate([[-0.5, 0, 0.0031308, 0.04045, 1, 2.5], np.linspace(-0.1, 1.2, 1001)])
+
+
+def test_scalar_srgb_curves_match_the_kernels():
+    np.testing.assert_allclose([color_correct.srgb_2_linear(c) for c in VALUES.tolist()],
+                               color_kernels.srgb_2_linear(VALUES), rtol=1e-15, atol=0)
+    np.testing.assert_allclose([color_correct.linear_2_srgb(c) for c in VALUES.tolist()],
+                               color_kernels.linear_2_srgb(VALUES), rtol=1e-15, atol=0)
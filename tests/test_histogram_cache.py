@@ -0,0 +1,71 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import numpy as np
+import pytest
+
+from conftest import import_addon_module
+
+process_image = import_addon_module('utils.process_image')
+
+import bpy  # noqa: E402, after the skip without bpy
+
+
+@pytest.fixture
+def image():
+    image = bpy.data.images.new('histogram_cache_test', 32, 16, alpha=True)
+    yield image
+    bpy.data.images.remove(image)
+
+
+def random_pixels(seed=0):
+    rng = np.random.default_rng(seed)
+    pixels = np.ones((32 * 16, 4), dtype=np.float32)
+    pixels[:, :3] = rng.integers(0, 4, (len(pixels), 3)) / 3
+    return pixels
+
+
+def test_moving_pixels_changes_the_key(image):
+    cache = process_image.HistogramCache()
+    pixels = random_pixels()
+    image.pixels.foreach_set(pixels.ravel())
+    key = cache.pixel_fingerprint(process_image.read_pixels(image))
+
+    moved = pixels.copy()
+    moved[[0, 1]] = moved[[1, 0]]
+    assert not np.array_equal(moved, pixels)
+    image.pixels.foreach_set(moved.ravel())
+
+    assert cache.pixel_fingerprint(process_image.read_pixels(image)) != key
+
+
+def test_unedited_images_are_keyed_without_their_pixels(image):
+    cache = process_image.HistogramCache()
+    key = cache.image_fingerprint(image)
+    assert key is not None
+    assert cache.image_fingerprint(image) == key
+
+    image.pixels.foreach_set(random_pixels().ravel())
+
+    assert image.is_dirty
+    assert cache.image_fingerprint(image) is None
+
+
+def test_edited_image_is_counted_again(image):
+    cache = process_image.HistogramCache()
+    image.pixels.foreach_set(random_pixels(0).ravel())
+
+    stats = {}
+    first = process_image.extract_from_image(image, 8, backend='TILED', histogram_cache=cache, stats=stats)
+    assert stats['histogram_cache'] == 'MISS'
+
+    process_image.extract_from_image(image, 8, backend='TILED', histogram_cache=cache, stats=stats)
+    assert stats['histogram_cache'] == 'HIT'
+
+    pixels = random_pixels(0)
+    pixels[:, :3] = pixels[::-1, :3] * 0.5  # same image, other colors
+    image.pixels.foreach_set(pixels.ravel())
+    second = process_image.extract_from_image(image, 8, backend='TILED', histogram_cache=cache, stats=stats)
+
+    assert stats['histogram_cache'] == 'MISS'
+    assert second != first
@@ -0,0 +1,50 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import numpy as np
+import pytest
+
+from conftest import import_addon_module
+
+process_image = import_addon_module('utils.process_image')
+
+import bpy  # noqa: E402, after the skip without bpy
+
+WIDTH, HEIGHT = 64, 48
+
+
+@pytest.fixture
+def image():
+    image = bpy.data.images.new('image_region_test', WIDTH, HEIGHT, alpha=True)
+    pixels = np.zeros((HEIGHT, WIDTH, 4), dtype=np.float32)
+    pixels[..., 3] = 1
+    pixels[:, :WIDTH // 2, 0] = 1  # red left half, black right half
+    image.pixels.foreach_set(pixels.ravel())
+    yield image
+    bpy.data.images.remove(image)
+
+
+def test_rect_region_of_an_image(image):
+    region = process_image.ImageRegion(image, rect=(0, 0, WIDTH // 2, HEIGHT))
+
+    assert region.size == (WIDTH // 2, HEIGHT)
+    colors = process_image.extract_from_image(region, 5)
+    assert colors == [(1.0, 0.0, 0.0, 1.0)]
+
+
+@pytest.mark.parametrize('backend', ['NUMPY', 'PYTHON'])
+def test_masked_region_of_an_image(image, backend):
+    mask = np.zeros((HEIGHT, WIDTH))
+    mask[:, WIDTH // 2:] = 1
+    region = process_image.ImageRegion(image, mask=mask)
+
+    assert region.pixel_count == WIDTH * HEIGHT // 2
+    assert process_image.extract_from_image(region, 5, backend=backend) == [(0.0, 0.0, 0.0, 1.0)]
+
+
+@pytest.mark.parametrize('pixel_count', [100, 1 << 20])
+def test_masked_region_keeps_the_sample_count(pixel_count):
+    indices = process_image.get_sample_indices(pixel_count, 1, sample_count=2025)
+
+    assert len(indices) == min(pixel_count, 2025)
+    assert len(np.unique(indices)) == len(indices)
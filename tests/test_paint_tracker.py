@@ -0,0 +1,53 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import numpy as np
+import pytest
+
+from conftest import import_addon_module
+
+paint_tracker = import_addon_module('utils.paint_tracker')
+op_palette_track = import_addon_module('ops.op_palette_track')
+
+import bpy  # noqa: E402, after the skip without bpy
+
+
+@pytest.fixture
+def image():
+    image = bpy.data.images.new('paint_tracker_test', 32, 32, alpha=True)
+    yield image
+    bpy.data.images.remove(image)
+
+
+@pytest.fixture
+def tracked(image):
+    tracker = paint_tracker.PaintTracker(tile_size=16)
+    op_palette_track.trackers[image.name] = (tracker, 'Collection', 'paint_tracker_test_live')
+    bpy.app.handlers.depsgraph_update_post.append(op_palette_track.mark_edited_images)
+    yield tracker
+    bpy.app.handlers.depsgraph_update_post.remove(op_palette_track.mark_edited_images)
+    op_palette_track.stop_trackers()
+
+
+def test_unchanged_image_is_not_read_again(image, tracked):
+    assert tracked.is_stale(image)
+    assert tracked.update(image) == 4
+
+    assert not tracked.is_stale(image)
+    bpy.context.view_layer.update()
+    assert image.name not in op_palette_track.edited
+
+
+def test_painted_image_is_marked_by_its_depsgraph_update(image, tracked):
+    tracked.update(image)
+    pixels = np.empty((32, 32, 4), dtype=np.float32)
+    image.pixels.foreach_get(pixels.ravel())
+    pixels[:8, :8] = 1
+    image.pixels.foreach_set(pixels.ravel())
+    assert image.is_dirty and not tracked.is_stale(image)
+
+    image.update_tag()  # the tag painting adds
+    bpy.context.view_layer.update()
+
+    assert image.name in op_palette_track.edited
+    assert tracked.update(image) == 1
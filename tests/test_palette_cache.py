@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import os
+
+from conftest import import_addon_module
+
+palette_cache = import_addon_module('utils.palette_cache')
+
+COLORS = [[0.5, 0.25, 0.125, 1.0]]
+
+
+def make_cache(tmp_path, count=3):
+    cache = palette_cache.PaletteCache(str(tmp_path / 'cache' / 'palette_cache.json'))
+    for i in range(count):
+        cache.put(f'key{i}', COLORS)
+    cache.save()
+    return cache
+
+
+def saved_keys(cache):
+    with open(cache.filepath, encoding='utf-8') as f:
+        return [key for key, _colors in json.load(f)['entries']]
+
+
+def test_hits_do_not_rewrite_the_index(tmp_path):
+    cache = make_cache(tmp_path)
+    os.utime(cache.filepath, ns=(0, 0))
+
+    assert cache.get('key0') == COLORS
+    cache.save()
+
+    assert os.stat(cache.filepath).st_mtime_ns == 0
+    assert saved_keys(cache) == ['key0', 'key1', 'key2']
+
+
+def test_access_order_is_written_with_the_next_change(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.get('key0')
+    cache.put('key3', COLORS)
+    cache.save()
+
+    assert saved_keys(cache) == ['key1', 'key2', 'key0', 'key3']
+
+
+def test_access_order_is_written_at_exit(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.get('key0')
+    cache.save(include_order=True)
+
+    assert saved_keys(cache) == ['key1', 'key2', 'key0']
+
+
+def test_eviction_keeps_recently_used_entries(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.max_bytes = cache.nbytes
+    cache.get('key0')
+    cache.put('key3', COLORS)
+    cache.save()
+
+    reloaded = palette_cache.PaletteCache(cache.filepath)
+    assert reloaded.get('key1') is None
+    assert reloaded.get('key0') == COLORS
+
+
+def test_size_cap_counts_the_bytes_of_every_palette(tmp_path):
+    small, large = COLORS, COLORS * 40
+    cache = make_cache(tmp_path, count=0)
+    cache.max_bytes = cache.entry_bytes('small', small) + 2 * cache.entry_bytes('large0', large) - 1
+    cache.put('small', small)
+    cache.put('large0', large)
+    assert list(cache.entries) == ['small', 'large0']
+
+    # one more large palette does not fit next to both, the least recently used ones go
+    cache.put('large1', large)
+    assert list(cache.entries) == ['large0', 'large1']
+    assert cache.nbytes <= cache.max_bytes
+
+    cache.save()
+    reloaded = palette_cache.PaletteCache(cache.filepath)
+    assert len(reloaded) == 2 and reloaded.nbytes == cache.nbytes
+    assert abs(os.path.getsize(cache.filepath) - cache.nbytes) < 64
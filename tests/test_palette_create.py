@@ -0,0 +1,26 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import import_addon_module
+
+op_palette_create = import_addon_module('ops.op_palette_create')
+
+
+def editor_context(ui_type):
+    return SimpleNamespace(area=SimpleNamespace(ui_type=ui_type), space_data=SimpleNamespace())
+
+
+@pytest.mark.parametrize('operator', [
+    'CH_OT_create_palette_from_image_region',
+    'CH_OT_create_palette_from_sequence',
+    'CH_OT_create_palette_from_hdri',
+])
+def test_image_menu_operators_run_in_the_image_editor(operator):
+    operator = getattr(op_palette_create, operator)
+
+    assert operator.poll(editor_context('IMAGE_EDITOR'))
+    assert not operator.poll(editor_context('TEXT_EDITOR'))
@@ -0,0 +1,53 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import numpy as np
+import pytest
+
+from conftest import import_addon_module
+
+op_palette_export = import_addon_module('ops.op_palette_export_')
+process_image = import_addon_module('utils.process_image')
+
+import bpy  # noqa: E402, after the skip without bpy
+
+# linear colors with alpha below 1, 8 bit sRGB rounding moves them by less than ATOL
+COLORS = np.array([
+    (0.8, 0.05, 0.1, 1.0),
+    (0.2, 0.6, 0.9, 0.5),
+    (0.02, 0.3, 0.04, 0.25),
+], dtype=np.float32)
+ATOL = 5e-3
+
+
+class Colors(list):
+    """the foreach_get used by make_png_from_palette, on a plain list of colors"""
+
+    def foreach_get(self, attribute, values):
+        values[:] = np.ravel(self)
+
+
+class Palette:
+    name = 'export_test'
+    colors = Colors(COLORS.tolist())
+
+
+@pytest.fixture
+def exported(tmp_path):
+    filepath = str(tmp_path / 'export_test.png')
+    image = op_palette_export.make_png_from_palette(Palette(), save_path=filepath)
+    image.save()
+    yield image, filepath
+    bpy.data.images.remove(image)
+
+
+def test_export_import_round_trip_of_a_file(exported):
+    _image, filepath = exported
+
+    np.testing.assert_allclose(process_image.extract_from_palette_file(filepath), COLORS, atol=ATOL)
+
+
+def test_export_import_round_trip_of_an_image(exported):
+    image, _filepath = exported
+
+    np.testing.assert_allclose(process_image.extract_from_palette(image), COLORS, atol=ATOL)
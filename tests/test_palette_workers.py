@@ -0,0 +1,105 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from conftest import import_addon_module
+
+palette_workers = import_addon_module('utils.palette_workers')
+color_kernels = import_addon_module('utils.color_kernels')
+
+COLORS = np.array([
+    (0.9, 0.2, 0.25, 1),
+    (0.95, 0.98, 0.93, 1),
+    (0.66, 0.85, 0.86, 1),
+    (0.27, 0.48, 0.62, 1),
+])
+
+
+def palette_image(grid, cell_width, cell_height):
+    """(height, width, 4) image of a grid of COLORS indices, top row first"""
+    grid = np.asarray(grid)
+    return np.repeat(np.repeat(COLORS[grid], cell_height, axis=0), cell_width, axis=1).astype(np.float32)
+
+
+def assert_colors(colors, indices):
+    np.testing.assert_allclose(colors, color_kernels.srgb_2_linear(COLORS[indices]), atol=1e-6)
+
+
+@pytest.mark.parametrize('cell_width, cell_height', [(100, 100), (75, 40), (50, 50), (37, 120)])
+def test_single_row_of_any_swatch_size(cell_width, cell_height):
+    pixels = palette_image([[0, 1, 2, 3]], cell_width, cell_height)
+
+    assert_colors(palette_workers.palette_colors(pixels, 50, 50), [0, 1, 2, 3])
+
+
+@pytest.mark.parametrize('cell_size', [100, 64])
+def test_grid_of_swatches(cell_size):
+    pixels = palette_image([[0, 1], [2, 3]], cell_size, cell_size)
+
+    assert_colors(palette_workers.palette_colors(pixels, 50, 50), [0, 1, 2, 3])
+
+
+def test_repeated_neighbours_in_an_export():
+    pixels = palette_image([[0, 0, 1, 2, 2, 2]], 50, 50)
+
+    assert_colors(palette_workers.palette_colors(pixels, 50, 50), [0, 0, 1, 2, 2, 2])
+
+
+def test_repeated_neighbours_of_other_swatch_sizes():
+    pixels = palette_image([[0, 0, 1, 3], [2, 3, 3, 1]], 80, 80)
+
+    assert_colors(palette_workers.palette_colors(pixels, 50, 50), [0, 0, 1, 3, 2, 3, 3, 1])
+
+
+def filter_scanlines(rows, filter_types, bpp=4):
+    """PNG filter (height, row_bytes) uint8 rows, one filter type per scanline"""
+    out = []
+    prior = np.zeros(rows.shape[1], dtype=np.int32)
+    for row, filter_type in zip(rows.astype(np.int32), filter_types):
+        left = np.concatenate((np.zeros(bpp, dtype=np.int32), row[:-bpp]))
+        upper_left = np.concatenate((np.zeros(bpp, dtype=np.int32), prior[:-bpp]))
+        pa, pb, pc = np.abs(prior - upper_left), np.abs(left - upper_left), np.abs(left + prior - 2 * upper_left)
+        paeth = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, prior, upper_left))
+        predicted = [0 * row, left, prior, (left + prior) >> 1, paeth][filter_type]
+        out.append(bytes([filter_type]) + ((row - predicted) & 0xFF).astype(np.uint8).tobytes())
+        prior = row
+    return b''.join(out)
+
+
+def write_png(filepath, rgba8, filter_types):
+    height, width, _ = rgba8.shape
+
+    def chunk(chunk_type, data):
+        return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+    data = filter_scanlines(rgba8.reshape(height, -1), filter_types)
+    with open(filepath, 'wb') as f:
+        f.write(palette_workers.PNG_SIGNATURE)
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(data)))
+        f.write(chunk(b'IEND', b''))
+
+
+@pytest.mark.parametrize('filter_types', [[3] * 40, [4] * 40, [0, 1, 2, 3, 4] * 8, [1, 4, 4, 0, 3, 2, 2, 4] * 5])
+def test_read_png_unfilters_exactly(tmp_path, monkeypatch, filter_types):
+    monkeypatch.setattr(palette_workers, 'WAVEFRONT_MAX_ROWS', 16)  # also cross wavefront blocks
+    rgba8 = np.random.default_rng(7).integers(0, 256, (40, 33, 4), dtype=np.uint8)
+    filepath = str(tmp_path / 'noise.png')
+    write_png(filepath, rgba8, filter_types)
+
+    np.testing.assert_array_equal(np.round(palette_workers.read_png(filepath) * 255), rgba8)
+    np.testing.assert_array_equal(np.round(palette_workers.read_png(filepath, max_rows=5) * 255), rgba8[:5])
+
+
+def test_read_png_palette_of_an_export(tmp_path):
+    rgba8 = np.round(palette_image([[0, 1, 2, 3]], 50, 50) * 255).astype(np.uint8)
+    filepath = str(tmp_path / 'export.png')
+    write_png(filepath, rgba8, [4] * 50)
+
+    np.testing.assert_allclose(palette_workers.read_png_palette(filepath, 50, 50),
+                               color_kernels.srgb_2_linear(rgba8[0, ::50] / 255), atol=1e-4)
@@ -0,0 +1,39 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from conftest import import_addon_module
+
+palette_workers = import_addon_module('utils.palette_workers')
+
+
+@pytest.fixture
+def shared_pixels():
+    rng = np.random.default_rng(0)
+    pixels = rng.random((5000, 4), dtype=np.float32)
+    pixels[:, 3] = rng.random(len(pixels)) > 0.2
+
+    shm = shared_memory.SharedMemory(create=True, size=pixels.nbytes)
+    np.ndarray(pixels.shape, dtype=np.float32, buffer=shm.buf)[:] = pixels
+    yield shm.name, pixels
+    shm.close()
+    shm.unlink()
+
+
+@pytest.mark.parametrize('bins', [8, 128])
+def test_histogram_tile_returns_the_used_bins_of_the_dense_histogram(shared_pixels, bins):
+    name, pixels = shared_pixels
+    counts, sums = palette_workers.histogram_counts(pixels[100:4900], bins)
+
+    # small chunks, so the 128 bin grid is counted sparse and merged across chunks
+    codes, tile_counts, tile_sums = palette_workers.histogram_tile(name, pixels.shape, 100, 4900, bins,
+                                                                   chunk_size=1000)
+
+    np.testing.assert_array_equal(codes, np.flatnonzero(counts))
+    np.testing.assert_array_equal(tile_counts, counts[codes])
+    np.testing.assert_allclose(tile_sums, sums[codes])
+    assert len(codes) <= 4800
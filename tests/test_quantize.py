@@ -0,0 +1,47 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import numpy as np
+
+from conftest import import_addon_module
+
+quantize = import_addon_module('utils.quantize')
+
+FLAT_COLORS = np.array([
+    (0.8, 0.04, 0.06, 1),
+    (0.88, 0.95, 0.85, 1),
+    (0.39, 0.7, 0.72, 1),
+    (0.06, 0.2, 0.34, 1),
+    (0.01, 0.04, 0.1, 1),
+])
+
+
+def test_median_cut_returns_flat_colors_exactly():
+    colors = np.repeat(FLAT_COLORS, [400, 250, 150, 120, 80], axis=0)
+    np.random.default_rng(0).shuffle(colors)
+
+    centers, counts = quantize.median_cut(colors, 5)
+
+    np.testing.assert_array_equal(centers, FLAT_COLORS)
+    np.testing.assert_array_equal(counts, [400, 250, 150, 120, 80])
+
+
+def test_median_cut_keeps_equal_colors_in_one_box():
+    # an index median would cut the large box of the first color in half
+    colors = np.repeat(FLAT_COLORS[:2], [900, 100], axis=0)
+
+    centers, counts = quantize.median_cut(colors, 8)
+
+    np.testing.assert_array_equal(centers, FLAT_COLORS[:2])
+    np.testing.assert_array_equal(counts, [900, 100])
+
+
+def test_median_cut_splits_the_most_varied_box():
+    rng = np.random.default_rng(1)
+    dark = np.clip(rng.normal(0.1, 0.01, (500, 4)), 0, 1)
+    light = np.clip(rng.normal(0.9, 0.01, (500, 4)), 0, 1)
+
+    centers, counts = quantize.median_cut(np.concatenate((dark, light)), 2)
+
+    assert counts.tolist() == [500, 500]
+    np.testing.assert_allclose(np.sort(centers[:, 0]), [0.1, 0.9], atol=0.01)
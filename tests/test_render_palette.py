@@ -0,0 +1,25 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+
+from conftest import import_addon_module
+
+render_palette = import_addon_module('utils.render_palette')
+process_image = import_addon_module('utils.process_image')
+
+import bpy  # noqa: E402, after the skip without bpy
+
+
+def test_render_camera_in_background_mode():
+    scene = bpy.context.scene  # the factory startup scene, with a camera, a cube and a light
+    assert bpy.app.background and scene.camera is not None
+    settings = (scene.render.resolution_x, scene.render.engine, scene.render.image_settings.file_format)
+
+    with render_palette.render_camera(scene, resolution=32, samples=1) as (image, _seconds):
+        assert tuple(image.size) == render_palette.render_size(scene, 32)
+        name, filepath = image.name, image.filepath
+        assert 1 <= len(process_image.extract_from_render(image, 3)) <= 3
+
+    assert name not in bpy.data.images and not os.path.exists(filepath)
+    assert (scene.render.resolution_x, scene.render.engine, scene.render.image_settings.file_format) == settings
@@ -0,0 +1,61 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+from conftest import import_addon_module
+
+scene_scan = import_addon_module('utils.scene_scan')
+
+import bpy  # noqa: E402, after the skip without bpy
+
+
+def add_image_node(node_tree, image):
+    node = node_tree.nodes.new('ShaderNodeTexImage')
+    node.image = image
+
+
+@pytest.fixture
+def datablocks():
+    wood, metal = (bpy.data.images.new(name, 4, 4) for name in ('scan_wood', 'scan_metal'))
+    group = bpy.data.node_groups.new('scan_group', 'ShaderNodeTree')
+    add_image_node(group, wood)
+
+    materials = []
+    for name, images in (('scan_a', [wood]), ('scan_b', [metal, metal]), ('scan_c', [])):
+        material = bpy.data.materials.new(name)
+        material.use_nodes = True
+        for image in images:
+            add_image_node(material.node_tree, image)
+        materials.append(material)
+
+    # the group is shared by scan_b and scan_c, and scan_a uses wood directly and through the group
+    for material in materials:
+        material.node_tree.nodes.new('ShaderNodeGroup').node_tree = group
+
+    yield materials, wood, metal
+    for material in materials:
+        bpy.data.materials.remove(material)
+    bpy.data.node_groups.remove(group)
+    bpy.data.images.remove(wood)
+    bpy.data.images.remove(metal)
+
+
+def test_collect_images_counts_every_material_using_an_image(datablocks):
+    materials, wood, metal = datablocks
+
+    assert scene_scan.collect_images(materials) == {wood: 3, metal: 1}
+    assert scene_scan.collect_images([*materials, materials[0]]) == {wood: 3, metal: 1}
+    assert scene_scan.collect_images(materials[2:]) == {wood: 1}
+
+
+def test_scene_palette_weights_palettes_by_their_uses():
+    process_image = import_addon_module('utils.process_image')
+    red, blue = (1.0, 0.0, 0.0, 1.0), (0.0, 0.0, 1.0, 1.0)
+
+    # red covers most of a texture used once, blue a little of one used by three materials
+    palettes = [([red, blue], [0.6, 0.4], 1), ([blue, red], [0.4, 0.1], 3)]
+    colors, weights = process_image.merge_palettes(palettes, 2, return_weights=True)
+
+    assert colors == [blue, red]
+    assert weights == pytest.approx([1.6 / 2.5, 0.9 / 2.5])
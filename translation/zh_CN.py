@@ -14,6 +14,65 @@ data = {
   "Edit Color": "编辑颜色",
   "Create Node Group From Palette": "从调色板创建节点组",
   "Max Color Return": "颜色返回数量",
+  "Extract Backend": "提取后端",
+  "Tile Rows": "分块行数",
+  "Quantizer": "量化器",
+  "Median Cut": "中位切分",
+  "Octree Nodes": "八叉树节点数",
+  "Histogram Bins": "直方图分箱数",
+  "Parallel": "并行",
+  "Workers": "工作进程数",
+  "Palette From Folder": "从文件夹创建调色板",
+  "Import Folder": "导入文件夹",
+  "Include Subfolders": "包含子文件夹",
+  "No palette images found in this folder": "此文件夹中没有找到调色板图像",
+  "Palette From Image Region": "从图像区域创建调色板",
+  "Mask": "遮罩",
+  "Mask Channel": "遮罩通道",
+  "Luminance": "亮度",
+  "Threshold": "阈值",
+  "Invert Mask": "反转遮罩",
+  "Choose an image to extract from": "请选择要提取颜色的图像",
+  "The region is empty": "区域为空",
+  "Palette From Image Sequence": "从图像序列创建调色板",
+  "Frame Stride": "帧间隔",
+  "Palette From HDRI": "从 HDRI 创建调色板",
+  "Exposure": "曝光",
+  "Tone Mapping": "色调映射",
+  "Clip": "裁切",
+  "Max Size": "最大尺寸",
+  "Live Palette": "实时调色板",
+  "Tile Size": "分块尺寸",
+  "Scan Scene Textures": "扫描场景纹理",
+  "Scope": "范围",
+  "Selected Objects": "选中物体",
+  "Whole File": "整个文件",
+  "Scene Palette": "场景调色板",
+  "No image textures found": "未找到图像纹理",
+  "Scan Material Colors": "扫描材质颜色",
+  "Palette Per": "调色板划分",
+  "Material": "材质",
+  "Collection": "集合",
+  "File": "文件",
+  "Merge Distance": "合并距离",
+  "No material colors found": "未找到材质颜色",
+  "Palette From Color Attribute": "从颜色属性创建调色板",
+  "Attribute": "属性",
+  "Weight By Area": "按面积加权",
+  "Palette From Camera": "从相机创建调色板",
+  "Region Eyedropper": "区域吸管",
+  "Size": "尺寸",
+  "Resolution": "分辨率",
+  "Samples": "采样",
+  "The render could not be written and read back": "无法写入并读回渲染结果",
+  "No color attribute found on the selected meshes": "选中的网格上没有找到颜色属性",
+  "Sampling": "采样",
+  "Sample Count": "采样数量",
+  "Cache Palettes": "缓存调色板",
+  "Reuse Color Counts": "复用颜色统计",
+  "Clear Cache": "清除缓存",
+  "Max Cache Size (MB)": "最大缓存大小 (MB)",
+  "Palette cache cleared": "调色板缓存已清除",
   "Extra": "其他",
   "Create Ramp Node": "创建渐变节点",
   "Create Palette Image": "创建色卡图像",
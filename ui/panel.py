@@ -61,6 +61,9 @@ class CH_PT_collection_manager(bpy.types.Panel):
             row.operator('ch.batch_export_palette', icon='EXPORT', text='').collection_index = i
 
         layout.box().operator('ch.add_collection', icon='ADD', text='New Collection', emboss=False)
+        layout.box().operator('ch.create_palette_from_folder', icon='FILE_FOLDER', text='Import Folder', emboss=False)
+        layout.box().operator('ch.scan_scene_palettes', icon='TEXTURE', text='Scan Scene Textures', emboss=False)
+        layout.box().operator('ch.scan_material_colors', icon='MATERIAL', text='Scan Material Colors', emboss=False)
 
 
 class CH_OT_palette_extra_op_caller(bpy.types.Operator):
@@ -89,6 +92,7 @@ class CH_OT_palette_extra_op_caller(bpy.types.Operator):
                             icon='COLORSET_13_VEC'
                             ).palette_index = index
             layout.operator('ch.create_paint_palette', icon='COLOR').palette_index = index
+            layout.operator('ch.image_eyedropper', icon='EYEDROPPER').palette_index = index
             layout.separator()
 
             layout.operator('ch.copy_palette', icon='DUPLICATE').palette_index = index
@@ -1,20 +1,24 @@
 # SPDX-FileCopyrightText: 2026 Atticus
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-# gamma correct
+# gamma correct, scalar versions of the color_kernels sRGB curves (same results, plain math for per pixel loops)
 ######################
+from math import pow
+
+import numpy as np
+
+from . import color_kernels
+
+
 def srgb_2_linear(c, gamma=2.4):
     if c < 0:
-        return 0
+        return 0.0
     elif c < 0.04045:
         return c / 12.92
     else:
         return ((c + 0.055) / 1.055) ** gamma
 
 
-from math import pow
-
-
 def linear_2_srgb(c, gamma_value=2.4):
     if c < 0.0031308:
         srgb = 0.0 if c < 0.0 else c * 12.92
@@ -24,6 +28,11 @@ def linear_2_srgb(c, gamma_value=2.4):
     return srgb
 
 
+# array versions
+srgb_2_linear_array = color_kernels.srgb_2_linear
+linear_2_oklab_array = color_kernels.linear_2_oklab
+
+
 ######################
 
 # Text convert (Include gamma correct)
@@ -91,58 +100,20 @@ class Str2Color():
 # Lab Convert
 ######################
 
-white_points = {
-    'D50': [0.9642, 1.0000, 0.8251],
-    'D55': [0.9568, 1.0000, 0.9214],
-    'D65': [0.9504, 1.0000, 1.0888],
-
-}
+white_points = color_kernels.WHITE_POINTS
 
 
 def rgb2lab(inputColor, srgb=False, white_point='D55'):
+    """
+    Lab of one color, rounded to 4 decimals.
+    XYZ is rounded and scaled to 0-100 before the cube root as it always was, so Pantone matches stay the same
+    """
+    rgb = np.asarray(inputColor[:3], dtype=np.float64)
     if srgb is True:
-        RGB = srgb_2_linear(inputColor)
-    else:
-        RGB = inputColor
-
-    XYZ = [0, 0, 0, ]
-
-    X = RGB[0] * 0.4124 + RGB[1] * 0.3576 + RGB[2] * 0.1805
-    Y = RGB[0] * 0.2126 + RGB[1] * 0.7152 + RGB[2] * 0.0722
-    Z = RGB[0] * 0.0193 + RGB[1] * 0.1192 + RGB[2] * 0.9505
-
-    XYZ[0] = round(X, 4)
-    XYZ[1] = round(Y, 4)
-    XYZ[2] = round(Z, 4)
-
-    wp_xyz = white_points[white_point]
+        rgb = color_kernels.srgb_2_linear(rgb)
 
-    XYZ[0] = float(XYZ[0]) / wp_xyz[0] * 100
-    XYZ[1] = float(XYZ[1]) / wp_xyz[1] * 100
-    XYZ[2] = float(XYZ[2]) / wp_xyz[2] * 100
-
-    for i, value in enumerate(XYZ):
-        if value > 0.008856:
-            value = value ** (1 / 3)
-        else:
-            value = (7.787 * value) + (16 / 116)
-
-        XYZ[i] = value
-
-    Lab = [0, 0, 0]
-
-    L = (116 * XYZ[1]) - 16
-    a = 500 * (XYZ[0] - XYZ[1])
-    b = 200 * (XYZ[1] - XYZ[2])
-
-    Lab[0] = round(L, 4)
-    Lab[1] = round(a, 4)
-    Lab[2] = round(b, 4)
-
-    return Lab
-
-
-import numpy as np
+    xyz = np.round(color_kernels.linear_2_xyz(rgb), 4) * 100
+    return np.round(color_kernels.xyz_2_lab(xyz, white_point), 4).tolist()
 
 
 def find_closest_lab_color(colors_list, color):
@@ -156,19 +127,33 @@ def find_closest_lab_color(colors_list, color):
 
 import os
 
+_pantone_library = None
+
+
+def get_pantone_library():
+    """Pantone names, linear rgb and Lab (D55, see rgb2lab) arrays, loaded once"""
+    global _pantone_library
+
+    if _pantone_library is None:
+        import json
+        dict_file = os.path.join(os.path.dirname(__file__), 'lib', 'pantone_hex.json')
+        with open(dict_file) as f:
+            pantone_dict = json.load(f)
+
+        srgb = np.array([[int(value.lstrip('#')[i:i + 2], 16) for i in (0, 2, 4)] for value in pantone_dict.values()])
+        rgb = color_kernels.srgb_2_linear(srgb / 0xff)
+        xyz = np.round(color_kernels.linear_2_xyz(rgb), 4) * 100
+        lab = np.round(color_kernels.xyz_2_lab(xyz, 'D55'), 4)
+        _pantone_library = (list(pantone_dict.keys()), rgb, lab)
+
+    return _pantone_library
+
+
 # library base on http://www.excaliburcreations.com/pantone.html
 def find_closest_pantone(rgb, white_point='D55'):
-    import json
-    dict_file = os.path.join(os.path.dirname(__file__), 'lib', 'pantone_hex.json')
-    with open(dict_file) as f:
-        pantone_dict = json.load(f)
-
-    pantone_names = list(pantone_dict.keys())
-    pantone_hex = list(pantone_dict.values())
-    pantone_rgb = [hex_to_rgba(value)[0:3] for value in pantone_hex]
-    pantone_lab = [rgb2lab(value, white_point='D55') for value in pantone_rgb]
+    pantone_names, pantone_rgb, pantone_lab = get_pantone_library()
 
     idx, lab_color = find_closest_lab_color(pantone_lab, rgb2lab(rgb, white_point='D55'))
     idx = idx[0][0]
 
-    return (pantone_names[idx], pantone_rgb[idx])
+    return (pantone_names[idx], tuple(pantone_rgb[idx].tolist()))
@@ -0,0 +1,224 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Vectorized color space conversions.
+# Every function takes a (..., 3) or (..., 4) array (a single color works too) and converts the first
+# 3 channels, the 4th channel (alpha) is copied unchanged. The sRGB curves also take arrays of any shape.
+# float32 input stays float32, anything else is converted in float64.
+# RGB is Rec.709 / sRGB primaries, "linear" is scene linear RGB.
+
+import numpy as np
+
+from .palette_workers import srgb_curve
+
+# RGB -> XYZ matrix of rgb2lab, rows are X, Y, Z
+RGB_2_XYZ = np.array([
+    [0.4124, 0.3576, 0.1805],
+    [0.2126, 0.7152, 0.0722],
+    [0.0193, 0.1192, 0.9505],
+])
+XYZ_2_RGB = np.linalg.inv(RGB_2_XYZ)
+
+WHITE_POINTS = {
+    'D50': (0.9642, 1.0000, 0.8251),
+    'D55': (0.9568, 1.0000, 0.9214),
+    'D65': (0.9504, 1.0000, 1.0888),
+}
+
+# https://bottosson.github.io/posts/oklab/
+LINEAR_2_LMS = np.array([
+    [0.4122214708, 0.5363325363, 0.0514459929],
+    [0.2119034982, 0.6806995451, 0.1073969566],
+    [0.0883024619, 0.2817188376, 0.6299787005],
+])
+LMS_2_OKLAB = np.array([
+    [0.2104542553, 0.7936177850, -0.0040720468],
+    [1.9779984951, -2.4285922050, 0.4505937099],
+    [0.0259040371, 0.7827717662, -0.8086757660],
+])
+OKLAB_2_LMS = np.array([
+    [1.0, 0.3963377774, 0.2158037573],
+    [1.0, -0.1055613458, -0.0638541728],
+    [1.0, -0.0894841775, -1.2914855480],
+])
+LMS_2_LINEAR = np.array([
+    [4.0767416621, -3.3077115913, 0.2309699292],
+    [-1.2684380046, 2.6097574011, -0.3413193965],
+    [-0.0041960863, -0.7034186147, 1.7076147010],
+])
+
+LAB_EPSILON = 0.008856
+LAB_KAPPA = 7.787
+
+
+def as_float(values):
+    values = np.asarray(values)
+    return values if values.dtype in (np.float32, np.float64) else values.astype(np.float64)
+
+
+def per_color(function):
+    """
+    Apply a (..., 3) -> (..., 3) conversion to the color channels of (..., 3) or (..., 4) colors,
+    copying the alpha channel. Per channel conversions also accept any other shape.
+    """
+
+    def convert(values, *args, **kwargs):
+        values = as_float(values)
+        if values.ndim == 0 or values.shape[-1] != 4:
+            return function(values, *args, **kwargs).astype(values.dtype, copy=False)
+
+        out = np.empty(values.shape, dtype=values.dtype)
+        out[..., :3] = function(values[..., :3], *args, **kwargs)
+        out[..., 3:] = values[..., 3:]
+        return out
+
+    convert.__name__ = function.__name__
+    convert.__doc__ = function.__doc__
+    return convert
+
+
+def transform(values, matrix):
+    """Multiply every color by a 3 x 3 matrix"""
+    return values @ matrix.T.astype(values.dtype, copy=False)
+
+
+# sRGB transfer function
+######################
+
+def srgb_curve_inverse(values, gamma=2.4):
+    """linear_2_srgb of the color_correct module, on any array"""
+    curve = 1.055 * np.maximum(values, 0.0031308) ** (1.0 / gamma) - 0.055
+    srgb = np.where(values < 0.0031308, np.where(values < 0, 0, values * 12.92), curve)
+    return srgb.astype(values.dtype, copy=False)
+
+
+_srgb_2_linear = per_color(srgb_curve)
+
+SRGB_2_LINEAR_LUT8 = srgb_curve(np.arange(256, dtype=np.float64) / 255).astype(np.float32)
+SRGB_2_LINEAR_LUT16 = srgb_curve(np.arange(65536, dtype=np.float64) / 65535).astype(np.float32)
+
+
+def srgb_2_linear(values, gamma=2.4):
+    """
+    sRGB to linear. 8 and 16 bit integer colors are looked up in SRGB_2_LINEAR_LUT8 / LUT16 (float32 result),
+    the alpha channel of integer colors is normalized to [0, 1]
+    """
+    values = np.asarray(values)
+    if values.dtype in (np.uint8, np.uint16) and gamma == 2.4:
+        lut, scale = (SRGB_2_LINEAR_LUT8, 255) if values.dtype == np.uint8 else (SRGB_2_LINEAR_LUT16, 65535)
+        if values.ndim == 0 or values.shape[-1] != 4:
+            return lut[values]
+
+        out = np.empty(values.shape, dtype=np.float32)
+        out[..., :3] = lut[values[..., :3]]
+        out[..., 3] = values[..., 3] / np.float32(scale)
+        return out
+
+    return _srgb_2_linear(values, gamma)
+
+
+def srgb_2_linear_lut(values):
+    """
+    Approximate srgb_2_linear of float colors in [0, 1] through the 16 bit lookup table,
+    within 2e-5 of the exact curve
+    """
+    values = as_float(values)
+    channels = slice(None) if values.ndim == 0 or values.shape[-1] != 4 else slice(0, 3)
+    out = np.array(values, dtype=np.float32)
+    out[..., channels] = SRGB_2_LINEAR_LUT16[np.rint(np.clip(values[..., channels], 0, 1) * 65535).astype(np.uint16)]
+    return out
+
+
+linear_2_srgb = per_color(srgb_curve_inverse)
+
+
+# HSV
+######################
+
+@per_color
+def rgb_2_hsv(rgb):
+    """RGB to HSV in [0, 1], the same as colorsys.rgb_to_hsv"""
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    maxc = rgb.max(axis=-1)
+    rangec = maxc - rgb.min(axis=-1)
+    colored = rangec != 0
+    safe_range = np.where(colored, rangec, 1)
+
+    rc, gc, bc = (maxc - r) / safe_range, (maxc - g) / safe_range, (maxc - b) / safe_range
+    h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    h = np.where(colored, (h / 6.0) % 1.0, 0)
+    s = np.where(colored, rangec / np.where(maxc != 0, maxc, 1), 0)
+
+    return np.stack((h, s, maxc), axis=-1)
+
+
+# rgb channel order for every sector of the hue circle, 0: v, 1: p, 2: q, 3: t
+HSV_SECTORS = np.array([(0, 3, 1), (2, 0, 1), (1, 0, 3), (1, 2, 0), (3, 1, 0), (0, 1, 2)])
+
+
+@per_color
+def hsv_2_rgb(hsv):
+    """HSV to RGB, the same as colorsys.hsv_to_rgb"""
+    h, s, v = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+    i = np.trunc(h * 6.0)
+    f = h * 6.0 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+
+    values = np.stack((v, p, q, t), axis=-1)
+    order = HSV_SECTORS[i.astype(np.int64) % 6]
+    rgb = np.take_along_axis(values, order, axis=-1)
+    return np.where((s == 0)[..., None], v[..., None], rgb)
+
+
+# XYZ and CIE Lab
+######################
+
+@per_color
+def linear_2_xyz(rgb):
+    return transform(rgb, RGB_2_XYZ)
+
+
+@per_color
+def xyz_2_linear(xyz):
+    return transform(xyz, XYZ_2_RGB)
+
+
+@per_color
+def xyz_2_lab(xyz, white_point='D65'):
+    """XYZ relative to white_point (Y of white is 1) to CIE L*a*b*"""
+    t = xyz / np.asarray(WHITE_POINTS[white_point], dtype=xyz.dtype)
+    f = np.where(t > LAB_EPSILON, np.cbrt(t), LAB_KAPPA * t + 16 / 116)
+
+    return np.stack((116 * f[..., 1] - 16, 500 * (f[..., 0] - f[..., 1]), 200 * (f[..., 1] - f[..., 2])), axis=-1)
+
+
+@per_color
+def lab_2_xyz(lab, white_point='D65'):
+    fy = (lab[..., 0] + 16) / 116
+    f = np.stack((fy + lab[..., 1] / 500, fy, fy - lab[..., 2] / 200), axis=-1)
+    t = np.where(f > np.cbrt(LAB_EPSILON), f ** 3, (f - 16 / 116) / LAB_KAPPA)
+
+    return t * np.asarray(WHITE_POINTS[white_point], dtype=lab.dtype)
+
+
+def linear_2_lab(rgb, white_point='D65'):
+    return xyz_2_lab(linear_2_xyz(rgb), white_point)
+
+
+def lab_2_linear(lab, white_point='D65'):
+    return xyz_2_linear(lab_2_xyz(lab, white_point))
+
+
+# OKLab
+######################
+
+@per_color
+def linear_2_oklab(rgb):
+    return transform(np.cbrt(transform(rgb, LINEAR_2_LMS)), LMS_2_OKLAB)
+
+
+@per_color
+def oklab_2_linear(lab):
+    return transform(transform(lab, OKLAB_2_LMS) ** 3, LMS_2_LINEAR)
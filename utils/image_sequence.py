@@ -0,0 +1,65 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import re
+
+FRAME_PATTERN = re.compile(r'^(.*?)(\d+)(\.[^.]+)$')
+MOVIE_EXTENSIONS = {'.mp4', '.mov', '.avi', '.mkv', '.webm', '.mpg', '.mpeg', '.ogv', '.flv', '.m4v', '.dv'}
+
+
+def is_movie_file(filepath):
+    return os.path.splitext(filepath)[1].lower() in MOVIE_EXTENSIONS
+
+
+def sequence_frame_paths(filepath):
+    """
+    Every file of the numbered image sequence one frame belongs to (name0001.png, name0002.png, ...),
+    sorted by frame number. A file without a frame number is a sequence of one.
+    """
+    directory, name = os.path.split(os.path.abspath(filepath))
+    match = FRAME_PATTERN.match(name)
+    if match is None:
+        return [filepath]
+
+    head, _digits, tail = match.groups()
+    frames = []
+    for other in os.listdir(directory):
+        other_match = FRAME_PATTERN.match(other)
+        if other_match and other_match.group(1) == head and other_match.group(3).lower() == tail.lower():
+            frames.append((int(other_match.group(2)), other))
+
+    return [os.path.join(directory, other) for _frame, other in sorted(frames)]
+
+
+def iter_frames(filepaths, frame_stride=1):
+    """
+    Yield every frame_stride-th frame as an Image like object, one at a time.
+    PNG frames are decoded without Blender, other formats are loaded as a temporary Image.
+    Each frame is released as soon as the next one is requested.
+    """
+    from .palette_workers import read_png
+    from .process_image import ArrayImage
+
+    for filepath in filepaths[::max(1, frame_stride)]:
+        try:
+            pixels = read_png(filepath)
+        except (ValueError, OSError):
+            pixels = None
+
+        if pixels is not None:
+            height, width = pixels.shape[:2]
+            frame = ArrayImage(pixels[::-1].reshape(-1, 4), (width, height), os.path.basename(filepath))
+            pixels = None
+            yield frame
+            frame = None
+            continue
+
+        import bpy
+
+        image = bpy.data.images.load(filepath, check_existing=False)
+        try:
+            yield image
+        finally:
+            image.buffers_free()
+            bpy.data.images.remove(image)
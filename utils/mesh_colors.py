@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import numpy as np
+
+from .process_image import ColorHistogram, palette_from_histogram
+
+
+def get_color_attribute(mesh, attribute_name=''):
+    """
+    Color attribute by name, or the active color attribute when attribute_name is empty
+    """
+    if attribute_name:
+        return mesh.color_attributes.get(attribute_name)
+
+    return mesh.color_attributes.active_color
+
+
+def element_areas(mesh, domain):
+    """
+    Area every element of a domain stands for: the face area for faces,
+    an equal share of it for every corner, and the sum of the shares of its corners for a vertex
+    """
+    face_count = len(mesh.polygons)
+    areas = np.empty(face_count, dtype=np.float32)
+    mesh.polygons.foreach_get('area', areas)
+    if domain == 'FACE':
+        return areas.astype(np.float64)
+
+    loop_starts = np.empty(face_count, dtype=np.int32)
+    loop_totals = np.empty(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get('loop_start', loop_starts)
+    mesh.polygons.foreach_get('loop_total', loop_totals)
+
+    order = np.argsort(loop_starts, kind='stable')  # corners of a face are contiguous, in face order
+    corner_areas = np.repeat(areas[order] / np.maximum(loop_totals[order], 1), loop_totals[order]).astype(np.float64)
+    if domain == 'CORNER':
+        return corner_areas
+
+    vertex_indices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get('vertex_index', vertex_indices)
+    return np.bincount(vertex_indices, weights=corner_areas, minlength=len(mesh.vertices))
+
+
+def attribute_colors(mesh, attribute_name='', area_weighted=False):
+    """
+    Read a color attribute of a mesh with foreach_get.
+    Return the (N, 4) linear colors and the area of every element when area_weighted, or (None, None)
+    """
+    attribute = get_color_attribute(mesh, attribute_name)
+    if attribute is None or len(attribute.data) == 0:
+        return None, None
+
+    colors = np.empty(len(attribute.data) * 4, dtype=np.float32)
+    attribute.data.foreach_get('color', colors)
+    colors = colors.reshape(-1, 4)
+
+    return colors, element_areas(mesh, attribute.domain) if area_weighted else None
+
+
+def extract_from_color_attributes(meshes, attribute_name='', area_weighted=True, max_colors_to_return=5,
+                                  histogram_bins=32, return_weights=False, stats=None):
+    """
+    Palette of a color attribute of several meshes, counted with the same ColorHistogram as image pixels.
+    area_weighted: every element counts for the surface it covers instead of once
+    stats: optional dict, filled with 'elements' and 'meshes'
+    """
+    histogram = ColorHistogram(bins=histogram_bins, weighted=True)
+    element_count = 0
+    mesh_count = 0
+    for mesh in meshes:
+        colors, areas = attribute_colors(mesh, attribute_name, area_weighted)
+        if colors is None:
+            continue
+
+        histogram.add(colors, areas, linear=True)
+        element_count += len(colors)
+        mesh_count += 1
+
+    if stats is not None:
+        stats['elements'] = element_count
+        stats['meshes'] = mesh_count
+
+    total = histogram.counts.sum()
+    scale = element_count / total if total > 0 else 1.0  # area sums to equivalent elements
+
+    return palette_from_histogram(histogram, max_colors_to_return, return_weights, scale)
@@ -0,0 +1,120 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import numpy as np
+
+import bpy
+
+from .scene_scan import get_materials
+
+
+class NodeColorScanner:
+    """
+    Gather the flat colors of shader node trees: RGB nodes, unlinked Principled base colors and ColorRamp elements.
+
+    The colors of every node tree are read once and kept as one (N, 4) array,
+    so a node group shared by many materials is only searched the first time it is met.
+    """
+
+    def __init__(self):
+        self.tree_colors = {}  # node tree -> colors of the tree and of its node groups
+
+    @staticmethod
+    def read_tree(node_tree):
+        """
+        Colors of the nodes of one node tree, not looking inside node groups.
+        Return the (N, 4) colors and the node trees of the node groups
+        """
+        colors = []
+        ramps = []
+        groups = []
+        for node in node_tree.nodes:
+            idname = node.bl_idname
+            if idname == 'ShaderNodeRGB':
+                colors.append(node.outputs[0].default_value[:])
+            elif idname == 'ShaderNodeBsdfPrincipled':
+                socket = node.inputs['Base Color']
+                if not socket.is_linked:
+                    colors.append(socket.default_value[:])
+            elif idname == 'ShaderNodeValToRGB':
+                elements = node.color_ramp.elements
+                ramp = np.empty(len(elements) * 4, dtype=np.float32)
+                elements.foreach_get('color', ramp)
+                ramps.append(ramp.reshape(-1, 4))
+            elif idname == 'ShaderNodeGroup' and node.node_tree is not None:
+                groups.append(node.node_tree)
+
+        return np.concatenate([np.array(colors, dtype=np.float32).reshape(-1, 4), *ramps]), groups
+
+    def colors(self, node_tree):
+        """
+        (N, 4) linear colors of a node tree and of every node group inside it
+        """
+        if node_tree is None:
+            return np.empty((0, 4), dtype=np.float32)
+
+        if node_tree not in self.tree_colors:
+            self.tree_colors[node_tree] = np.empty((0, 4), dtype=np.float32)  # guards against recursive groups
+            colors, groups = self.read_tree(node_tree)
+            self.tree_colors[node_tree] = np.concatenate([colors, *(self.colors(group) for group in set(groups))])
+
+        return self.tree_colors[node_tree]
+
+    def material_colors(self, material):
+        if not material.use_nodes:
+            return np.array([material.diffuse_color[:]], dtype=np.float32)
+
+        return self.colors(material.node_tree)
+
+
+def object_materials(obj):
+    return {slot.material for slot in getattr(obj, 'material_slots', ()) if slot.material is not None}
+
+
+def group_materials(context, group_by='MATERIAL', scope='SELECTED'):
+    """
+    Materials to make every palette from.
+    group_by: 'MATERIAL' for a palette per material, 'COLLECTION' for a palette per collection of objects,
+              'FILE' for one palette
+    Return {palette name: materials}
+    """
+    if group_by == 'MATERIAL':
+        return {material.name: [material] for material in get_materials(context, scope)}
+
+    if group_by == 'FILE':
+        return {'File': get_materials(context, scope)}
+
+    groups = {}
+    objects = context.selected_objects if scope == 'SELECTED' else bpy.data.objects
+    for obj in objects:
+        materials = object_materials(obj)
+        if not materials:
+            continue
+
+        for collection in obj.users_collection:
+            groups.setdefault(collection.name, set()).update(materials)
+
+    return {name: list(materials) for name, materials in groups.items()}
+
+
+def scan_material_palettes(groups, max_colors_to_return=5, color_diff=0.05):
+    """
+    Cluster the node colors of every group of materials into a palette.
+    Colors closer than color_diff in OKLab are merged, the palette keeps the most used ones.
+    Return [(palette name, colors, weights)], empty groups are left out
+    """
+    from .process_image import palette_from_counts
+
+    scanner = NodeColorScanner()
+    palettes = []
+    for name, materials in groups.items():
+        colors = [scanner.material_colors(material) for material in materials]
+        colors = np.clip(np.concatenate(colors), 0, 1) if colors else np.empty((0, 4))
+        if len(colors) == 0:
+            continue
+
+        palette, weights = palette_from_counts(colors, np.ones(len(colors)), max_colors_to_return,
+                                               return_weights=True, color_diff=color_diff)
+        palettes.append((name, palette, weights))
+
+    return palettes
@@ -0,0 +1,106 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import numpy as np
+
+from .palette_workers import histogram_counts
+from .process_image import ColorHistogram, HistogramCache, select_colors, get_coverage
+
+
+class PaintTracker:
+    """
+    Incremental palette of an image that is being painted.
+
+    The image is split into tile_size square tiles. Every tile keeps a checksum of its pixels and a sparse
+    histogram (the used bins of a ColorHistogram), and the total of all tiles is kept in one ColorHistogram.
+    update() reads the pixels into a reused buffer, checksums every tile in one vectorized pass per tile row
+    and only counts the tiles whose checksum changed again, replacing their share of the total.
+    is_stale() tells without reading the pixels whether a saved image needs an update at all.
+    """
+
+    def __init__(self, tile_size=256, bins=32, ignore_alpha_below=1):
+        self.tile_size = tile_size
+        self.bins = bins
+        self.ignore_alpha_below = ignore_alpha_below
+        self.reset()
+
+    def reset(self):
+        self.shape = None
+        self.buffer = None
+        self.checksums = None
+        self.fingerprint = None  # HistogramCache.image_fingerprint at the last update
+        self.tiles = {}  # (tile row, tile column) -> (bin codes, counts, sums)
+        self.histogram = ColorHistogram(bins=self.bins, ignore_alpha_below=self.ignore_alpha_below)
+
+    def tile_checksums(self, pixels):
+        """
+        Sum of the raw float bits of every tile, (tile rows, tile columns) uint64
+        """
+        height, width, channel_count = pixels.shape
+        bits = pixels.reshape(height, width * channel_count).view(np.uint32)
+        column_starts = np.arange(0, width, self.tile_size) * channel_count
+
+        return np.array([
+            np.add.reduceat(bits[y:y + self.tile_size].sum(axis=0, dtype=np.uint64), column_starts)
+            for y in range(0, height, self.tile_size)
+        ])
+
+    def is_stale(self, image):
+        """
+        Whether image may differ from the counted pixels: it was never counted, or it has no unsaved edits
+        and was reloaded or replaced since. Unsaved edits are not seen here, painting is followed by depsgraph updates
+        """
+        if self.checksums is None:
+            return True
+        if image.is_dirty:
+            return False
+
+        return HistogramCache.image_fingerprint(image) != self.fingerprint
+
+    def update(self, image):
+        """
+        Count the tiles of image that changed since the last update.
+        Return the number of counted tiles, 0 when nothing changed.
+        """
+        width, height = image.size
+        shape = (height, width, image.channels)
+        if shape != self.shape:
+            self.reset()
+            self.shape = shape
+            self.buffer = np.empty(shape, dtype=np.float32)
+
+        image.pixels.foreach_get(self.buffer.reshape(-1))
+        checksums = self.tile_checksums(self.buffer)
+        if self.checksums is None:
+            changed = np.argwhere(np.ones(checksums.shape, dtype=bool))
+        else:
+            changed = np.argwhere(checksums != self.checksums)
+
+        size = self.tile_size
+        histogram = self.histogram
+        for tile_row, tile_column in changed.tolist():
+            tile = self.buffer[tile_row * size:(tile_row + 1) * size, tile_column * size:(tile_column + 1) * size]
+            counts, sums = histogram_counts(tile.reshape(-1, shape[2]), self.bins, self.ignore_alpha_below)
+            used = np.flatnonzero(counts)
+
+            old = self.tiles.get((tile_row, tile_column))
+            if old is not None:
+                histogram.counts[old[0]] -= old[1]
+                histogram.sums[old[0]] -= old[2]
+
+            histogram.counts[used] += counts[used]
+            histogram.sums[used] += sums[used]
+            self.tiles[(tile_row, tile_column)] = (used, counts[used], sums[used])
+
+        self.checksums = checksums
+        self.fingerprint = HistogramCache.image_fingerprint(image)
+        return len(changed)
+
+    def result(self, max_colors_to_return=5):
+        """
+        Return the palette of the counted pixels and the coverage of every color
+        """
+        colors, counts = self.histogram.result()
+        colors, selected_counts = select_colors(colors, counts, max_colors_to_return, return_counts=True)
+
+        return colors, get_coverage(selected_counts, counts.sum())
@@ -0,0 +1,153 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+
+class PaletteCache:
+    """
+    Content addressed on-disk cache of extracted palettes.
+
+    Entries are keyed on the file path, size, mtime, the extraction parameters and optionally a hash
+    of the file contents. They are kept in least recently used order and the oldest ones are evicted
+    once their estimated size (see entry_bytes) exceeds max_bytes. Changes are only written to disk by save().
+    Cache hits only reorder the entries in memory, the order is written with the next change of the entries
+    or at exit.
+    """
+    VERSION = 1
+
+    def __init__(self, filepath, max_bytes=8 << 20):
+        self.filepath = filepath
+        self.max_bytes = max_bytes
+        self.entries = None
+        self.nbytes = 0
+        self.dirty = False
+        self.order_changed = False
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def file_hash(filepath, chunk_size=1 << 20):
+        digest = hashlib.blake2b(digest_size=16)
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    def key(self, filepath, params, content_hash=False):
+        """
+        filepath: source image file
+        params: json serializable extraction parameters
+        content_hash: also hash the file contents, catches edits that keep size and mtime
+        """
+        filepath = os.path.abspath(filepath)
+        stat = os.stat(filepath)
+        source = [filepath, stat.st_size, stat.st_mtime_ns, params]
+        if content_hash:
+            source.append(self.file_hash(filepath))
+
+        return hashlib.sha1(json.dumps(source, sort_keys=True).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def entry_bytes(key, colors):
+        """Size of an entry in the cache file, palettes of many colors take more"""
+        return len(json.dumps([key, colors], separators=(',', ':'))) + 1
+
+    def load(self):
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        if not os.path.isfile(self.filepath):
+            return
+
+        try:
+            with open(self.filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return  # unreadable cache, start over
+
+        if data.get('version') == self.VERSION:
+            self.entries.update(data.get('entries', []))
+            self.nbytes = sum(self.entry_bytes(key, colors) for key, colors in self.entries.items())
+
+    def get(self, key):
+        if self.entries is None:
+            self.load()
+
+        colors = self.entries.get(key)
+        if colors is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        self.order_changed = True
+        return colors
+
+    def put(self, key, colors):
+        if self.entries is None:
+            self.load()
+
+        old = self.entries.get(key)
+        if old is not None:
+            self.nbytes -= self.entry_bytes(key, old)
+
+        colors = self.entries[key] = [[round(c, 6) for c in color] for color in colors]
+        self.entries.move_to_end(key)
+        self.nbytes += self.entry_bytes(key, colors)
+        while self.nbytes > self.max_bytes and len(self.entries) > 1:
+            self.nbytes -= self.entry_bytes(*self.entries.popitem(last=False))
+
+        self.dirty = True
+
+    def save(self, include_order=False):
+        """
+        Write the entries to disk when they changed.
+        include_order: also write when only the least recently used order changed
+        """
+        if self.entries is None or not (self.dirty or include_order and self.order_changed):
+            return
+
+        os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+        tmp_path = self.filepath + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'entries': list(self.entries.items())}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.filepath)
+
+        self.dirty = self.order_changed = False
+
+    def clear(self):
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = self.misses = 0
+        if os.path.isfile(self.filepath):
+            os.remove(self.filepath)
+
+        self.dirty = self.order_changed = False
+
+    def __len__(self):
+        if self.entries is None:
+            self.load()
+
+        return len(self.entries)
+
+
+_cache = None
+
+
+def get_palette_cache():
+    """Cache shared by the whole add-on, stored in the Blender user config directory"""
+    global _cache
+
+    if _cache is None:
+        import atexit
+        import bpy
+
+        directory = bpy.utils.user_resource('CONFIG', path='color_helper', create=True)
+        _cache = PaletteCache(os.path.join(directory, 'palette_cache.json'))
+        atexit.register(_cache.save, include_order=True)
+
+    return _cache
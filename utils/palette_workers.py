@@ -0,0 +1,507 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Code that runs in worker processes.
+# Workers import this file as the top-level module 'palette_workers', without bpy and without the add-on package,
+# so it may only depend on numpy and the standard library (no relative imports).
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def srgb_curve(values, gamma=2.4):
+    """
+    sRGB to linear of every value of an array, negative values become 0.
+    The only implementation of the curve: color_kernels.srgb_2_linear applies it to the RGB channels,
+    it lives here so the worker processes only import this module
+    """
+    curve = ((np.maximum(values, 0.04045) + 0.055) / 1.055) ** gamma
+    linear = np.where(values < 0.04045, values / 12.92, curve)
+    return np.where(values < 0, 0, linear).astype(values.dtype, copy=False)
+
+
+def histogram_codes(pixels, bins=32, ignore_alpha_below=1, linear=False):
+    """
+    Bin code of every pixel in a bins x bins x bins grid of linear RGB, times 2 plus whether the pixel reaches
+    ignore_alpha_below. Return the codes and the linear RGB and alpha of the pixels, see histogram_counts
+    """
+    linear = np.clip(pixels[:, :3], 0, 1) if linear else srgb_curve(pixels[:, :3])
+    alpha = pixels[:, 3] if pixels.shape[1] == 4 else np.ones(len(pixels), dtype=pixels.dtype)
+
+    index = np.minimum((linear * bins).astype(np.int64), bins - 1)
+    codes = (index[:, 0] * bins + index[:, 1]) * bins + index[:, 2]
+    codes = codes * 2 + (alpha >= ignore_alpha_below)
+
+    return codes, linear, alpha
+
+
+def bin_sums(codes, size, linear, alpha, weights=None):
+    """Pixel count (weight sum) and the sum of the linear RGBA colors of every bin"""
+    counts = np.bincount(codes, weights=weights, minlength=size)
+    if weights is None:
+        weights = 1
+    sums = np.empty((size, 4), dtype=np.float64)
+    for i in range(3):
+        sums[:, i] = np.bincount(codes, weights=linear[:, i] * weights, minlength=size)
+    sums[:, 3] = np.bincount(codes, weights=alpha * weights, minlength=size)
+
+    return counts, sums
+
+
+def histogram_counts(pixels, bins=32, ignore_alpha_below=1, weights=None, linear=False):
+    """
+    Count sRGB(A) float pixels in a bins x bins x bins grid of linear RGB.
+    The lowest bit of a bin code tells whether the pixels in it reach ignore_alpha_below.
+    weights: optional per pixel weights, counts are then weight sums and the color sums are weighted
+    linear: the pixels are already linear in [0, 1] (e.g. tone mapped HDR values), skip the sRGB conversion
+    Return the pixel count and the sum of the linear RGBA colors of every bin.
+    """
+    codes, linear, alpha = histogram_codes(pixels, bins, ignore_alpha_below, linear)
+
+    return bin_sums(codes, bins ** 3 * 2, linear, alpha, weights)
+
+
+def sparse_histogram_counts(pixels, bins=32, ignore_alpha_below=1):
+    """
+    histogram_counts of the used bins only, the memory follows the pixel count instead of the grid size.
+    Return the sorted codes of the used bins, their pixel counts and color sums
+    """
+    codes, linear, alpha = histogram_codes(pixels, bins, ignore_alpha_below)
+    used, inverse = np.unique(codes, return_inverse=True)
+
+    return (used, *bin_sums(inverse.ravel(), len(used), linear, alpha))
+
+
+def merge_sparse_counts(codes, counts, sums):
+    """Sum the counts and color sums of equal codes of concatenated sparse histograms"""
+    used, inverse = np.unique(codes, return_inverse=True)
+    inverse = inverse.ravel()
+    merged_sums = np.stack([np.bincount(inverse, weights=sums[:, i], minlength=len(used)) for i in range(4)], axis=1)
+
+    return used, np.bincount(inverse, weights=counts, minlength=len(used)).astype(counts.dtype), merged_sums
+
+
+def histogram_tile(shm_name, shape, start, stop, bins=32, ignore_alpha_below=1, chunk_size=1 << 20):
+    """
+    Worker task: histogram_counts of the pixels start:stop of a float32 (N, channels) array in shared memory.
+    The pixels are read in place, chunk by chunk. Grids with more bins than a chunk has pixels are counted
+    sparse, so a worker never holds more than a few chunks worth of bins.
+    Return the codes of the used bins, their pixel counts and color sums, only the used bins are sent back.
+    """
+    size = bins ** 3 * 2
+    dense = size <= chunk_size
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        pixels = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+        if dense:
+            counts = np.zeros(size, dtype=np.int64)
+            sums = np.zeros((size, 4), dtype=np.float64)
+        else:
+            codes = np.empty(0, dtype=np.int64)
+            counts = np.empty(0, dtype=np.int64)
+            sums = np.empty((0, 4), dtype=np.float64)
+
+        for chunk_start in range(start, stop, chunk_size):
+            chunk = pixels[chunk_start:min(chunk_start + chunk_size, stop)]
+            if dense:
+                chunk_counts, chunk_sums = histogram_counts(chunk, bins, ignore_alpha_below)
+                counts += chunk_counts
+                sums += chunk_sums
+            else:
+                chunk_codes, chunk_counts, chunk_sums = sparse_histogram_counts(chunk, bins, ignore_alpha_below)
+                codes, counts, sums = merge_sparse_counts(np.concatenate((codes, chunk_codes)),
+                                                          np.concatenate((counts, chunk_counts)),
+                                                          np.concatenate((sums, chunk_sums)))
+
+        chunk = None
+        del pixels
+    finally:
+        shm.close()
+
+    if dense:
+        codes = np.flatnonzero(counts)
+        counts, sums = counts[codes], sums[codes]
+
+    return codes, counts, sums
+
+
+class PNGError(ValueError):
+    """PNG file this reader can not decode, load it with Blender instead"""
+
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}  # color type: samples per pixel
+
+
+def read_png_chunks(f):
+    """Yield the type and data of every chunk of an opened PNG file, after the signature"""
+    import struct
+
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            raise PNGError('truncated PNG file')
+        length, chunk_type = struct.unpack('>I4s', header)
+        data = f.read(length)
+        f.read(4)  # crc
+        yield chunk_type, data
+        if chunk_type == b'IEND':
+            return
+
+
+def paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def unfilter_row(filter_type, row, prior, bpp):
+    """
+    Undo the PNG filter of one scanline.
+    row: filtered bytes without the filter type byte, prior: the unfiltered previous scanline (zeros for the first)
+    """
+    row = np.frombuffer(row, dtype=np.uint8)
+    if filter_type == 0:
+        return row
+    if filter_type == 1:  # sub, a running sum of every bpp-th byte
+        return np.cumsum(row.reshape(-1, bpp), axis=0, dtype=np.uint8).reshape(-1)
+    if filter_type == 2:  # up
+        return row + prior
+    if filter_type not in (3, 4):
+        raise PNGError(f'unknown PNG filter type {filter_type}')
+    if filter_type == 4 and not prior.any():  # paeth of the first scanline is sub
+        return unfilter_row(1, row, prior, bpp)
+
+    # average and paeth depend on the byte decoded just before, loop in Python
+    out = bytearray(row.tobytes())
+    up = prior.tolist()
+    for i in range(len(out)):
+        left = out[i - bpp] if i >= bpp else 0
+        if filter_type == 3:
+            out[i] = (out[i] + ((left + up[i]) >> 1)) & 0xFF
+        else:
+            out[i] = (out[i] + paeth(left, up[i], up[i - bpp] if i >= bpp else 0)) & 0xFF
+
+    return np.frombuffer(bytes(out), dtype=np.uint8)
+
+
+def unfilter_wavefront(filter_types, rows, prior, bpp):
+    """
+    Undo the PNG filters of a block of scanlines together.
+    Every pixel only depends on its left, upper and upper left neighbours, so all pixels on one anti-diagonal
+    can be decoded at once. The block is sheared so that every anti-diagonal is one column,
+    then decoded column by column: rows + pixels NumPy steps instead of a Python step per byte.
+
+    filter_types: filter type of every scanline, rows: (N, row_bytes) filtered bytes
+    prior: the unfiltered scanline above the block
+    """
+    count = len(rows)
+    pixels = rows.shape[1] // bpp
+
+    # pixel x of scanline y sits in column x + y + 1 of row y + 1, row 0 holds the prior scanline
+    y = np.arange(count + 1)[:, None]
+    columns = np.arange(pixels)[None, :] + y + 1
+    sheared = np.zeros((count + 1, pixels + count + 1, bpp), dtype=np.int16)
+    sheared[0, columns[0]] = prior.reshape(pixels, bpp)
+    raw = np.zeros_like(sheared)
+    raw[y[1:], columns[1:]] = rows.reshape(count, pixels, bpp)
+
+    filter_types = np.asarray(filter_types)[:, None]
+    sub, up, average, paeth_ = (filter_types == t for t in (1, 2, 3, 4))
+    for column in range(2, pixels + count + 1):
+        first, last = max(1, column - pixels), min(count, column - 1)
+        a = sheared[first:last + 1, column - 1]  # left
+        b = sheared[first - 1:last, column - 1]  # up
+        c = sheared[first - 1:last, column - 2]  # upper left
+        rows_of = slice(first - 1, last)
+
+        pa, pb, pc = np.abs(b - c), np.abs(a - c), np.abs(a + b - 2 * c)
+        predicted = np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c)) * paeth_[rows_of]
+        predicted += ((a + b) >> 1) * average[rows_of] + a * sub[rows_of] + b * up[rows_of]
+        sheared[first:last + 1, column] = (raw[first:last + 1, column] + predicted) & 0xFF
+
+    return sheared[y[1:], columns[1:]].astype(np.uint8).reshape(count, -1)
+
+
+WAVEFRONT_MIN_BYTES = 64  # average and paeth scanlines x bytes per pixel worth a wavefront
+WAVEFRONT_MAX_ROWS = 1024  # scanlines per wavefront block, bounds the sheared copies
+
+
+def unfilter_rows(lines, bpp):
+    """
+    Undo the PNG filters of (N, 1 + row_bytes) scanlines, filter type byte first.
+    The scanlines from the first to the last average or paeth filtered one are decoded with unfilter_wavefront
+    when there are enough of them, every other scanline on its own.
+    Return a (N, row_bytes) uint8 array
+    """
+    filter_types = lines[:, 0]
+    rows = lines[:, 1:]
+    if (filter_types > 4).any():
+        raise PNGError(f'unknown PNG filter type {filter_types.max()}')
+
+    heavy = np.flatnonzero(filter_types >= 3)
+    if len(heavy) * bpp >= WAVEFRONT_MIN_BYTES:
+        wavefront = range(heavy[0], heavy[-1] + 1, WAVEFRONT_MAX_ROWS)
+        stop = heavy[-1] + 1
+    else:
+        wavefront = range(0)
+        stop = 0
+
+    out = np.empty(rows.shape, dtype=np.uint8)
+    prior = np.zeros(rows.shape[1], dtype=np.uint8)
+    y = 0
+    while y < len(rows):
+        if y in wavefront:
+            end = min(y + WAVEFRONT_MAX_ROWS, stop)
+            out[y:end] = unfilter_wavefront(filter_types[y:end], rows[y:end], prior, bpp)
+        else:
+            end = y + 1
+            out[y] = unfilter_row(int(filter_types[y]), rows[y].tobytes(), prior, bpp)
+        prior = out[end - 1]
+        y = end
+
+    return out
+
+
+def png_samples_to_rgba(rows, width, bit_depth, color_type, palette=None, transparency=None):
+    """
+    Convert unfiltered scanlines, a (height, row_bytes) uint8 array, to a float32 (height, width, 4) RGBA array.
+    """
+    height = len(rows)
+    channels = PNG_CHANNELS[color_type]
+
+    if bit_depth == 16:
+        raw = rows.view('>u2').reshape(height, -1)[:, :width * channels]
+        samples = raw.astype(np.float32) / 65535
+    elif bit_depth == 8:
+        raw = rows[:, :width * channels]
+        samples = raw.astype(np.float32) / 255
+    else:  # 1, 2 and 4 bit gray or palette indices, packed from the high bits
+        shifts = np.arange(8 - bit_depth, -1, -bit_depth, dtype=np.uint8)
+        raw = ((rows[:, :, None] >> shifts) & (2 ** bit_depth - 1)).reshape(height, -1)[:, :width]
+        samples = raw.astype(np.float32) / (2 ** bit_depth - 1)
+    samples = samples.reshape(height, width, channels)
+    raw = raw.reshape(height, width, channels)
+
+    rgba = np.ones((height, width, 4), dtype=np.float32)
+    if color_type == 3:
+        if palette is None:
+            raise PNGError('indexed PNG without palette')
+        lookup = np.ones((256, 4), dtype=np.float32)
+        lookup[:len(palette), :3] = palette
+        if transparency is not None:
+            lookup[:len(transparency), 3] = transparency
+        rgba[:] = lookup[raw[:, :, 0]]
+    elif color_type in (0, 4):
+        rgba[:, :, :3] = samples[:, :, :1]
+        if color_type == 4:
+            rgba[:, :, 3] = samples[:, :, 1]
+    else:
+        rgba[:, :, :channels] = samples
+
+    if transparency is not None and color_type in (0, 2):
+        rgba[np.all(raw == transparency, axis=2), 3] = 0
+
+    return rgba
+
+
+def read_png(filepath, max_rows=None):
+    """
+    Decode a non interlaced PNG file without Blender.
+    max_rows: only decode the first rows from the top, the file is read and inflated no further than needed
+    Return a float32 (rows, width, 4) RGBA array of the stored (sRGB) values, top row first.
+    """
+    import struct
+    import zlib
+
+    with open(filepath, 'rb') as f:
+        if f.read(8) != PNG_SIGNATURE:
+            raise PNGError(f'not a PNG file: {filepath}')
+
+        # header, palette and transparency all come before the image data
+        chunks = read_png_chunks(f)
+        header = palette = transparency = None
+        for chunk_type, chunk in chunks:
+            if chunk_type == b'IHDR':
+                if len(chunk) != 13:
+                    raise PNGError('invalid PNG header')
+                header = struct.unpack('>IIBBBBB', chunk)
+            elif chunk_type == b'PLTE':
+                palette = np.frombuffer(chunk, dtype=np.uint8).reshape(-1, 3) / 255
+            elif chunk_type == b'tRNS':
+                transparency = chunk
+            elif chunk_type == b'IDAT':
+                break
+        else:
+            raise PNGError('PNG file without image data')
+
+        if header is None:
+            raise PNGError('PNG file without header')
+        width, height, bit_depth, color_type, _compression, _filter, interlace = header
+        if interlace or color_type not in PNG_CHANNELS:
+            raise PNGError('interlaced or unknown PNG color type')
+        if not width or not height:
+            raise PNGError('empty PNG image')
+
+        if transparency is not None:
+            if color_type == 3:
+                transparency = np.frombuffer(transparency, dtype=np.uint8) / 255
+            elif color_type in (0, 2):
+                transparency = np.frombuffer(transparency, dtype='>u2').astype(np.int64)
+            else:
+                transparency = None
+
+        bits_per_pixel = PNG_CHANNELS[color_type] * bit_depth
+        row_bytes = (width * bits_per_pixel + 7) // 8
+        bpp = max(1, bits_per_pixel // 8)
+        if max_rows is not None:
+            height = min(height, max_rows)
+
+        def image_data():
+            yield chunk
+            for next_type, next_chunk in chunks:
+                if next_type == b'IDAT':
+                    yield next_chunk
+
+        # inflate no further than the scanlines needed
+        needed = height * (row_bytes + 1)
+        decompressor = zlib.decompressobj()
+        data = []
+        size = 0
+        for compressed in image_data():
+            try:
+                data.append(decompressor.decompress(compressed, needed - size))
+            except zlib.error as e:
+                raise PNGError(f'corrupt PNG data: {e}')
+            size += len(data[-1])
+            if size == needed:
+                break
+
+    if size < needed:
+        raise PNGError('truncated PNG data')
+
+    lines = np.frombuffer(b''.join(data), dtype=np.uint8).reshape(height, row_bytes + 1)
+    rows = unfilter_rows(lines, bpp)
+
+    return png_samples_to_rgba(rows, width, bit_depth, color_type, palette, transparency)
+
+
+def find_runs(lines, min_run=3, tolerance=0.04):
+    """
+    Swatch boundaries along parallel scan lines.
+    lines: (K, N, C) pixels of K scan lines
+    A boundary is where any channel changes by more than tolerance on any of the lines.
+    Runs shorter than min_run are soft edges (anti-aliasing, resampling) and dropped.
+    Return the start and stop of every run.
+    """
+    n = lines.shape[1]
+    edges = (np.abs(np.diff(lines, axis=1)).max(axis=2) > tolerance).any(axis=0)
+    bounds = np.concatenate(([0], np.flatnonzero(edges) + 1, [n]))
+    starts, stops = bounds[:-1], bounds[1:]
+
+    keep = stops - starts >= min(min_run, n)
+    if not keep.any():
+        return np.array([0]), np.array([n])
+
+    return starts[keep], stops[keep]
+
+
+def fit_pitch(starts, stops, pitch=None):
+    """
+    Split runs that hold several neighbouring swatches of one repeated color.
+    pitch: swatch size known from the layout, every run is cut into runs of that size.
+    Without one, the runs are only cut when every run is (about) a whole multiple of the shortest run,
+    into runs of that length.
+    """
+    lengths = stops - starts
+    if pitch is None:
+        pitch = lengths.min()
+    if pitch <= 0:
+        return starts, stops
+
+    parts = lengths / pitch
+    counts = np.maximum(np.rint(parts), 1).astype(np.int64)
+    if (np.abs(parts - counts) > 0.1).any():
+        return starts, stops
+
+    bounds = [np.rint(np.linspace(start, stop, count + 1)).astype(np.int64)
+              for start, stop, count in zip(starts.tolist(), stops.tolist(), counts.tolist())]
+    return np.concatenate([b[:-1] for b in bounds]), np.concatenate([b[1:] for b in bounds])
+
+
+def is_export_layout(width, height, color_width=None, color_height=None):
+    """Whether an image has the layout of make_png_from_palette: one row of color_width x color_height swatches"""
+    return bool(color_width and color_height) and height == color_height and width % color_width == 0
+
+
+def palette_colors(pixels, color_width=None, color_height=None, scan_lines=3, tolerance=0.04, image_height=None):
+    """
+    Colors of a palette image with swatches of any size, in a single row or a grid.
+    Only scan_lines rows and columns are compared, then one pixel is read in the centre of every swatch,
+    so the detection reads O(width + height) pixels.
+
+    pixels: (height, width, C) sRGB(A) floats, top row first
+    color_width, color_height: swatch size of make_png_from_palette, the swatches of images with its layout
+                               (a single row color_height high) are cut on that grid
+    image_height: height of the whole image when pixels only holds its first rows, see read_png_palette
+    Return the linear colors of the swatches in reading order, fully transparent swatches are skipped
+    """
+    height, width = pixels.shape[:2]
+    rows = ((np.arange(scan_lines) + 0.5) * height / scan_lines).astype(np.int64)
+    columns = ((np.arange(scan_lines) + 0.5) * width / scan_lines).astype(np.int64)
+    min_run = max(3, min(width, height) // 100)
+
+    exported = is_export_layout(width, image_height or height, color_width, color_height)
+    x_starts, x_stops = fit_pitch(*find_runs(pixels[rows], min_run, tolerance), color_width if exported else None)
+    if exported:
+        y_starts, y_stops = np.array([0]), np.array([height])
+    else:
+        y_starts, y_stops = fit_pitch(*find_runs(pixels[:, columns].swapaxes(0, 1), min_run, tolerance))
+
+    xs = (x_starts + x_stops) // 2
+    ys = (y_starts + y_stops) // 2
+    colors = pixels[ys[:, None], xs[None, :]].reshape(-1, pixels.shape[2])
+    if colors.shape[1] == 4:
+        colors = colors[colors[:, 3] > 0]
+
+    colors = np.round(colors, 4)
+    colors[:, :3] = srgb_curve(colors[:, :3])  # alpha is linear, as make_png_from_palette writes it
+    return colors.tolist()
+
+
+def read_png_size(filepath):
+    """Width and height of a PNG file, from its header"""
+    import struct
+
+    with open(filepath, 'rb') as f:
+        header = f.read(24)
+    if len(header) < 24 or header[:8] != PNG_SIGNATURE or header[12:16] != b'IHDR':
+        raise PNGError(f'not a PNG file: {filepath}')
+
+    return struct.unpack('>II', header[16:24])
+
+
+def read_png_palette(filepath, color_width=None, color_height=None):
+    """
+    Palette colors of a palette PNG file, see palette_colors.
+    The swatches of an export fill whole columns, so only its first scanline is decoded.
+    """
+    width, height = read_png_size(filepath)
+    max_rows = 1 if is_export_layout(width, height, color_width, color_height) else None
+
+    return palette_colors(read_png(filepath, max_rows), color_width, color_height, image_height=height)
+
+
+def palette_file_task(filepath, color_width=None, color_height=None):
+    """
+    Worker task: palette colors of a palette PNG file and the seconds it took
+    """
+    import time
+
+    start = time.perf_counter()
+    colors = read_png_palette(filepath, color_width, color_height)
+
+    return colors, time.perf_counter() - start
@@ -0,0 +1,236 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import importlib.util
+import multiprocessing
+import os
+import site
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+
+WORKERS_MODULE = 'palette_workers'
+
+_executor = None
+_executor_workers = 0
+
+
+def get_workers_module():
+    """
+    palette_workers loaded as a top-level module, so the tasks pickle under the name the workers import
+    """
+    module = sys.modules.get(WORKERS_MODULE)
+    if module is None:
+        path = os.path.join(os.path.dirname(__file__), WORKERS_MODULE + '.py')
+        spec = importlib.util.spec_from_file_location(WORKERS_MODULE, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[WORKERS_MODULE] = module
+        spec.loader.exec_module(module)
+
+    return module
+
+
+def get_worker_count(workers=0):
+    """0 means one worker per cpu core"""
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def is_executor_running(workers):
+    return _executor is not None and _executor_workers == workers
+
+
+def get_executor(workers):
+    """
+    Process pool kept alive between extractions.
+    Workers are spawned (never forked from Blender) and find palette_workers through their sys.path.
+    """
+    global _executor, _executor_workers
+
+    if not is_executor_running(workers):
+        shutdown_executor()
+        _executor = ProcessPoolExecutor(max_workers=workers,
+                                        mp_context=multiprocessing.get_context('spawn'),
+                                        initializer=site.addsitedir,
+                                        initargs=(os.path.dirname(__file__),))
+        _executor_workers = workers
+
+    return _executor
+
+
+def shutdown_executor():
+    global _executor, _executor_workers
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+
+    _executor = None
+    _executor_workers = 0
+
+
+class SharedPixels:
+    """
+    Pixels of an Image read straight into a shared memory block, as a float32 (width * height, channels) array.
+    Worker processes attach to the block by name instead of receiving a copy.
+    Drop every view of array before close().
+    """
+
+    def __init__(self, image):
+        width, height = image.size
+        self.shape = (width * height, image.channels)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, width * height * image.channels * 4))
+        self.array = np.ndarray(self.shape, dtype=np.float32, buffer=self.shm.buf)
+        image.pixels.foreach_get(self.array.reshape(-1))
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        self.array = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+def parallel_histogram(shared, bins=32, ignore_alpha_below=1, workers=0, stats=None,
+                       probe_size=1 << 20, startup_seconds=0.5):
+    """
+    Count the histogram of SharedPixels with a process pool, one tile per task, and merge the partial histograms.
+    Workers only send back the used bins of their tile (see palette_workers.histogram_tile).
+
+    The first probe_size pixels are counted in this process to time the serial path.
+    When the rest would be counted serially before the workers are up (startup_seconds for a new pool),
+    or the pool fails, everything is counted serially.
+    Return the per-bin counts and sums, see palette_workers.histogram_counts.
+    """
+    kernels = get_workers_module()
+    workers = get_worker_count(workers)
+    total = shared.shape[0]
+
+    start_time = time.perf_counter()
+    counts, sums = kernels.histogram_counts(shared.array[:probe_size], bins, ignore_alpha_below)
+    probe_seconds = time.perf_counter() - start_time
+
+    start = min(probe_size, total)
+    serial_seconds = probe_seconds * (total - start) / max(start, 1)
+    overhead = 0.0 if is_executor_running(workers) else startup_seconds
+    use_pool = workers > 1 and serial_seconds > overhead + serial_seconds / workers
+
+    if use_pool:
+        tile_size = -(-(total - start) // (workers * 4))  # ceil division, a few tiles per worker
+        try:
+            executor = get_executor(workers)
+            futures = [
+                executor.submit(kernels.histogram_tile, shared.name, shared.shape, tile_start,
+                                min(tile_start + tile_size, total), bins, ignore_alpha_below)
+                for tile_start in range(start, total, tile_size)
+            ]
+            for future in futures:
+                codes, tile_counts, tile_sums = future.result()
+                counts[codes] += tile_counts
+                sums[codes] += tile_sums
+        except (BrokenProcessPool, OSError) as e:
+            print(f'Color Helper: parallel extraction failed, counting serially:\n{e}')
+            shutdown_executor()
+            counts, sums = kernels.histogram_counts(shared.array[:start], bins, ignore_alpha_below)
+            use_pool = False
+
+    if not use_pool:
+        for chunk_start in range(start, total, probe_size):
+            chunk_counts, chunk_sums = kernels.histogram_counts(shared.array[chunk_start:chunk_start + probe_size],
+                                                                bins, ignore_alpha_below)
+            counts += chunk_counts
+            sums += chunk_sums
+
+    if stats is not None:
+        stats['workers'] = workers if use_pool else 1
+
+    return counts, sums
+
+
+def batch_extract_palette_files(filepaths, workers=0, cache=None, content_hash=False, stats=None,
+                                startup_seconds=0.5):
+    """
+    extract_from_palette_file for many files at once.
+    PNG files are decoded and extracted without Blender, in worker processes when the first file shows
+    that the pool pays off (see parallel_histogram). Other files, and PNG files that can not be decoded,
+    are loaded with Blender in this process afterwards.
+
+    cache: optional PaletteCache, checked before anything is decoded
+    Return (filepath, colors, seconds, source) for every file in order,
+    source is 'CACHE', 'PNG' (read without Blender) or 'BLENDER'.
+    """
+    from ..ops.op_palette_export_ import COLOR_WIDTH, COLOR_HEIGHT
+    from .process_image import extract_from_palette_file, PALETTE_PARAMS
+
+    kernels = get_workers_module()
+    workers = get_worker_count(workers)
+    results = [None] * len(filepaths)
+    keys = [None] * len(filepaths)
+    pending = []
+
+    for i, filepath in enumerate(filepaths):
+        start = time.perf_counter()
+        if cache is not None:
+            keys[i] = cache.key(filepath, PALETTE_PARAMS, content_hash)
+            colors = cache.get(keys[i])
+            if colors is not None:
+                results[i] = (filepath, colors, time.perf_counter() - start, 'CACHE')
+                continue
+
+        if filepath.lower().endswith('.png'):
+            pending.append(i)
+
+    def extract(i, task):
+        try:
+            colors, seconds = task()
+        except (ValueError, OSError):
+            return  # not decodable without Blender
+
+        results[i] = (filepaths[i], colors, seconds, 'PNG')
+        if cache is not None:
+            cache.put(keys[i], colors)
+
+    # time the first file in this process, palette files are small
+    # and a new pool often takes longer to start than extracting all of them here
+    use_pool = False
+    if pending:
+        start = time.perf_counter()
+        extract(pending[0], lambda: kernels.palette_file_task(filepaths[pending[0]], COLOR_WIDTH, COLOR_HEIGHT))
+        serial_seconds = (time.perf_counter() - start) * (len(pending) - 1)
+        overhead = 0.0 if is_executor_running(workers) else startup_seconds
+        use_pool = workers > 1 and serial_seconds > overhead + serial_seconds / workers
+        pending = pending[1:]
+
+    if use_pool:
+        try:
+            executor = get_executor(workers)
+            futures = {i: executor.submit(kernels.palette_file_task, filepaths[i], COLOR_WIDTH,
+                                              COLOR_HEIGHT) for i in pending}
+            for i in pending:
+                extract(i, futures[i].result)
+        except (BrokenProcessPool, OSError) as e:
+            print(f'Color Helper: parallel extraction failed, extracting serially:\n{e}')
+            shutdown_executor()
+            use_pool = False
+
+    for i in pending:
+        if results[i] is None:
+            extract(i, lambda: kernels.palette_file_task(filepaths[i], COLOR_WIDTH, COLOR_HEIGHT))
+
+    for i, filepath in enumerate(filepaths):
+        if results[i] is not None: continue
+
+        start = time.perf_counter()
+        colors = extract_from_palette_file(filepath)
+        results[i] = (filepath, colors, time.perf_counter() - start, 'BLENDER')
+        if cache is not None:
+            cache.put(keys[i], colors)
+
+    if stats is not None:
+        stats['workers'] = workers if use_pool else 1
+
+    return results
@@ -1,65 +1,487 @@
 # SPDX-FileCopyrightText: 2026 Atticus
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
 from ..ops.op_palette_export_ import COLOR_WIDTH, COLOR_HEIGHT
-from .color_correct import srgb_2_linear, linear_2_srgb
+from .color_correct import srgb_2_linear, linear_2_srgb, srgb_2_linear_array, linear_2_oklab_array
+from .palette_workers import histogram_counts, palette_colors, read_png_palette
 
 
 def round_color_tuple(color_tuple, precision=4):
     return tuple((round(cv, precision) for cv in color_tuple))
 
 
-def is_color_similar(color1, color2, max_diff=0.05):
+def distinct_color_indices(colors, maximum_colors, max_color_diff=0.05, chunk_size=4096):
     """
-    Return as early as possible, False whenever rgb values (color[0], color[1] or color[2])
-    of the two colors differ more then the max.
+    Greedily pick the first colors that are more than max_color_diff apart in OKLab, at most maximum_colors.
+
+    colors: (N, 3+) linear colors, most frequent first
+    Every chunk of candidates is tested against the accepted colors with one distance matrix,
+    the survivors are then accepted in order while their close neighbours in the chunk are dropped.
+    Return the indices of the accepted colors, in frequency order.
     """
-    for i in range(3):
-        if abs(color1[i] - color2[i]) > max_diff:
-            return False
+    indices = []
+    accepted = np.empty((0, 3))
 
-    return True
+    for start in range(0, len(colors), chunk_size):
+        lab = linear_2_oklab_array(colors[start:start + chunk_size, :3])
+
+        distances = np.linalg.norm(lab[:, None, :] - accepted[None, :, :], axis=2)
+        remaining = np.flatnonzero((distances > max_color_diff).all(axis=1))
+
+        while len(remaining) and len(indices) < maximum_colors:
+            index = remaining[0]
+            indices.append(start + index)
+            accepted = np.vstack((accepted, lab[index]))
+
+            distances = np.linalg.norm(lab[remaining] - lab[index], axis=1)
+            remaining = remaining[distances > max_color_diff]
+
+        if len(indices) == maximum_colors:
+            break
+
+    return indices
 
 
 def get_distinct_colors(color_tuples, maximum_colors, max_color_diff=0.05):
-    distinct_colors = []
+    """
+    color_tuples: (count, color) tuples, most frequent first
+    Return the colors picked by distinct_color_indices.
+    """
+    colors = [color for _count, color in color_tuples]
+    if not colors:
+        return []
 
-    for _count, color in color_tuples:
-        new_color = True
-        for dist_color in distinct_colors:
-            if is_color_similar(dist_color, color, max_diff=max_color_diff):
-                new_color = False
-                break
+    indices = distinct_color_indices(np.array(colors, dtype=np.float64), maximum_colors, max_color_diff)
 
-        if new_color:
-            distinct_colors.append(color)
+    return [colors[index] for index in indices]
 
-        if len(distinct_colors) == maximum_colors:
-            break
 
-    return distinct_colors
+# cache parameters of extract_from_palette_file
+PALETTE_PARAMS = {'extract': 'palette', 'swatches': 'detect', 'color_width': COLOR_WIDTH, 'color_height': COLOR_HEIGHT}
 
 
 def extract_from_palette(image):
-    channel_count = image.channels
-    pixels = image.pixels[:]  # this takes 99% of the time
+    """
+    Swatch colors of a palette image, see palette_workers.palette_colors
+    """
+    width, height = image.size
+    pixels = read_pixels(image).reshape(height, width, -1)[::-1]  # top row first
+
+    return palette_colors(pixels, COLOR_WIDTH, COLOR_HEIGHT)
 
-    start_pixel = int(COLOR_WIDTH / 2)
-    len_colors = image.size[0] // COLOR_WIDTH
 
-    def get_color(x):
-        start_index = x * channel_count
-        return round_color_tuple(pixels[start_index:start_index + channel_count])
+def extract_from_palette_file(filepath, cache=None, content_hash=False):
+    """
+    extract_from_palette for a palette image file.
+    PNG files are read without Blender, other files are loaded with Blender.
+    cache: optional PaletteCache, on a hit the file is not read at all
+    content_hash: key the cache on the file contents as well
+    """
+    key = None
+    if cache is not None:
+        key = cache.key(filepath, PALETTE_PARAMS, content_hash)
+        colors = cache.get(key)
+        if colors is not None:
+            return colors
+
+    try:
+        colors = read_png_palette(filepath, COLOR_WIDTH, COLOR_HEIGHT)
+    except (ValueError, OSError):
+        import bpy
 
-    colors = [get_color(x=start_pixel + i * COLOR_WIDTH) for i in range(len_colors)]
-    colors[:] = [[srgb_2_linear(c) for c in color] for color in colors]
+        image = bpy.data.images.load(filepath, check_existing=False)
+        try:
+            colors = extract_from_palette(image)
+        finally:
+            bpy.data.images.remove(image)
+
+    if cache is not None:
+        cache.put(key, colors)
 
     return colors
 
 
-def extract_from_image(image,max_colors_to_return = 5):
+def read_pixels(image):
+    """
+    Read all pixels of a blender Image into a float32 array of shape (width * height, channels).
+    foreach_get copies straight into the numpy buffer, no Python float objects are created.
+    """
+    channel_count = image.channels
+    width, height = image.size
+    pixels = np.empty(width * height * channel_count, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+
+    return pixels.reshape(-1, channel_count)
+
+
+def stratified_sample_indices(width, height, sample_count=2025, rng=None):
+    """
+    Split the image into about sample_count equal cells, keeping the image aspect, and take one pixel per cell.
+    The pixel is the cell centre, or a random pixel inside the cell when a numpy Generator is given (jittered).
+    Images too flat for that aspect (like the single row of a masked ImageRegion) get the cells along their width.
+    Return flat pixel indices (y * width + x).
+    """
+    x_cells = min(width, max(1, round((sample_count * width / height) ** 0.5)))
+    y_cells = min(height, max(1, round(sample_count / x_cells)))
+    if y_cells == height:
+        x_cells = min(width, max(1, round(sample_count / y_cells)))
+
+    if rng is None:
+        x_offset = y_offset = 0.5
+    else:
+        x_offset = rng.random((y_cells, x_cells))
+        y_offset = rng.random((y_cells, x_cells))
+
+    x_co = ((np.arange(x_cells)[None, :] + x_offset) * (width / x_cells)).astype(np.int64)
+    y_co = ((np.arange(y_cells)[:, None] + y_offset) * (height / y_cells)).astype(np.int64)
+
+    x_co, y_co = np.broadcast_arrays(np.minimum(x_co, width - 1), np.minimum(y_co, height - 1))
+
+    return (y_co * width + x_co).ravel()
+
+
+def get_sample_indices(width, height, analyse_all_pixels=False, sample_count=2025, jitter=False, seed=0):
+    """
+    Pixel indices visited by PixelIterator, so every backend looks at the same pixels.
+    """
+    if analyse_all_pixels:
+        return np.arange(width * height)
+
+    rng = np.random.default_rng(seed) if jitter else None
+
+    return stratified_sample_indices(width, height, sample_count, rng=rng)
+
+
+def adaptive_sample_counts(pixels, width, height, select, batch_size=2025, ignore_alpha_below=1,
+                           max_batches=16, patience=2, seed=0):
+    """
+    Count jittered stratified batches of pixels until the selected palette stops changing.
+
+    select: callable (colors, counts) -> palette, run after every batch
+    The palette has to come out the same patience batches in a row, at most max_batches batches are drawn.
+    Return the accumulated colors and counts, most frequent first, and the number of pixels sampled.
+    """
+    rng = np.random.default_rng(seed)
+    counter = ColorCounter()
+    palette = None
+    stable = 0
+
+    for batch in range(1, max_batches + 1):
+        colors = linearize_pixels(pixels[stratified_sample_indices(width, height, batch_size, rng=rng)])
+        counter.add(colors[colors[:, 3] >= ignore_alpha_below])
+
+        colors, counts = counter.result()
+        new_palette = set(select(colors, counts))
+        stable = stable + 1 if new_palette == palette else 0
+        palette = new_palette
+
+        if stable >= patience:
+            break
+
+    return colors, counts, batch * batch_size
+
+
+def linearize_pixels(pixels, out=None):
+    """
+    Convert sRGB(A) float pixels to rounded linear RGBA, the vectorized form of PixelIterator.get_color.
+    out: optional float64 (N, 4) scratch array to write into instead of allocating a new one
+    """
+    colors = np.empty((len(pixels), 4), dtype=np.float64) if out is None else out[:len(pixels)]
+    colors[:, :3] = srgb_2_linear_array(pixels[:, :3].astype(np.float64))
+    colors[:, 3] = pixels[:, 3] if pixels.shape[1] == 4 else 1
+
+    return np.round(colors, 4, out=colors)
+
+
+def sort_counts(colors, counts):
+    """
+    Sort colors the same way as sorting (count, color) tuples in reverse.
+    """
+    keys = pack_colors(colors)
+    if keys is None:
+        order = np.lexsort((-colors[:, 3], -colors[:, 2], -colors[:, 1], -colors[:, 0], -counts))
+    else:
+        order = np.lexsort((keys, counts))[::-1]
+
+    return colors[order], counts[order]
+
+
+KEY_SHIFTS = tuple(np.uint64(shift) for shift in (48, 32, 16, 0))
+
+
+def pack_colors(colors):
+    """
+    Pack colors rounded to 4 decimals into one uint64 key per color, 16 bits per channel.
+    Sorting keys is much faster than sorting rows with np.unique(axis=0).
+    Return None when a channel is outside [0, 6.5535] and does not fit in 16 bits.
+    """
+    steps = np.rint(colors * 10000)
+    if len(steps) and (steps.min() < 0 or steps.max() >= 1 << 16):
+        return None
+
+    steps = steps.astype(np.uint64)
+    keys = np.zeros(len(steps), dtype=np.uint64)
+    for i, shift in enumerate(KEY_SHIFTS):
+        keys |= steps[:, i] << shift
+
+    return keys
+
+
+def unpack_colors(keys):
+    return np.stack([(keys >> shift) & np.uint64(0xFFFF) for shift in KEY_SHIFTS], axis=1) / 10000
+
+
+def merge_counts(colors, counts):
+    """
+    Sum the counts of equal colors.
+    """
+    keys = pack_colors(colors)
+    if keys is None:
+        colors, inverse = np.unique(colors, axis=0, return_inverse=True)
+    else:
+        keys, inverse = np.unique(keys, return_inverse=True)
+        colors = unpack_colors(keys)
+
+    counts = np.bincount(inverse.ravel(), weights=counts, minlength=len(colors)).astype(np.int64)
+
+    return colors, counts
+
+
+def count_colors(colors):
+    """
+    Count unique rows of a (N, 4) color array.
+    Return the unique colors and their counts, most frequent first.
+    """
+    if len(colors) == 0:
+        return np.empty((0, 4)), np.empty(0, dtype=np.int64)
+
+    unique, counts = merge_counts(colors, np.ones(len(colors), dtype=np.int64))
+
+    return sort_counts(unique, counts)
+
+
+class ColorCounter:
+    """
+    Accumulate unique color counts over several batches of colors, e.g. one batch per tile.
+    Batches are merged once they outgrow the colors counted so far, so merging stays amortized linear.
+    """
+
+    def __init__(self):
+        self.colors = np.empty((0, 4))
+        self.counts = np.empty(0, dtype=np.int64)
+        self.pending = []
+        self.pending_count = 0
+
+    def add(self, colors, counts=None):
+        if len(colors) == 0: return
+        if counts is None:
+            colors, counts = merge_counts(colors, np.ones(len(colors), dtype=np.int64))
+
+        self.pending.append((colors, counts))
+        self.pending_count += len(colors)
+        if self.pending_count >= max(len(self.colors), 1 << 16):
+            self.flush()
+
+    def flush(self):
+        if not self.pending: return
+
+        colors = np.concatenate([self.colors] + [colors for colors, _counts in self.pending])
+        counts = np.concatenate([self.counts] + [counts for _colors, counts in self.pending])
+        self.pending.clear()
+        self.pending_count = 0
+
+        self.colors, self.counts = merge_counts(colors, counts)
+
+    def result(self):
+        self.flush()
+        return sort_counts(self.colors, self.counts)
+
+
+class ColorHistogram:
+    """
+    Count linear RGB colors in a bins x bins x bins grid with one bincount pass per batch of pixels.
+    Every bin keeps the sum of its colors, so the bin is represented by its mean color rather than its centre.
+    The lowest bit of a bin code tells whether the pixels in it reach ignore_alpha_below.
+    """
+
+    def __init__(self, bins=32, ignore_alpha_below=1, weighted=False):
+        """
+        weighted: count pixel weights instead of pixels, see add()
+        """
+        self.bins = bins
+        self.ignore_alpha_below = ignore_alpha_below
+        self.counts = np.zeros(bins ** 3 * 2, dtype=np.float64 if weighted else np.int64)
+        self.sums = np.zeros((bins ** 3 * 2, 4), dtype=np.float64)
+
+    @property
+    def nbytes(self):
+        return self.counts.nbytes + self.sums.nbytes
+
+    def add(self, pixels, weights=None, linear=False):
+        """
+        pixels: (N, 3) or (N, 4) sRGB(A) float pixels, or linear ones in [0, 1] when linear is set
+        weights: per pixel weights of a weighted histogram
+        """
+        self.add_counts(*histogram_counts(pixels, self.bins, self.ignore_alpha_below, weights, linear))
+
+    def add_counts(self, counts, sums):
+        """
+        Merge a partial histogram with the same bins, e.g. counted by a worker process
+        """
+        self.counts += counts
+        self.sums += sums
+
+    def result(self):
+        """
+        Return the rounded mean color and pixel count (weight) of every used bin above the alpha limit,
+        most frequent first
+        """
+        used = self.counts > 0
+        used[0::2] = False  # bins of pixels below ignore_alpha_below
+
+        counts = self.counts[used]
+        colors = np.round(self.sums[used] / counts[:, None], 4)
+
+        return sort_counts(colors, counts)
+
+
+class TiledPixelReader:
+    """
+    Walk an Image as bands of tile_rows rows.
+
+    Blender has no partial pixel read, so the image is fetched once with foreach_get
+    (4 bytes per channel, no Python floats) and every band is a view into that single buffer,
+    nothing is copied. Later stages only allocate in proportion to one band,
+    but the whole image stays in memory: the peak is the image plus one band, not bounded by tile_rows.
+    """
+
+    def __init__(self, image, tile_rows=256, source=None):
+        self.width, self.height = image.size
+        self.tile_rows = max(1, min(tile_rows, self.height))
+        self.source = read_pixels(image) if source is None else source
+
+    @property
+    def image_bytes(self):
+        """Size of the full image read, held for as long as the reader"""
+        return self.source.nbytes
+
+    def __iter__(self):
+        band_size = self.tile_rows * self.width
+        for start in range(0, len(self.source), band_size):
+            yield self.source[start:start + band_size]
+
+
+def select_colors(colors, counts, max_colors_to_return, determine_distinct_colors=0.05, pixel_threshold=800,
+                  return_counts=False):
+    """
+    Apply the frequency threshold and the distinct color filter to sorted color counts.
+    return_counts: also return how many counted pixels every selected color stands for,
+                   including the near duplicates (within determine_distinct_colors) it replaced
+    """
+    if len(counts) == 0:
+        return ([], np.empty(0, dtype=np.int64)) if return_counts else []
+
+    if pixel_threshold > 0.0:
+        threshold = int(counts[0] / pixel_threshold)
+        mask = counts > threshold
+        colors, counts = colors[mask], counts[mask]
+
+    if determine_distinct_colors > 0:
+        indices = distinct_color_indices(colors, max_colors_to_return, determine_distinct_colors)
+        selected = colors[indices]
+        if return_counts:
+            selected_counts = assign_counts(colors, counts, selected, determine_distinct_colors)
+    else:
+        selected = colors[:max_colors_to_return]
+        selected_counts = counts[:max_colors_to_return]
+
+    selected = [tuple(color) for color in selected.tolist()]
+
+    return (selected, selected_counts) if return_counts else selected
+
+
+def assign_counts(colors, counts, selected, max_color_diff=0.05, chunk_size=4096):
+    """
+    Add the count of every color to the nearest selected color within max_color_diff in OKLab.
+    """
+    selected_lab = linear_2_oklab_array(selected[:, :3])
+    selected_counts = np.zeros(len(selected), dtype=np.int64)
+
+    for start in range(0, len(colors), chunk_size):
+        lab = linear_2_oklab_array(colors[start:start + chunk_size, :3])
+        distances = np.linalg.norm(lab[:, None, :] - selected_lab[None, :, :], axis=2)
+
+        nearest = np.argmin(distances, axis=1)
+        close = distances[np.arange(len(lab)), nearest] <= max_color_diff
+        selected_counts += np.bincount(nearest[close], weights=counts[start:start + chunk_size][close],
+                                       minlength=len(selected)).astype(np.int64)
+
+    return selected_counts
+
+
+def quantize_image(image, max_colors_to_return, quantizer, ignore_alpha_below=1, max_samples=100_000):
+    """
+    Cluster an evenly strided sample of the image pixels with one of the QUANTIZERS.
+    Return the cluster colors and the number of sampled pixels in each cluster.
+    """
+    from .quantize import QUANTIZERS, sample_rows
+
+    pixels = sample_rows(read_pixels(image), max_samples)
+    colors = linearize_pixels(pixels)
+    colors = colors[colors[:, 3] >= ignore_alpha_below]
+
+    centers, counts = QUANTIZERS[quantizer](colors, max_colors_to_return)
+
+    return [tuple(color) for color in np.round(centers, 4).tolist()], counts
+
+
+def iter_linear_bands(image, tile_rows=256, ignore_alpha_below=1, stats=None, source=None):
+    """
+    Read the image band by band with TiledPixelReader.
+    Yield the raw pixels and the rounded linear colors of every band, without the pixels below the alpha limit.
+    """
+    reader = TiledPixelReader(image, tile_rows=tile_rows, source=source)
+    scratch = np.empty((reader.tile_rows * reader.width, 4), dtype=np.float64)
+
+    if stats is not None:
+        stats['image_bytes'] = reader.image_bytes
+        stats['peak_buffer_bytes'] = reader.image_bytes + scratch.nbytes
+
+    for band in reader:
+        colors = linearize_pixels(band, out=scratch)
+        keep = colors[:, 3] >= ignore_alpha_below
+        yield (band, colors) if keep.all() else (band[keep], colors[keep])
+
+
+def extract_from_image(image, max_colors_to_return=5, backend='NUMPY', tile_rows=256, quantizer='NONE',
+                       octree_nodes=256, histogram_bins=32, sampling='GRID', sample_count=2025,
+                       workers=0, return_weights=False, histogram_cache=None, stats=None):
     """
     Use the user preferences to determine colors
+    backend: 'NUMPY' to count with array operations,
+             'TILED' to count every exact color, converting band by band after one full read of the image,
+             'OCTREE' to stream every pixel into an octree with a fixed node budget,
+             'HISTOGRAM' to count every pixel in a 3D grid of linear RGB bins,
+             'PARALLEL' to count the same histogram with a process pool over shared memory,
+             'PYTHON' to loop with PixelIterator
+    tile_rows: rows per band for the 'TILED', 'OCTREE' and 'HISTOGRAM' backends
+    octree_nodes: node budget of the 'OCTREE' backend
+    histogram_bins: bins per channel of the 'HISTOGRAM' and 'PARALLEL' backends
+    workers: worker processes of the 'PARALLEL' backend, 0 for one per cpu core
+    sampling: pixels looked at by the 'NUMPY' and 'PYTHON' backends, 'GRID' for the centre of every cell,
+              'JITTER' for a random pixel in every cell, 'ADAPTIVE' (NumPy only) to add jittered batches
+              until the palette stops changing
+    sample_count: number of cells, the sample budget of one batch
+    return_weights: also return the coverage of every color, the fraction of the counted pixels it stands for
+    histogram_cache: optional HistogramCache, reuses the counted colors when only the selection parameters changed
+    quantizer: 'NONE' to count exact colors, 'MEDIAN_CUT' or 'KMEANS' to cluster a sample of the image instead
+    stats: optional dict, filled with extraction statistics, e.g. 'peak_buffer_bytes', the pixel memory of the
+           banded backends including 'image_bytes' of the full image read (Blender has no partial pixel read)
     """
     determine_distinct_colors = 0.05
     pixel_threshold = 800
@@ -67,48 +489,381 @@ def extract_from_image(image,max_colors_to_return = 5):
     analyse_all_pixels = False
     ###########
 
+    if quantizer != 'NONE':
+        colors, counts = quantize_image(image, max_colors_to_return, quantizer, ignore_alpha_below)
+        return (colors, get_coverage(counts, counts.sum())) if return_weights else colors
+
+    if backend == 'PYTHON':
+        colors, counts = _count_colors_python(image, ignore_alpha_below, analyse_all_pixels, sample_count,
+                                              sampling != 'GRID')
+    else:
+        counted = _count_colors_cached(image, backend, tile_rows, octree_nodes, histogram_bins, sampling,
+                                       sample_count, ignore_alpha_below, analyse_all_pixels, workers,
+                                       histogram_cache, max_colors_to_return, determine_distinct_colors,
+                                       pixel_threshold, stats)
+        colors, counts = counted
+
+    if not return_weights:
+        return select_colors(colors, counts, max_colors_to_return, determine_distinct_colors, pixel_threshold)
+
+    colors, selected_counts = select_colors(colors, counts, max_colors_to_return, determine_distinct_colors,
+                                            pixel_threshold, return_counts=True)
+    return colors, get_coverage(selected_counts, counts.sum())
+
+
+def _count_colors_cached(image, backend, tile_rows, octree_nodes, histogram_bins, sampling, sample_count,
+                         ignore_alpha_below, analyse_all_pixels, workers, histogram_cache,
+                         max_colors_to_return, determine_distinct_colors, pixel_threshold, stats=None):
+    """
+    Read the pixels and count them with _count_colors_numpy, through the optional HistogramCache.
+    Unedited images are looked up before their pixels are read. Edited ones are looked up by a hash of all
+    of their pixels, and only by the backends that count every pixel, counting a sample costs less than the hash.
+    """
+    params = (backend, octree_nodes, histogram_bins, sampling, sample_count, ignore_alpha_below, analyse_all_pixels)
+    fingerprint = None
+    if histogram_cache is not None:
+        fingerprint = histogram_cache.image_fingerprint(image)
+        if fingerprint is not None:
+            counted = histogram_cache.get(image.name_full, fingerprint, params)
+            if stats is not None:
+                stats['histogram_cache'] = 'MISS' if counted is None else 'HIT'
+            if counted is not None:
+                return counted
+
+    shared = None
+    if backend == 'PARALLEL':
+        from .parallel import SharedPixels
+
+        shared = SharedPixels(image)
+        pixels = shared.array
+    else:
+        pixels = read_pixels(image)
+
+    try:
+        counts_every_pixel = backend != 'NUMPY' or analyse_all_pixels
+        if histogram_cache is not None and fingerprint is None and counts_every_pixel:
+            fingerprint = histogram_cache.pixel_fingerprint(pixels)
+            counted = histogram_cache.get(image.name_full, fingerprint, params)
+            if stats is not None:
+                stats['histogram_cache'] = 'MISS' if counted is None else 'HIT'
+            if counted is not None:
+                return counted
+
+        def select(colors, counts):
+            return select_colors(colors, counts, max_colors_to_return, determine_distinct_colors, pixel_threshold)
+
+        counted = _count_colors_numpy(image, pixels, backend, tile_rows, octree_nodes, histogram_bins, sampling,
+                                      sample_count, ignore_alpha_below, analyse_all_pixels, select, shared, workers,
+                                      stats)
+        if fingerprint is not None:
+            histogram_cache.put(image.name_full, fingerprint, params, counted)
+    finally:
+        pixels = None
+        if shared is not None:
+            shared.close()
+
+    return counted
+
+
+def _count_colors_numpy(image, pixels, backend, tile_rows, octree_nodes, histogram_bins, sampling, sample_count,
+                        ignore_alpha_below, analyse_all_pixels, select, shared=None, workers=0, stats=None):
+    """
+    Counting stage of extract_from_image for the array backends.
+    shared: SharedPixels holding pixels, for the 'PARALLEL' backend
+    Return the counted colors and their counts, most frequent first.
+    """
+    if backend == 'TILED':
+        counter = ColorCounter()
+        for _pixels, colors in iter_linear_bands(image, tile_rows, ignore_alpha_below, stats, source=pixels):
+            counter.add(colors)
+
+        return counter.result()
+
+    if backend == 'OCTREE':
+        from .quantize import OctreeQuantizer
+
+        octree = OctreeQuantizer(max_nodes=octree_nodes)
+        for band, colors in iter_linear_bands(image, tile_rows, ignore_alpha_below, stats, source=pixels):
+            octree.add(band, colors)
+
+        if stats is not None:
+            stats['octree_nodes'] = octree.node_count
+        colors, counts = octree.leaves()
+        return sort_counts(np.round(colors, 4), counts)
+
+    if backend == 'HISTOGRAM':
+        reader = TiledPixelReader(image, tile_rows=tile_rows, source=pixels)
+        histogram = ColorHistogram(bins=histogram_bins, ignore_alpha_below=ignore_alpha_below)
+        for band in reader:
+            histogram.add(band)
+
+        if stats is not None:
+            stats['image_bytes'] = reader.image_bytes
+            stats['peak_buffer_bytes'] = reader.image_bytes + histogram.nbytes
+        return histogram.result()
+
+    if backend == 'PARALLEL':
+        from .parallel import parallel_histogram
+
+        histogram = ColorHistogram(bins=histogram_bins, ignore_alpha_below=ignore_alpha_below)
+        histogram.add_counts(*parallel_histogram(shared, histogram_bins, ignore_alpha_below, workers, stats))
+        return histogram.result()
+
+    width, height = image.size
+
+    if sampling == 'ADAPTIVE' and not analyse_all_pixels:
+        colors, counts, sampled = adaptive_sample_counts(pixels, width, height, select, batch_size=sample_count,
+                                                         ignore_alpha_below=ignore_alpha_below)
+        if stats is not None:
+            stats['sampled_pixels'] = sampled
+        return colors, counts
+
+    pixels = pixels[get_sample_indices(width, height, analyse_all_pixels, sample_count, sampling == 'JITTER')]
+
+    colors = linearize_pixels(pixels)
+    colors = colors[colors[:, 3] >= ignore_alpha_below]
+
+    return count_colors(colors)
+
+
+class HistogramCache:
+    """
+    In-memory LRU cache of the counted colors of images, for this session only.
+    Selecting colors from counts takes milliseconds, so extracting again with other selection parameters
+    (max colors, distinct threshold) only reruns the selection.
+
+    Entries are keyed on the image name and the counting parameters and remember a fingerprint of the pixels.
+    When an image comes back with other pixels, all of its entries are dropped.
+    """
+
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (image name, params) -> (fingerprint, (colors, counts))
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def image_fingerprint(image):
+        """
+        Fingerprint of an Image that was not edited in this session, without reading its pixels:
+        what its pixels are made from (source, file and its modification time, generator settings).
+        None for edited (dirty) images, renders, movies and sequences and anything else that is not an Image,
+        see pixel_fingerprint
+        """
+        if getattr(image, 'is_dirty', True) or image.source not in {'FILE', 'GENERATED'}:
+            return None
+
+        import os
+        import bpy
+
+        filepath = bpy.path.abspath(image.filepath, library=image.library)
+        mtime = os.stat(filepath).st_mtime_ns if os.path.isfile(filepath) else None
+        packed_size = image.packed_file.size if image.packed_file is not None else None
+        generated = (image.generated_type, tuple(image.generated_color), image.use_generated_float) \
+            if image.source == 'GENERATED' else None
+
+        return ('IMAGE', tuple(image.size), image.channels, image.source, filepath, mtime, packed_size, generated,
+                image.colorspace_settings.name, image.alpha_mode)
+
+    @staticmethod
+    def pixel_fingerprint(pixels):
+        """Hash of all the pixels, any edit changes it"""
+        pixels = np.ascontiguousarray(pixels)
+        digest = hashlib.sha256(np.asarray(pixels.shape, dtype=np.int64).tobytes())
+        digest.update(memoryview(pixels).cast('B'))
+
+        return ('PIXELS', digest.hexdigest())
+
+    def invalidate(self, image_name):
+        for key in [key for key in self.entries if key[0] == image_name]:
+            del self.entries[key]
+
+    def get(self, image_name, fingerprint, params):
+        entry = self.entries.get((image_name, params))
+        if entry is not None and entry[0] != fingerprint:
+            self.invalidate(image_name)
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end((image_name, params))
+        return entry[1]
+
+    def put(self, image_name, fingerprint, params, counted):
+        if any(key[0] == image_name and entry[0] != fingerprint for key, entry in self.entries.items()):
+            self.invalidate(image_name)
+
+        self.entries[(image_name, params)] = (fingerprint, counted)
+        self.entries.move_to_end((image_name, params))
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+
+HISTOGRAM_CACHE = HistogramCache()
+
+
+class PixelBufferCache:
+    """
+    Pixels of the last sampled images, each read once into a float32 (height, width, channels) array,
+    so sampling a small region of an image is array slicing instead of a copy of all of its pixels.
+
+    Entries are keyed on the image name and remember the state of the image (size, channels, source file,
+    color space, dirty flag), a buffer is read again when the state changed.
+    Edits that keep the state, like painting an image that is already dirty, go through invalidate().
+    """
+
+    def __init__(self, max_images=2):
+        self.max_images = max_images
+        self.entries = OrderedDict()  # image name -> (state, pixels)
+
+    @staticmethod
+    def state(image):
+        return (tuple(image.size), image.channels, image.source, image.filepath, image.colorspace_settings.name,
+                image.is_dirty)
+
+    def get(self, image):
+        state = self.state(image)
+        entry = self.entries.get(image.name_full)
+        if entry is None or entry[0] != state:
+            self.invalidate(image.name_full)  # free the old buffer before reading the new one
+            width, height = image.size
+            entry = (state, read_pixels(image).reshape(height, width, image.channels))
+            self.entries[image.name_full] = entry
+
+        self.entries.move_to_end(image.name_full)
+        while len(self.entries) > self.max_images:
+            self.entries.popitem(last=False)
+
+        return entry[1]
+
+    def invalidate(self, image_name):
+        self.entries.pop(image_name, None)
+
+    def clear(self):
+        self.entries.clear()
+
+
+PIXEL_CACHE = PixelBufferCache()
+
+
+def region_bounds(width, height, x, y, size):
+    """
+    Pixel bounds (x0, y0, x1, y1) of the size x size square centred on pixel (x, y), clipped to the image
+    """
+    x0, y0 = x - size // 2, y - size // 2
+    return max(x0, 0), max(y0, 0), min(x0 + size, width), min(y0 + size, height)
+
+
+def region_average(pixels, x, y, size=5):
+    """
+    Mean linear color of the size x size pixels around pixel (x, y) of a (height, width, channels) buffer.
+    The pixels are converted with srgb_2_linear (like PixelIterator.get_color) before they are averaged.
+    Return a rounded RGBA tuple, or None when the square is outside the image
+    """
+    height, width, channel_count = pixels.shape
+    x0, y0, x1, y1 = region_bounds(width, height, x, y, size)
+    if x0 >= x1 or y0 >= y1:
+        return None
+
+    block = pixels[y0:y1, x0:x1].reshape(-1, channel_count)
+    color = srgb_2_linear_array(block[:, :3].astype(np.float64)).mean(axis=0).tolist()
+    alpha = float(block[:, 3].mean()) if channel_count == 4 else 1
+
+    return round_color_tuple((*color, alpha))
+
+
+def get_coverage(counts, total):
+    """
+    Pixel counts to coverage fractions
+    """
+    if total <= 0:
+        return [0.0] * len(counts)
+
+    return (np.asarray(counts) / total).tolist()
+
+
+def palette_from_counts(colors, counts, max_colors_to_return=5, return_weights=False, color_diff=0.05):
+    """
+    Palette of (N, 4) linear colors that occur counts times each, equal colors are summed first.
+    Every color counts, there is no frequency threshold.
+    color_diff: OKLab distance below which colors are merged into the more frequent one
+    """
+    if len(colors) == 0:
+        return ([], []) if return_weights else []
+
+    colors, counts = merge_counts(np.round(np.asarray(colors, dtype=np.float64), 4), counts)
+    colors, counts = sort_counts(colors, counts)
+    if not return_weights:
+        return select_colors(colors, counts, max_colors_to_return, color_diff, pixel_threshold=0)
+
+    colors, selected_counts = select_colors(colors, counts, max_colors_to_return, color_diff, pixel_threshold=0,
+                                            return_counts=True)
+    return colors, get_coverage(selected_counts, counts.sum())
+
+
+COVERAGE_STEPS = 10000
+
+
+def merge_palettes(palettes, max_colors_to_return=5, return_weights=False):
+    """
+    One palette from several extracted palettes.
+    palettes: (colors, coverage weights, palette weight) of every palette, every color counts for its coverage
+              times the weight of its palette (e.g. how many materials use its image)
+    """
+    colors = [color for palette, _weights, _weight in palettes for color in palette]
+    counts = [coverage * weight for _palette, weights, weight in palettes for coverage in weights]
+
+    # whole counts in parts per COVERAGE_STEPS of a palette, so weights of 1 are not rounded away
+    return palette_from_counts(np.array(colors).reshape(-1, 4), np.rint(np.array(counts) * COVERAGE_STEPS),
+                               max_colors_to_return, return_weights)
+
+
+def _count_colors_python(image, ignore_alpha_below, analyse_all_pixels, sample_count=2025, jitter=False):
     new_colors = {}
-    for new_color in PixelIterator(image=image, analyse_all_pixels=analyse_all_pixels):
+    for new_color in PixelIterator(image=image, analyse_all_pixels=analyse_all_pixels, sample_count=sample_count,
+                                   jitter=jitter):
         if new_color[3] >= ignore_alpha_below:
             new_colors.setdefault(new_color, 0)
             new_colors[new_color] += 1
 
     color_tuples = sorted([(count, color) for color, count in new_colors.items()], reverse=True)
-    if pixel_threshold > 0.0:
-        highest_frequency = color_tuples[0][0]
-        threshold = int(highest_frequency / pixel_threshold)
-        color_tuples = [(count, color) for count, color in color_tuples if count > threshold]
+    if not color_tuples:
+        return np.empty((0, 4)), np.empty(0, dtype=np.int64)
 
-    colors = []
+    counts, colors = zip(*color_tuples)
 
-    if determine_distinct_colors > 0:
-        colors = get_distinct_colors(color_tuples, max_colors_to_return, determine_distinct_colors)
-    else:
-        colors = [color for _, color in color_tuples]
-
-    return colors[:max_colors_to_return]
+    return np.array(colors, dtype=np.float64), np.array(counts, dtype=np.int64)
 
 
 class PixelIterator:
     """
     Iterate over blender Image pixel data.
-    For small images, loop over every single pixel.
-    For images larger than 1000 pixels, only consider 33 x 33 = 999 pixels.
-    These 999 pixels are chosen from an 'equally distributed grid'.
+    Loop over every single pixel when analyse_all_pixels is set.
+    Otherwise the image is split into sample_count equal cells and one pixel per cell is considered,
+    the cell centre or a random pixel inside it when jitter is set (see stratified_sample_indices).
 
     Return the color values as a Color tuple of floats.
     The color tuple always contains 4 rounded values (including the gamma value that will be 1 by default).
     """
 
-    def __init__(self, image, analyse_all_pixels=False):
+    def __init__(self, image, analyse_all_pixels=False, sample_count=2025, jitter=False, seed=0):
         self.analyse_all_pixels = analyse_all_pixels
+        self.sample_count = sample_count
+        self.jitter = jitter
+        self.seed = seed
         self.channel_count = image.channels
         self.width, self.height = image.size
         self.pixels = image.pixels[:]  # way faster to use a Python list, instead of the Blender pixel datatype
 
         assert self.channel_count in [3, 4], 'PixelIterator expects a channel count of 3 or 4'
         assert self.width * self.height * self.channel_count == len(self.pixels), \
-            f'PixelIterator: width x height * channel_count != len(pixels) for Image {image.path}'
+            f'PixelIterator: width x height * channel_count != len(pixels) for Image {image.name_full}'
 
     def get_color(self, start_index):
         r, g, b, *a = self.pixels[start_index:start_index + self.channel_count]
@@ -118,21 +873,231 @@ class PixelIterator:
         return round_color_tuple((r, g, b, a))
 
     def __iter__(self):
-        if self.analyse_all_pixels:
-            for x in range(self.width):
-                for y in range(self.height):
-                    start_index = (y * self.width + x) * self.channel_count
-                    yield self.get_color(start_index=start_index)
-        else:
-            step = 45  # 45 * 45 = 2025 so this gives a ~2000 pixel sample
-            x_step = self.width / step
-            y_step = self.height / step
-            half_x_step = x_step / 2
-            half_y_step = y_step / 2
-
-            for x in range(step):
-                for y in range(step):
-                    x_co = int(x * x_step + half_x_step)
-                    y_co = int(y * y_step + half_y_step)
-                    start_index = x_co * y_co * self.channel_count
-                    yield self.get_color(start_index=start_index)
+        indices = get_sample_indices(self.width, self.height, self.analyse_all_pixels, self.sample_count,
+                                     self.jitter, self.seed)
+        for index in indices.tolist():
+            yield self.get_color(start_index=index * self.channel_count)
+
+
+LUMINANCE_WEIGHTS = np.array([0.2126, 0.7152, 0.0722])  # Rec. 709
+
+
+def region_indices(width, height, rect=None, mask=None, mask_threshold=0.5):
+    """
+    Flat pixel indices of a rectangle, optionally limited by a mask, row by row from the bottom left corner.
+    rect: (x, y, width, height) in pixels, clamped to the image
+    mask: (height, width) array over the whole image, pixels where it reaches mask_threshold are kept
+    """
+    x, y, w, h = rect if rect is not None else (0, 0, width, height)
+    x0, y0 = min(max(int(x), 0), width), min(max(int(y), 0), height)
+    x1, y1 = min(max(int(x + w), x0), width), min(max(int(y + h), y0), height)
+
+    rows = np.arange(y0, y1, dtype=np.int64)
+    columns = np.arange(x0, x1, dtype=np.int64)
+    if mask is None:
+        return (rows[:, None] * width + columns[None, :]).ravel(), (x1 - x0, y1 - y0)
+
+    keep = np.asarray(mask)[y0:y1, x0:x1] >= mask_threshold
+    indices = (rows[:, None] * width + columns[None, :])[keep]
+    return indices, (len(indices), 1)
+
+
+def mask_from_image(image, size, channel='ALPHA', invert=False):
+    """
+    (height, width) mask from the alpha or luminance of another Image, resized (nearest pixel) to size
+    """
+    width, height = size
+    pixels = read_pixels(image).reshape(image.size[1], image.size[0], -1)
+
+    if channel == 'ALPHA':
+        mask = pixels[:, :, 3] if image.channels == 4 else np.ones(pixels.shape[:2], dtype=np.float32)
+    else:
+        mask = pixels[:, :, :3] @ LUMINANCE_WEIGHTS.astype(np.float32)
+
+    rows = (np.arange(height) * image.size[1] // max(height, 1)).astype(np.int64)
+    columns = (np.arange(width) * image.size[0] // max(width, 1)).astype(np.int64)
+    mask = mask[rows[:, None], columns[None, :]]
+
+    return 1 - mask if invert else mask
+
+
+class RegionPixels:
+    """Flat float pixel buffer with the parts of the Image.pixels interface used by extraction"""
+
+    def __init__(self, pixels):
+        self.pixels = pixels.reshape(-1)
+
+    def __len__(self):
+        return len(self.pixels)
+
+    def __getitem__(self, key):
+        return self.pixels[key].tolist()
+
+    def foreach_get(self, buffer):
+        buffer[:] = self.pixels
+
+
+class ArrayImage:
+    """
+    Float pixel array that stands in for an Image, e.g. a frame decoded without Blender
+    pixels: (width * height, channels) array, bottom row first like Image.pixels
+    """
+
+    def __init__(self, pixels, size, name=''):
+        self.size = size
+        self.channels = pixels.shape[1]
+        self.name_full = self.path = name
+        self.array = pixels
+        self.pixels = RegionPixels(pixels)
+
+
+class ImageRegion:
+    """
+    Part of an Image limited to a rectangle and/or a mask, passed to extract_from_image in place of the Image.
+    Only the selected pixels are gathered (one vectorized take), every later stage works on them alone,
+    so extracting from a small area of a large image costs in proportion to the area.
+
+    A rectangle keeps its shape, masked pixels are laid out as a single row
+    (sampled along it, see stratified_sample_indices).
+    See region_indices for rect, mask and mask_threshold.
+    """
+
+    def __init__(self, image, rect=None, mask=None, mask_threshold=0.5):
+        width, height = image.size
+        indices, self.size = region_indices(width, height, rect, mask, mask_threshold)
+
+        self.channels = image.channels
+        self.name_full = f'{image.name_full} {"mask" if mask is not None else "rect"} {rect}'
+        self.pixels = RegionPixels(read_pixels(image)[indices])
+
+    @property
+    def pixel_count(self):
+        return self.size[0] * self.size[1]
+
+
+def extract_from_frames(frames, max_colors_to_return=5, histogram_bins=32, tile_rows=256, return_weights=False,
+                        stats=None):
+    """
+    One palette for a whole image sequence, memory does not grow with the number of frames:
+    one frame and the histogram are held at a time.
+    Every frame is counted band by band into a single ColorHistogram (the 'HISTOGRAM' backend stage of
+    extract_from_image) and dropped before the next one is read.
+
+    frames: iterable of Images (or ArrayImages), e.g. image_sequence.iter_frames
+    stats: optional dict, filled with 'frames', 'image_bytes' (largest frame) and 'peak_buffer_bytes'
+    """
+    histogram = ColorHistogram(bins=histogram_bins)
+    frame_count = 0
+    image_bytes = 0
+
+    for frame in frames:
+        source = frame.array if isinstance(frame, ArrayImage) else None
+        reader = TiledPixelReader(frame, tile_rows=tile_rows, source=source)
+        for band in reader:
+            histogram.add(band)
+
+        image_bytes = max(image_bytes, reader.image_bytes)
+        frame = source = reader = band = None  # release the frame before the next one is read
+        frame_count += 1
+
+    if stats is not None:
+        stats['frames'] = frame_count
+        stats['image_bytes'] = image_bytes
+        stats['peak_buffer_bytes'] = image_bytes + histogram.nbytes
+
+    colors, counts = histogram.result()
+    if not return_weights:
+        return select_colors(colors, counts, max_colors_to_return)
+
+    colors, selected_counts = select_colors(colors, counts, max_colors_to_return, return_counts=True)
+    return colors, get_coverage(selected_counts, counts.sum())
+
+
+def tone_map(rgb, exposure=0.0, method='REINHARD'):
+    """
+    Scene linear HDR colors to the [0, 1] range, still linear.
+    exposure: in stops, applied first
+    method: 'REINHARD' to compress the luminance (L / (1 + L)) keeping the hue, 'CLIP' to clamp every channel
+    """
+    rgb = rgb * 2.0 ** exposure
+    if method == 'REINHARD':
+        rgb = rgb / (1 + np.maximum(rgb @ LUMINANCE_WEIGHTS, 0))[:, None]
+
+    return np.clip(rgb, 0, 1)
+
+
+def tone_map_pixels(pixels, exposure=0.0, method='REINHARD'):
+    """
+    tone_map (N, 3) or (N, 4) scene linear pixels, return (N, 4) float32 colors keeping the alpha
+    """
+    colors = np.empty((len(pixels), 4), dtype=np.float32)
+    colors[:, :3] = tone_map(pixels[:, :3], exposure, method)
+    colors[:, 3] = pixels[:, 3] if pixels.shape[1] == 4 else 1
+
+    return colors
+
+
+def equirect_weights(rows, height):
+    """
+    Relative solid angle of the pixels of equirectangular image rows (bottom row first), cos(latitude)
+    """
+    latitude = ((np.asarray(rows) + 0.5) / height - 0.5) * np.pi
+    return np.cos(latitude)
+
+
+def extract_from_hdri(image, max_colors_to_return=5, exposure=0.0, tone_mapping='REINHARD', max_size=1024,
+                      histogram_bins=32, return_weights=False, stats=None):
+    """
+    Palette of an equirectangular HDRI (scene linear float pixels).
+    Every pixel is weighted by the solid angle it covers, so the stretched poles do not dominate,
+    and the colors are exposed and tone mapped before they are binned.
+
+    The pixels are read once, then only a strided view of at most max_size pixels along the long side is used,
+    so the cost of everything after the read does not depend on the resolution.
+    stats: optional dict, filled with 'sampled_pixels'
+    """
+    width, height = image.size
+    channel_count = image.channels
+    step = max(1, -(-max(width, height) // max_size))  # ceil division
+
+    view = read_pixels(image).reshape(height, width, channel_count)[::step, ::step]
+    pixels = view.reshape(-1, channel_count)
+    weights = np.repeat(equirect_weights(np.arange(0, height, step), height), view.shape[1])
+    weights *= len(weights) / max(weights.sum(), 1e-12)  # in equivalent pixels
+
+    histogram = ColorHistogram(bins=histogram_bins, weighted=True)
+    histogram.add(tone_map_pixels(pixels, exposure, tone_mapping), weights, linear=True)
+
+    if stats is not None:
+        stats['sampled_pixels'] = len(pixels)
+
+    return palette_from_histogram(histogram, max_colors_to_return, return_weights)
+
+
+def extract_from_render(image, max_colors_to_return=5, exposure=0.0, tone_mapping='REINHARD', histogram_bins=32,
+                        return_weights=False):
+    """
+    Palette of a scene linear render, e.g. the OpenEXR image of render_palette.render_camera.
+    The colors are exposed and tone mapped before they are binned, transparent film pixels are left out.
+    """
+    histogram = ColorHistogram(bins=histogram_bins)
+    histogram.add(tone_map_pixels(read_pixels(image), exposure, tone_mapping), linear=True)
+
+    return palette_from_histogram(histogram, max_colors_to_return, return_weights)
+
+
+def palette_from_histogram(histogram, max_colors_to_return=5, return_weights=False, scale=1.0):
+    """
+    Select the palette of a weighted ColorHistogram.
+    scale: factor that turns the weight sums into equivalent pixel counts
+    """
+    colors, counts = histogram.result()
+    counts = np.rint(counts * scale).astype(np.int64)
+    keep = counts > 0
+    colors, counts = sort_counts(colors[keep], counts[keep])
+
+    if not return_weights:
+        return select_colors(colors, counts, max_colors_to_return)
+
+    colors, selected_counts = select_colors(colors, counts, max_colors_to_return, return_counts=True)
+    return colors, get_coverage(selected_counts, counts.sum())
@@ -0,0 +1,256 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import numpy as np
+
+
+def sample_rows(values, max_samples=100_000):
+    """
+    Evenly strided sample of at most max_samples rows
+    """
+    if len(values) <= max_samples:
+        return values
+
+    stride = -(-len(values) // max_samples)  # ceil division
+    return values[::stride]
+
+
+def sort_clusters(centers, counts):
+    """
+    Drop empty clusters and sort the rest, largest first
+    """
+    keep = counts > 0
+    centers, counts = centers[keep], counts[keep]
+    order = np.argsort(-counts, kind='stable')
+
+    return centers[order], counts[order]
+
+
+def median_cut(colors, n_colors):
+    """
+    Median cut quantizer on the unique colors, weighted by how often they occur.
+    Repeatedly split the box with the largest weighted squared error along its channel of largest variance,
+    at the weighted median value of that channel. Equal values always stay on the same side,
+    so a box never separates copies of one color and a few flat colors come back exactly.
+
+    colors: (N, C) float array, only the first 3 channels are used to split
+    Return the mean color of every box and the number of colors in it, largest box first.
+    """
+    if len(colors) == 0:
+        return np.empty((0, colors.shape[1])), np.empty(0, dtype=np.int64)
+
+    colors, inverse = np.unique(np.asarray(colors, dtype=np.float64), axis=0, return_inverse=True)
+    weights = np.bincount(inverse.ravel(), minlength=len(colors))
+
+    def box_error(box):
+        """Weighted squared error of the box and the variance of every channel"""
+        rgb, w = colors[box, :3], weights[box]
+        variance = w @ (rgb - w @ rgb / w.sum()) ** 2 / w.sum()
+        return variance.sum() * w.sum(), variance
+
+    boxes = [np.arange(len(colors))]
+    errors = [box_error(boxes[0])]
+
+    while len(boxes) < n_colors:
+        index = int(np.argmax([error for error, _variance in errors]))
+        if errors[index][0] <= 0:
+            break  # every box holds a single color
+
+        box = boxes.pop(index)
+        channel = int(np.argmax(errors.pop(index)[1]))
+
+        values = colors[box, channel]
+        order = np.argsort(values, kind='stable')
+        box, values = box[order], values[order]
+        cumulative = np.cumsum(weights[box])
+        median = values[np.searchsorted(cumulative, cumulative[-1] / 2)]
+
+        # cut after the median value, or before it when the median is the largest value
+        cut = np.searchsorted(values, median, side='right')
+        if cut == len(values):
+            cut = np.searchsorted(values, median, side='left')
+
+        for new_box in (box[:cut], box[cut:]):
+            boxes.append(new_box)
+            errors.append(box_error(new_box))
+
+    counts = np.array([weights[box].sum() for box in boxes], dtype=np.int64)
+    centers = np.array([colors[box[0]] if len(box) == 1 else weights[box] @ colors[box] / weights[box].sum()
+                        for box in boxes])
+
+    return sort_clusters(centers, counts)
+
+
+def squared_distances(colors, centers):
+    return (
+            np.einsum('ij,ij->i', colors, colors)[:, None]
+            - 2 * colors @ centers.T
+            + np.einsum('ij,ij->i', centers, centers)[None, :]
+    )
+
+
+def kmeans_plus_plus(colors, n_colors, rng):
+    """
+    k-means++ seeding
+    """
+    centers = [colors[rng.integers(len(colors))]]
+    closest = squared_distances(colors, centers[0][None, :])[:, 0]
+
+    for _ in range(1, n_colors):
+        total = closest.sum()
+        if total <= 0:
+            break  # fewer distinct colors than clusters
+        index = rng.choice(len(colors), p=closest / total)
+        centers.append(colors[index])
+        closest = np.minimum(closest, squared_distances(colors, colors[index][None, :])[:, 0])
+
+    return np.array(centers)
+
+
+def mini_batch_kmeans(colors, n_colors, seed=0, batch_size=1024, iterations=100):
+    """
+    Mini-batch k-means quantizer (Sculley 2010), seeded so the same image always gives the same palette.
+
+    colors: (N, C) float array
+    Return the cluster centers and the number of colors assigned to each, largest cluster first.
+    """
+    if len(colors) == 0:
+        return np.empty((0, colors.shape[1])), np.empty(0, dtype=np.int64)
+
+    colors = np.asarray(colors, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+
+    centers = kmeans_plus_plus(sample_rows(colors, 10_000), n_colors, rng)
+    seen = np.zeros(len(centers))
+
+    for _ in range(iterations):
+        batch = colors[rng.integers(len(colors), size=min(batch_size, len(colors)))]
+        labels = np.argmin(squared_distances(batch, centers), axis=1)
+
+        batch_counts = np.bincount(labels, minlength=len(centers))
+        hit = batch_counts > 0
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, batch)
+
+        seen[hit] += batch_counts[hit]
+        rate = (batch_counts[hit] / seen[hit])[:, None]
+        centers[hit] = (1 - rate) * centers[hit] + rate * (sums[hit] / batch_counts[hit][:, None])
+
+    labels = np.argmin(squared_distances(colors, centers), axis=1)
+    counts = np.bincount(labels, minlength=len(centers))
+
+    return sort_clusters(centers, counts)
+
+
+QUANTIZERS = {
+    'MEDIAN_CUT': median_cut,
+    'KMEANS': mini_batch_kmeans,
+}
+
+
+class OctreeQuantizer:
+    """
+    Streaming octree color quantizer with a fixed node budget.
+
+    Colors are added in chunks and every leaf only keeps the sum and count of the colors inside it,
+    so memory depends on max_nodes, not on the image size or the number of unique colors.
+    Whenever the tree grows past max_nodes, the deepest leaves holding the fewest pixels are merged into their parent.
+    """
+    MAX_DEPTH = 8
+
+    def __init__(self, max_nodes=256):
+        self.max_nodes = max(max_nodes, 9)  # root + 8 children
+        self.depths = np.empty(0, dtype=np.int64)
+        self.codes = np.empty(0, dtype=np.int64)
+        self.sums = np.empty((0, 4))
+        self.counts = np.empty(0, dtype=np.int64)
+
+    # the 8 bits of a byte spread out to every third bit, bit k moves to bit 3k
+    SPREAD_BITS = np.array([sum(((v >> k) & 1) << 3 * k for k in range(8)) for v in range(256)], dtype=np.int64)
+
+    @classmethod
+    def octree_codes(cls, values):
+        """
+        Interleave the bits of 8-bit r, g, b addresses into one octree path code per color, root level first
+        """
+        rgb = np.clip(values[:, :3] * 255 + 0.5, 0, 255).astype(np.uint8)
+        spread = cls.SPREAD_BITS
+
+        return (spread[rgb[:, 0]] << 2) | (spread[rgb[:, 1]] << 1) | spread[rgb[:, 2]]
+
+    @property
+    def node_count(self):
+        count = len(self.codes)
+        for depth in range(self.MAX_DEPTH):
+            below = self.depths > depth
+            count += len(np.unique(self.codes[below] >> 3 * (self.depths[below] - depth)))
+
+        return count
+
+    def add(self, values, colors):
+        """
+        values: (N, 3) floats in [0, 1] used to walk the tree, e.g. display referred pixel values
+        colors: (N, 4) colors accumulated in the leaves
+        """
+        if len(values) == 0: return
+
+        codes = self.octree_codes(values)
+        depths = np.full(len(codes), self.MAX_DEPTH, dtype=np.int64)
+
+        # colors inside an already reduced leaf stay in that leaf
+        for depth in np.unique(self.depths[self.depths < self.MAX_DEPTH]):
+            hit = np.isin(codes >> 3 * (self.MAX_DEPTH - depth), self.codes[self.depths == depth])
+            depths[hit] = depth
+
+        codes >>= 3 * (self.MAX_DEPTH - depths)
+        self._merge(depths, codes, colors, np.ones(len(codes), dtype=np.int64))
+        self._reduce()
+
+    def _merge(self, depths, codes, sums, counts):
+        keys = np.concatenate((self.depths, depths)) << 32 | np.concatenate((self.codes, codes))
+        sums = np.concatenate((self.sums, sums))
+        counts = np.concatenate((self.counts, counts))
+
+        keys, inverse = np.unique(keys, return_inverse=True)
+        inverse = inverse.ravel()
+
+        self.depths = keys >> 32
+        self.codes = keys & 0xFFFFFFFF
+        self.sums = np.stack([np.bincount(inverse, weights=sums[:, i], minlength=len(keys)) for i in range(4)], axis=1)
+        self.counts = np.bincount(inverse, weights=counts, minlength=len(keys)).astype(np.int64)
+
+    def _reduce(self):
+        while len(self.codes) > 1:
+            excess = self.node_count - self.max_nodes
+            if excess <= 0:
+                break
+
+            deepest = self.depths.max()
+            if deepest == 0:
+                break
+            at_deepest = self.depths == deepest
+
+            parents, inverse, children = np.unique(self.codes[at_deepest] >> 3, return_inverse=True,
+                                                   return_counts=True)
+            pixels = np.bincount(inverse.ravel(), weights=self.counts[at_deepest])
+
+            # merging a parent removes its children from the tree, merge the least used parents first
+            order = np.argsort(pixels, kind='stable')
+            merge_count = np.searchsorted(np.cumsum(children[order]), excess) + 1
+            merged = np.isin(self.codes >> 3, parents[order[:merge_count]]) & at_deepest
+
+            depths = self.depths.copy()
+            codes = self.codes.copy()
+            depths[merged] -= 1
+            codes[merged] >>= 3
+
+            sums, counts = self.sums, self.counts
+            self.depths = self.codes = np.empty(0, dtype=np.int64)
+            self.sums, self.counts = np.empty((0, 4)), np.empty(0, dtype=np.int64)
+            self._merge(depths, codes, sums, counts)
+
+    def leaves(self):
+        """
+        Return the mean color and pixel count of every leaf
+        """
+        return self.sums / self.counts[:, None], self.counts
@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+
+import bpy
+
+
+@contextmanager
+def overridden(settings):
+    """
+    Set attributes for the duration of the block and restore them afterwards.
+    settings: [(owner, attribute name, value)], applied in order
+    """
+    old = []
+    try:
+        for owner, attribute, value in settings:
+            old.append((owner, attribute, getattr(owner, attribute)))
+            setattr(owner, attribute, value)
+        yield
+    finally:
+        for owner, attribute, value in reversed(old):
+            setattr(owner, attribute, value)
+
+
+def render_size(scene, resolution):
+    """
+    Render size with resolution pixels along the long side, keeping the aspect ratio of the scene
+    """
+    render = scene.render
+    aspect = (render.resolution_x * render.pixel_aspect_x) / (render.resolution_y * render.pixel_aspect_y)
+    if aspect >= 1:
+        return resolution, max(1, round(resolution / aspect))
+
+    return max(1, round(resolution * aspect)), resolution
+
+
+@contextmanager
+def render_camera(scene, resolution=128, samples=16):
+    """
+    Render the active camera of scene with Cycles on the CPU at a small size, keeping every other setting of the scene.
+    The render is written to a temporary OpenEXR file and loaded back: the Viewer Node and Render Result images
+    have no pixels to read in background mode (blender -b), a file works the same everywhere.
+    Yield the loaded Image (scene linear, without compositing) and the render time in seconds,
+    the image and the file are removed after the block
+    """
+    width, height = render_size(scene, resolution)
+    render = scene.render
+    image_settings = render.image_settings
+    directory = tempfile.mkdtemp(prefix='color_helper_')
+    filepath = os.path.join(directory, 'render.exr')
+    settings = [
+        (render, 'engine', 'CYCLES'),
+        (render, 'resolution_x', width),
+        (render, 'resolution_y', height),
+        (render, 'resolution_percentage', 100),
+        (render, 'use_border', False),
+        (render, 'use_compositing', False),
+        (render, 'use_sequencer', False),
+        (render, 'filepath', filepath),
+        (render, 'use_file_extension', True),
+        (image_settings, 'file_format', 'OPEN_EXR'),
+        (image_settings, 'color_mode', 'RGBA'),
+        (image_settings, 'color_depth', '32'),
+        (scene.cycles, 'device', 'CPU'),
+        (scene.cycles, 'samples', samples),
+        (scene.cycles, 'use_denoising', False),
+    ]
+
+    image = None
+    try:
+        with overridden(settings):
+            start = time.perf_counter()
+            bpy.ops.render.render(write_still=True, scene=scene.name)
+            seconds = time.perf_counter() - start
+
+        if os.path.isfile(filepath):
+            image = bpy.data.images.load(filepath, check_existing=False)
+        yield image, seconds
+    finally:
+        if image is not None:
+            bpy.data.images.remove(image)
+        shutil.rmtree(directory, ignore_errors=True)
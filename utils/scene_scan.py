@@ -0,0 +1,103 @@
+# SPDX-FileCopyrightText: 2026 Atticus
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import hashlib
+import os
+
+import bpy
+
+# (filepath, size, mtime) -> content hash, so unchanged files are hashed once per session
+_file_hashes = {}
+
+
+def get_materials(context, scope='SELECTED'):
+    """
+    Materials of the selected objects, or every material of the file
+    """
+    if scope == 'FILE':
+        return list(bpy.data.materials)
+
+    materials = []
+    for obj in context.selected_objects:
+        for slot in getattr(obj, 'material_slots', ()):
+            if slot.material is not None and slot.material not in materials:
+                materials.append(slot.material)
+
+    return materials
+
+
+def tree_images(node_tree, tree_images_cache):
+    """
+    Images of the image nodes of a node tree and of the node groups inside it, as a set.
+    tree_images_cache: {node tree: its images}, shared node groups are only searched once
+    """
+    if node_tree is None:
+        return set()
+
+    images = tree_images_cache.get(node_tree)
+    if images is None:
+        images = tree_images_cache[node_tree] = set()  # before the nodes, a group nested in itself adds nothing
+        for node in node_tree.nodes:
+            image = getattr(node, 'image', None)
+            if isinstance(image, bpy.types.Image):
+                images.add(image)
+            if node.bl_idname == 'ShaderNodeGroup':
+                images |= tree_images(node.node_tree, tree_images_cache)
+
+    return images
+
+
+def collect_images(materials, worlds=()):
+    """
+    Images used by the node trees of materials and worlds, including the node groups inside them.
+    Return {image: number of the given materials and worlds using it}, an image used several times
+    by one material (directly or through node groups) counts once for it
+    """
+    images = {}
+    tree_images_cache = {}
+    for datablock in dict.fromkeys((*materials, *worlds)):
+        if not datablock.use_nodes:
+            continue
+
+        for image in tree_images(datablock.node_tree, tree_images_cache):
+            images[image] = images.get(image, 0) + 1
+
+    return images
+
+
+def image_content_key(image):
+    """
+    Key that is equal for images with the same pixels source:
+    the hash of the packed data or of the file, or the datablock itself for generated and edited images
+    """
+    if image.is_dirty or image.source not in {'FILE', 'SEQUENCE', 'TILED'}:
+        return 'DATA', image.name_full
+
+    if image.packed_file is not None:
+        return 'PACKED', hashlib.blake2b(image.packed_file.data, digest_size=16).hexdigest()
+
+    filepath = bpy.path.abspath(image.filepath, library=image.library)
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return 'DATA', image.name_full
+
+    file_key = (filepath, stat.st_size, stat.st_mtime_ns)
+    if file_key not in _file_hashes:
+        from .palette_cache import PaletteCache
+
+        _file_hashes[file_key] = PaletteCache.file_hash(filepath)
+
+    return 'FILE', _file_hashes[file_key]
+
+
+def dedupe_images(images):
+    """
+    Group images by image_content_key.
+    Return [(image, duplicates)] with the first image of every group, in the order of images
+    """
+    groups = {}
+    for image in images:
+        groups.setdefault(image_content_key(image), []).append(image)
+
+    return [(group[0], group[1:]) for group in groups.values()]